@@ -0,0 +1,267 @@
+"""Generate a synthetic /proc, /sys and /etc tree for the hot-path benchmarks.
+
+The tree is laid out like a filesystem root, so ``src.paths.set_root`` can
+point the collectors at it. Its size is set by four knobs: processes (each
+with a stat, status, cmdline and fd directory), TCP sockets (split between
+/proc/net/tcp and tcp6, and handed out to processes as fd links), user
+accounts (passwd, group and a sparse lastlog) and mounts (on partitions of
+generated disks, with their sysfs entries and diskstats lines). Generation is
+seeded, so the same sizes always give the same tree.
+
+Usage:
+    python benchmarks/fixtures.py DIR                       # default sizes
+    python benchmarks/fixtures.py DIR --processes 5000 --sockets 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.lastlog import RECORD  # noqa: E402
+
+DEFAULT_SIZES = {
+    'processes': 500,
+    'sockets': 2000,
+    'users': 200,
+    'mounts': 20,
+}
+
+UPTIME = 86400.0
+CLOCK_TICKS = 100
+PARTITIONS_PER_DISK = 4
+FIRST_INODE = 100000
+
+# Some names are longer than the 15 characters comm keeps, so the cmdline lookup is exercised
+PROCESS_NAMES = (
+    'systemd', 'sshd', 'bash', 'python3', 'nginx', 'postgres', 'containerd', 'dockerd',
+    'systemd-journald', 'systemd-resolved', 'NetworkManager', 'gnome-shell', 'chrome',
+    'kworker/u16:3-events_unbound', 'java', 'node', 'redis-server', 'rsyslogd', 'cron', 'dbus-daemon',
+)
+
+# (state code, weight); TIME_WAIT sockets have no owner, like on a real host
+TCP_STATES = (('01', 60), ('0A', 10), ('06', 20), ('08', 5), ('02', 3), ('04', 2))
+
+TCP_HEADER = ("  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt"
+              "   uid  timeout inode\n")
+
+PROC_STAT_STATES = 'SSSSSSSRDIZ'
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w' if isinstance(data, str) else 'wb') as f:
+        f.write(data)
+
+
+def _disk_name(index):
+    # sda .. sdz, sdaa .. sdzz, like the kernel names them
+    letters = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(ord('a') + rest) + letters
+    return 'sd' + letters
+
+
+def _system_files(root, rng, processes):
+    boot = int(time.time() - UPTIME)
+    _write(os.path.join(root, 'proc', 'uptime'), f"{UPTIME:.2f} {UPTIME * 3:.2f}\n")
+    _write(os.path.join(root, 'proc', 'stat'),
+           "cpu  10132153 290696 3084719 46828483 16683 0 25195 0 0 0\n"
+           "cpu0 2533038 72674 771179 11707120 4170 0 6298 0 0 0\n"
+           "intr 0\nctxt 1990473\n"
+           f"btime {boot}\nprocesses {processes * 3}\nprocs_running 2\nprocs_blocked 0\n")
+    _write(os.path.join(root, 'proc', 'meminfo'), ''.join(
+        f"{name}: {value:>8} kB\n" for name, value in (
+            ('MemTotal', 16318480), ('MemFree', 2311236), ('MemAvailable', 9734228),
+            ('Buffers', 412340), ('Cached', 6820116), ('SwapCached', 1024),
+            ('Active', 7012000), ('Inactive', 4980000), ('Active(file)', 3100000),
+            ('Inactive(file)', 3400000), ('Shmem', 402000), ('Slab', 690000),
+            ('SReclaimable', 520000), ('SwapTotal', 8388604), ('SwapFree', 8100000),
+        )))
+    _write(os.path.join(root, 'proc', 'vmstat'), "pswpin 120\npswpout 480\n")
+    _write(os.path.join(root, 'proc', 'filesystems'), ''.join(
+        f"{'nodev' if nodev else ''}\t{fstype}\n" for nodev, fstype in (
+            (True, 'sysfs'), (True, 'tmpfs'), (True, 'proc'), (True, 'devtmpfs'), (True, 'cgroup2'),
+            (True, 'nfs'), (True, 'nfs4'), (True, 'overlay'), (False, 'ext4'), (False, 'xfs'),
+            (False, 'btrfs'), (False, 'vfat'),
+        )))
+    # ProcScanner checks for /proc/self/stat before it trusts the tree
+    _write(os.path.join(root, 'proc', 'self', 'stat'),
+           "1 (systemd) S 0 1 1 0 -1 4194560 0 0 0 0 0 0 0 0 20 0 1 0 1 0 0" + " 0" * 30 + "\n")
+
+
+def _accounts(root, rng, users):
+    passwd = [
+        "root:x:0:0:root:/root:/bin/bash",
+        "daemon:x:1:1:daemon:/usr/sbin:/usr/sbin/nologin",
+        "nobody:x:65534:65534:nobody:/nonexistent:/usr/sbin/nologin",
+    ]
+    groups = ["root:x:0:", "daemon:x:1:", "nogroup:x:65534:"]
+    names = []
+    for i in range(users):
+        name = f"user{i:05d}"
+        names.append(name)
+        passwd.append(f"{name}:x:{1000 + i}:{1000 + i}:User {i}:/home/{name}:/bin/bash")
+        groups.append(f"{name}:x:{1000 + i}:")
+    groups.append(f"sudo:x:27:{','.join(names[::10])}")
+    groups.append(f"docker:x:998:{','.join(names[::3])}")
+    groups.append(f"users:x:100:{','.join(names)}")
+    _write(os.path.join(root, 'etc', 'passwd'), '\n'.join(passwd) + '\n')
+    _write(os.path.join(root, 'etc', 'group'), '\n'.join(groups) + '\n')
+
+    # Sparse like the real file: one record at uid * RECORD.size, every other user has logged in
+    lastlog = os.path.join(root, 'var', 'log', 'lastlog')
+    os.makedirs(os.path.dirname(lastlog), exist_ok=True)
+    with open(lastlog, 'wb') as f:
+        for i in range(0, users, 2):
+            f.seek((1000 + i) * RECORD.size)
+            f.write(RECORD.pack(int(time.time()) - rng.randrange(86400 * 90), b'pts/0',
+                                f"10.0.{i // 256 % 256}.{i % 256}".encode()))
+    return [1000 + i for i in range(users)]
+
+
+def _processes(root, rng, processes, uids):
+    pids = list(range(1, processes + 1))
+    owners = [0, 0, 1, 65534] + uids[:50]
+    for pid in pids:
+        name = rng.choice(PROCESS_NAMES)
+        comm = name[:15]
+        uid = 0 if pid == 1 else rng.choice(owners)
+        start = rng.randrange(1, int(UPTIME * CLOCK_TICKS))
+        utime = rng.randrange(0, 50000)
+        stime = rng.randrange(0, 20000)
+        fields = [
+            rng.choice(PROC_STAT_STATES), 1 if pid > 1 else 0, pid, pid, 0, -1, 4194560,
+            rng.randrange(100000), 0, rng.randrange(100), 0, utime, stime, 0, 0, 20,
+            rng.choice((0, 0, 0, 5, -5, 19)), rng.randrange(1, 64), 0, start,
+            rng.randrange(10 ** 7, 10 ** 10), rng.randrange(100, 500000),
+        ]
+        fields += [0] * (50 - len(fields))
+        base = os.path.join(root, 'proc', str(pid))
+        _write(os.path.join(base, 'stat'), f"{pid} ({comm}) " + ' '.join(map(str, fields)) + "\n")
+        _write(os.path.join(base, 'comm'), comm + "\n")
+        _write(os.path.join(base, 'cmdline'), f"/usr/bin/{name}\0--config\0/etc/{name}.conf\0")
+        _write(os.path.join(base, 'status'),
+               f"Name:\t{comm}\nUmask:\t0022\nState:\tS (sleeping)\nTgid:\t{pid}\nNgid:\t0\n"
+               f"Pid:\t{pid}\nPPid:\t{fields[1]}\nTracerPid:\t0\n"
+               f"Uid:\t{uid}\t{uid}\t{uid}\t{uid}\nGid:\t{uid}\t{uid}\t{uid}\t{uid}\n"
+               f"Threads:\t{fields[17]}\n")
+        fd_dir = os.path.join(base, 'fd')
+        os.makedirs(fd_dir)
+        for fd in range(3):
+            os.symlink('/dev/null', os.path.join(fd_dir, str(fd)))
+    return pids
+
+
+def _sockets(root, rng, sockets, pids):
+    states = [code for code, weight in TCP_STATES for _ in range(weight)]
+    tables = {'tcp': [TCP_HEADER], 'tcp6': [TCP_HEADER]}
+    next_fd = {}
+    for i in range(sockets):
+        state = rng.choice(states)
+        inode = 0 if state == '06' else FIRST_INODE + i
+        # About a quarter of the sockets are IPv6
+        table = 'tcp6' if i % 4 == 3 else 'tcp'
+        if table == 'tcp':
+            local = f"{rng.getrandbits(32):08X}"
+            remote = '00000000' if state == '0A' else f"{rng.getrandbits(32):08X}"
+        else:
+            local = f"{rng.getrandbits(128):032X}"
+            remote = '0' * 32 if state == '0A' else f"{rng.getrandbits(128):032X}"
+        local_port = rng.choice((22, 80, 443, 5432, 6379, 8080)) if rng.random() < 0.5 else rng.randrange(32768, 61000)
+        remote_port = 0 if state == '0A' else rng.randrange(1024, 65536)
+        lines = tables[table]
+        lines.append(f"{len(lines) - 1:4d}: {local}:{local_port:04X} {remote}:{remote_port:04X} {state} "
+                     f"00000000:00000000 00:00000000 00000000  1000        0 {inode} 1 "
+                     f"0000000000000000 20 4 30 10 -1\n")
+        if inode:
+            pid = rng.choice(pids)
+            fd = next_fd.get(pid, 3)
+            next_fd[pid] = fd + 1
+            os.symlink(f"socket:[{inode}]", os.path.join(root, 'proc', str(pid), 'fd', str(fd)))
+    for table, lines in tables.items():
+        _write(os.path.join(root, 'proc', 'net', table), ''.join(lines))
+
+
+def _mounts(root, rng, mounts):
+    lines = [
+        "proc /proc proc rw,nosuid,nodev,noexec,relatime 0 0",
+        "sysfs /sys sysfs rw,nosuid,nodev,noexec,relatime 0 0",
+        "devtmpfs /dev devtmpfs rw,nosuid,size=8131288k,mode=755 0 0",
+    ]
+    diskstats = []
+    disks = {}
+    created = 0
+    for i in range(mounts):
+        if i and i % 10 == 0:
+            lines.append(f"nas:/export/share{i} /mnt/nfs{i} nfs4 rw,relatime,vers=4.2 0 0")
+            continue
+        if i and i % 8 == 0:
+            lines.append(f"tmpfs /run/user/{i} tmpfs rw,nosuid,nodev,relatime 0 0")
+            os.makedirs(os.path.join(root, 'run', 'user', str(i)), exist_ok=True)
+            continue
+        disk = _disk_name(created // PARTITIONS_PER_DISK)
+        partition = f"{disk}{created % PARTITIONS_PER_DISK + 1}"
+        created += 1
+        disks.setdefault(disk, []).append(partition)
+        mountpoint = '/' if i == 0 else f"/mnt/vol{i}"
+        lines.append(f"/dev/{partition} {mountpoint} {rng.choice(('ext4', 'xfs'))} rw,relatime 0 0")
+        os.makedirs(os.path.join(root, mountpoint.lstrip('/')), exist_ok=True)
+
+    for index, (disk, partitions) in enumerate(disks.items()):
+        block = os.path.join(root, 'sys', 'block', disk)
+        os.makedirs(os.path.join(block, 'device'))
+        _write(os.path.join(block, 'queue', 'rotational'), "1\n" if index % 3 == 2 else "0\n")
+        os.makedirs(os.path.join(root, 'sys', 'class', 'block'), exist_ok=True)
+        os.symlink(f"../../block/{disk}", os.path.join(root, 'sys', 'class', 'block', disk))
+        major, minor = 8 + index * 16 // 256, index * 16 % 256
+        for name in [disk] + partitions:
+            if name != disk:
+                _write(os.path.join(block, name, 'partition'), f"{name[len(disk):]}\n")
+                os.symlink(f"../../block/{disk}/{name}", os.path.join(root, 'sys', 'class', 'block', name))
+            reads, writes = rng.randrange(10 ** 6), rng.randrange(10 ** 6)
+            diskstats.append(f"{major:4d} {minor + len(diskstats) % 16:7d} {name} {reads} 0 {reads * 8} "
+                             f"{reads // 10} {writes} 0 {writes * 8} {writes // 10} 0 {reads // 5} "
+                             f"{(reads + writes) // 10} 0 0 0 0 0 0\n")
+    _write(os.path.join(root, 'proc', 'self', 'mounts'), '\n'.join(lines) + '\n')
+    _write(os.path.join(root, 'proc', 'diskstats'), ''.join(diskstats))
+
+
+def build(root, processes=DEFAULT_SIZES['processes'], sockets=DEFAULT_SIZES['sockets'],
+          users=DEFAULT_SIZES['users'], mounts=DEFAULT_SIZES['mounts'], seed=0):
+    """Write a fixture tree of the given sizes under root, which must not exist yet, and return root"""
+    rng = random.Random(seed)
+    os.makedirs(root)
+    _system_files(root, rng, processes)
+    uids = _accounts(root, rng, users)
+    pids = _processes(root, rng, processes, uids)
+    _sockets(root, rng, sockets, pids)
+    _mounts(root, rng, mounts)
+    return root
+
+
+def add_size_arguments(parser):
+    for name, default in DEFAULT_SIZES.items():
+        parser.add_argument(f'--{name}', type=int, default=default, help=f"default: {default}")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the generated values")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('directory', help="where to create the tree; must not exist yet")
+    add_size_arguments(parser)
+    args = parser.parse_args(argv)
+    started = time.monotonic()
+    build(args.directory, args.processes, args.sockets, args.users, args.mounts, args.seed)
+    print(f"Created {args.directory} in {time.monotonic() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""Time a2a's hot paths against a generated /proc, /sys and /etc tree.
+
+The tree comes from ``fixtures.py`` at the sizes given on the command line
+and is read through ``src.paths.set_root``, so nothing on the host is
+measured and no network is needed. Each case gets an untimed warm-up call
+(which also takes the one disk I/O sampling interval) and is then run
+``--repeat`` times; the fastest and median runs are reported.
+
+Results are saved under ``benchmarks/results/`` per commit and fixture
+size, so two commits can be compared:
+
+Usage:
+    python benchmarks/hotpaths.py                            # default sizes, save the result
+    python benchmarks/hotpaths.py --processes 5000 --sockets 100000 --users 20000 --mounts 200
+    python benchmarks/hotpaths.py --compare HEAD~1           # against that commit's saved run
+    python benchmarks/hotpaths.py --compare main --max-regression 20
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import fixtures
+
+ROOT = fixtures.ROOT
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+# The sections export_info can collect from the fixture tree; the others read live host state
+FIXTURE_SECTIONS = ('processes', 'disks', 'connections')
+
+
+def git(*args):
+    try:
+        return subprocess.check_output(['git', *args], cwd=ROOT, text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def result_path(commit, sizes):
+    tag = '-'.join(f"{name[0]}{value}" for name, value in sizes.items())
+    return os.path.join(RESULTS_DIR, f"{commit[:12]}-{tag}.json")
+
+
+def cases(workdir, sizes):
+    """Yield (name, setup) pairs; setup returns the callable to time"""
+    from src import hardware_info, network_info
+    from src.system_info import SystemInfoViewer
+    from src.task_manager import TaskManager
+    from src.user_manager import UserManager
+
+    def process_list(show_all):
+        def setup():
+            task_manager = TaskManager()
+            return lambda: task_manager.get_process_list(show_all=show_all)
+        return setup
+
+    def process_info():
+        viewer = SystemInfoViewer()
+        return viewer.get_process_info
+
+    def connections(**filters):
+        def setup():
+            return lambda: network_info.get_active_connections(**filters)
+        return setup
+
+    def users():
+        manager = UserManager()
+        return manager.list_users
+
+    def disks():
+        return hardware_info.get_disk_info
+
+    def html_section(sockets):
+        def setup():
+            # How HTML exports render a section; here a large one, with a row per socket
+            from src import export
+            section = network_info.collect_active_connections(states=None, top=sockets)
+
+            def run():
+                export.HtmlWriter(io.StringIO()).write_section('connections', section.title, section)
+            return run
+        return setup
+
+    def export(format):
+        def setup():
+            viewer = SystemInfoViewer()
+            runs = itertools.count()
+
+            def run():
+                # Answers to the prompts: format, compression, all categories, directory, name, open?
+                answers = f"{format}\nnone\n4\n{workdir}\nreport-{format}-{next(runs)}\nn\n"
+                with contextlib.redirect_stdout(io.StringIO()), replace_stdin(answers):
+                    viewer.export_info()
+            return run
+        return setup
+
+    yield 'get_process_list', process_list(False)
+    yield 'get_process_list[all]', process_list(True)
+    yield 'get_process_info', process_info
+    yield 'get_active_connections', connections()
+    yield 'get_active_connections[remote]', connections(group_by='remote', states=None)
+    yield 'list_users', users
+    yield 'get_disk_info', disks
+    yield 'HtmlWriter.write_section', html_section(sizes['sockets'])
+    for format in ('txt', 'html', 'json'):
+        yield f'export_info[{format}]', export(format)
+
+
+@contextlib.contextmanager
+def replace_stdin(text):
+    saved, sys.stdin = sys.stdin, io.StringIO(text)
+    try:
+        yield
+    finally:
+        sys.stdin = saved
+
+
+def measure(setup, repeat):
+    with contextlib.redirect_stdout(io.StringIO()):
+        call = setup()
+        call()
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            call()
+            times.append(time.perf_counter() - started)
+    return {'min': min(times), 'median': statistics.median(times), 'runs': len(times)}
+
+
+def run(args, sizes):
+    with tempfile.TemporaryDirectory(prefix='a2a-bench-') as workdir:
+        # Keep the tool's cache and history out of the user's home
+        os.environ['XDG_CACHE_HOME'] = os.path.join(workdir, 'cache')
+        os.environ['XDG_STATE_HOME'] = os.path.join(workdir, 'state')
+        tree = args.fixture or os.path.join(workdir, 'root')
+        if not args.fixture or not os.path.exists(args.fixture):
+            started = time.monotonic()
+            fixtures.build(tree, seed=args.seed, **sizes)
+            print(f"Fixture tree built in {time.monotonic() - started:.1f}s", file=sys.stderr)
+
+        from src import paths, sections
+        paths.set_root(tree)
+        all_sections = sections.SECTIONS
+        results = {}
+        try:
+            selected = cases(workdir, sizes)
+            # export_info may only offer the sections the fixture tree can answer
+            sections.SECTIONS = tuple(spec for spec in all_sections if spec.key in FIXTURE_SECTIONS)
+            for name, setup in selected:
+                if args.only and not any(pattern in name for pattern in args.only):
+                    continue
+                results[name] = measure(setup, args.repeat)
+                print(f"{name:32} {results[name]['median'] * 1000:10.2f} ms", file=sys.stderr)
+        finally:
+            sections.SECTIONS = all_sections
+            paths.set_root(None)
+    return results
+
+
+def load_baseline(reference, sizes):
+    if os.path.isfile(reference):
+        path = reference
+    else:
+        commit = git('rev-parse', '--verify', f'{reference}^{{commit}}')
+        if commit is None:
+            raise SystemExit(f"{reference} is neither a results file nor a commit")
+        path = result_path(commit, sizes)
+        if not os.path.exists(path):
+            raise SystemExit(f"No saved run for {reference} at these sizes ({os.path.relpath(path, ROOT)}); "
+                             f"check it out and run this script there first")
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(report, baseline):
+    """Print median times side by side and return the worst slowdown in percent"""
+    worst = None
+    print(f"{'case':32} {'baseline':>12} {'this run':>12} {'change':>8}")
+    for name, result in report['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f"{name:32} {'-':>12} {result['median'] * 1000:10.2f}ms {'new':>8}")
+            continue
+        change = (result['median'] - before['median']) / before['median'] * 100
+        worst = change if worst is None else max(worst, change)
+        print(f"{name:32} {before['median'] * 1000:10.2f}ms {result['median'] * 1000:10.2f}ms {change:+7.1f}%")
+    return worst
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    fixtures.add_size_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per case (default: 5)")
+    parser.add_argument('--only', action='append', help="run only cases whose name contains this; repeatable")
+    parser.add_argument('--fixture', help="build the fixture tree here and keep it, or reuse it if it exists")
+    parser.add_argument('--compare', metavar='REF', help="commit or results file to compare against")
+    parser.add_argument('--max-regression', type=float,
+                        help="with --compare, fail if a case's median is this many percent slower")
+    parser.add_argument('--no-save', action='store_true', help="do not store the result")
+    parser.add_argument('--json', action='store_true', help="print the result as JSON")
+    args = parser.parse_args(argv)
+    if args.fixture:
+        args.fixture = os.path.abspath(args.fixture)
+
+    sizes = {name: getattr(args, name) for name in fixtures.DEFAULT_SIZES}
+    # Loaded first: comparing against HEAD must not read back the run about to be saved
+    baseline = load_baseline(args.compare, sizes) if args.compare else None
+    commit = git('rev-parse', 'HEAD')
+    report = {
+        'commit': commit,
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sizes': sizes,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': run(args, sizes),
+    }
+
+    if commit and not args.no_save and not args.only:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = result_path(commit, sizes)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        dirty = " (uncommitted changes)" if report['dirty'] else ""
+        print(f"Saved {os.path.relpath(path, ROOT)}{dirty}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    if baseline is not None:
+        worst = compare(report, baseline)
+        if args.max_regression is not None and worst is not None and worst > args.max_regression:
+            print(f"Slower than the baseline by more than {args.max_regression:g}%", file=sys.stderr)
+            return 1
+    elif not args.json:
+        for name, result in report['results'].items():
+            print(f"{name:32} min {result['min'] * 1000:10.2f} ms   median {result['median'] * 1000:10.2f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Report the import cost of a2a's modules using ``python -X importtime``.
+
+Each target module is imported in a fresh interpreter. The script prints the
+total import time of every target and the most expensive modules it pulled in,
+so a new heavy import shows up as soon as it lands.
+
+Usage:
+    python benchmarks/startup.py                  # table for the default targets
+    python benchmarks/startup.py --json           # machine-readable output
+    python benchmarks/startup.py --max-ms 150     # non-zero exit if any target is slower
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_TARGETS = (
+    'src.cli',
+    'src.system_info',
+    'src.hardware_info',
+    'src.network_info',
+    'src.task_manager',
+    'src.user_manager',
+    'src.network_manager',
+)
+
+
+def measure(module, runs=3):
+    """Import ``module`` in ``runs`` fresh interpreters and keep the fastest run.
+
+    Returns ``(total_us, {imported_module: (self_us, cumulative_us)})``.
+    """
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"importing {module} failed:\n{proc.stderr}")
+        
+        # Lines are printed children-first; the target's own imports are the indented
+        # lines directly above its top-level line, which keeps interpreter startup
+        # (site, .pth hooks) out of the numbers.
+        entries = []
+        for line in proc.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            depth = len(name) - len(name.lstrip()) - 1
+            entries.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+        
+        modules = {}
+        for depth, name, self_us, cumulative_us in reversed(entries):
+            if modules and depth == 0:
+                break
+            if modules or (depth == 0 and name == module):
+                modules[name] = (self_us, cumulative_us)
+        total = modules.get(module, (0, 0))[1]
+        if best is None or total < best[0]:
+            best = (total, modules)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('targets', nargs='*', default=list(DEFAULT_TARGETS))
+    parser.add_argument('--runs', type=int, default=3, help="interpreters per target, fastest wins")
+    parser.add_argument('--top', type=int, default=10, help="most expensive imports to list per target")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    parser.add_argument('--max-ms', type=float, help="fail if a target takes longer than this")
+    args = parser.parse_args(argv)
+    
+    report = {}
+    for target in args.targets:
+        total, modules = measure(target, args.runs)
+        heaviest = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+        report[target] = {
+            'total_ms': total / 1000,
+            'modules': [
+                {'module': name, 'self_ms': self_us / 1000, 'cumulative_ms': cumulative_us / 1000}
+                for name, (self_us, cumulative_us) in heaviest[:args.top]
+                if name != target
+            ],
+        }
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for target, result in report.items():
+            print(f"{target}: {result['total_ms']:.1f} ms")
+            for entry in result['modules']:
+                print(f"    {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+    
+    if args.max_ms is not None:
+        slow = [target for target, result in report.items() if result['total_ms'] > args.max_ms]
+        if slow:
+            print(f"Slower than {args.max_ms:g} ms: {', '.join(slow)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,6 @@
-from src.system_info import main
+import sys
+
+from src.cli import main
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
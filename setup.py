@@ -16,7 +16,7 @@ setup(
     ],
     entry_points={
         'console_scripts': [
-            'a2a=src.system_info:main',
+            'a2a=src.cli:main',
         ],
     },
     author="PearlK Tech",
@@ -30,5 +30,5 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: POSIX :: Linux",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
 ) 
\ No newline at end of file
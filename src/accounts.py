@@ -0,0 +1,64 @@
+"""User and group entries of the system being reported on.
+
+On the running system they come from the pwd and grp modules, so accounts
+from NSS sources such as LDAP or SSSD are included. Under another root (see
+``paths``) only that tree's /etc/passwd and /etc/group exist, and they are
+parsed into the same ``struct_passwd`` and ``struct_group`` records.
+"""
+import grp
+import pwd
+
+from src import paths
+
+PASSWD = '/etc/passwd'
+GROUP = '/etc/group'
+
+
+def _entries(path, fields):
+    try:
+        with open(paths.resolve(path), encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    # '+' and '-' lines are NIS compat markers, not accounts
+    return [line.split(':') for line in lines
+            if line and not line.startswith(('#', '+', '-')) and line.count(':') == fields - 1]
+
+
+def users():
+    """Every account, as pwd.struct_passwd records"""
+    if paths.is_live():
+        return pwd.getpwall()
+    users = []
+    for name, password, uid, gid, gecos, home, shell in _entries(PASSWD, 7):
+        try:
+            users.append(pwd.struct_passwd((name, password, int(uid), int(gid), gecos, home, shell)))
+        except ValueError:
+            continue
+    return users
+
+
+def groups():
+    """Every group, as grp.struct_group records"""
+    if paths.is_live():
+        return grp.getgrall()
+    groups = []
+    for name, password, gid, members in _entries(GROUP, 4):
+        try:
+            groups.append(grp.struct_group((name, password, int(gid), [m for m in members.split(',') if m])))
+        except ValueError:
+            continue
+    return groups
+
+
+def user_name(uid):
+    """Name of the account with uid, or the uid itself as a string when there is none"""
+    if paths.is_live():
+        try:
+            return pwd.getpwuid(uid).pw_name
+        except KeyError:
+            return str(uid)
+    for user in users():
+        if user.pw_uid == uid:
+            return user.pw_name
+    return str(uid)
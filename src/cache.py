@@ -0,0 +1,68 @@
+"""Small JSON cache for data that is slow to collect but rarely changes.
+
+Entries live under ``$XDG_CACHE_HOME/a2a`` (``~/.cache/a2a`` by default). Each
+entry is stored with the key it was computed for, and ``load`` only returns it
+while that key still matches, so callers decide when cached data goes stale;
+entries can also be given a maximum age.
+"""
+import json
+import os
+import platform
+import tempfile
+import time
+
+
+def cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'a2a')
+
+
+def load(name, key, max_age=None):
+    """Return the data cached under ``name`` if it was stored with ``key``, else None
+
+    With ``max_age``, entries stored more than that many seconds ago are stale too.
+    """
+    entry = load_entry(name, key, max_age)
+    return entry[1] if entry is not None else None
+
+
+def load_entry(name, key, max_age=None):
+    """Like ``load``, but return ``(stored_at, data)``, stored_at being a time.time() value"""
+    try:
+        with open(os.path.join(cache_dir(), f'{name}.json'), encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get('key') != key:
+        return None
+    stored_at = entry.get('time', 0)
+    if max_age is not None and not 0 <= time.time() - stored_at <= max_age:
+        return None
+    return stored_at, entry.get('data')
+
+
+def store(name, key, data):
+    """Cache ``data`` under ``name``; failures are ignored since the cache is only an optimisation"""
+    directory = cache_dir()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{name}.')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'time': time.time(), 'data': data}, f)
+            os.replace(tmp_path, os.path.join(directory, f'{name}.json'))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def boot_key():
+    """Key that changes whenever the machine reboots or runs a different kernel"""
+    try:
+        with open('/proc/sys/kernel/random/boot_id') as f:
+            boot_id = f.read().strip()
+    except OSError:
+        boot_id = None
+    return {'boot_id': boot_id, 'kernel': platform.release()}
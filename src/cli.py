@@ -0,0 +1,275 @@
+"""Command line entry point for ``a2a``.
+
+Without a subcommand the interactive viewer starts as before. ``a2a collect``
+runs the selected sections without the banner or menus and writes them to
+stdout, as plain text or as one JSON object per line with ``--json``.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from src import history, profiling, sections
+from src.collector import DEFAULT_TIMEOUT, DEFAULT_WORKERS, collect_sections
+
+EXIT_OK = 0
+EXIT_SECTION_FAILED = 1
+EXIT_USAGE = 2
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='a2a', description="Linux system information tool")
+    parser.add_argument('--no-banner', action='store_true',
+                        help="start the interactive viewer without the startup animation")
+    parser.add_argument('--root', metavar='PATH', default=os.environ.get('A2A_ROOT') or None,
+                        help="read /proc, /sys and /etc from a snapshot made by 'a2a capture' or from a "
+                             "directory such as a mounted container root (default: $A2A_ROOT)")
+    parser.add_argument('--profile', action='store_true',
+                        help="time every collected section (wall, CPU, subprocesses, bytes read) "
+                             "and print a report to stderr at exit")
+    parser.add_argument('--profile-format', choices=('table', 'json'), default='table',
+                        help="format of the --profile report (default: table)")
+    parser.add_argument('--profile-section', metavar='KEY', choices=[spec.key for spec in sections.SECTIONS],
+                        help="also run this one section under a profiler")
+    parser.add_argument('--profiler', choices=profiling.PROFILERS, default='cprofile',
+                        help="profiler for --profile-section (default: cprofile)")
+    parser.add_argument('--profile-output', metavar='FILE',
+                        help="write the --profile-section result to FILE (pstats or text) instead of stderr")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    collect = subparsers.add_parser('collect', help="collect sections without the interactive menus")
+    collect.add_argument('-s', '--section', action='append', dest='sections', metavar='KEY',
+                         choices=[spec.key for spec in sections.SECTIONS],
+                         help="section to collect (repeatable, see 'a2a sections')")
+    collect.add_argument('-c', '--category', action='append', dest='categories',
+                         choices=[key for key, _ in sections.CATEGORIES],
+                         help="collect every section in a category (repeatable)")
+    collect.add_argument('--json', action='store_true',
+                         help="write one JSON object per section (newline-delimited JSON)")
+    collect.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                         help=f"per-section timeout in seconds (default: {DEFAULT_TIMEOUT:g})")
+    collect.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                         help=f"sections collected in parallel (default: {DEFAULT_WORKERS})")
+    
+    subparsers.add_parser('sections', help="list the available sections")
+    
+    conns = subparsers.add_parser('connections', help="list or aggregate TCP connections")
+    conns.add_argument('--state', action='append', dest='states', metavar='STATE',
+                       help="TCP state to include, e.g. ESTABLISHED or LISTEN (repeatable, default: ESTABLISHED)")
+    conns.add_argument('--all-states', action='store_true', help="include sockets in every state")
+    conns.add_argument('--port', type=int, help="only sockets with this local or remote port")
+    conns.add_argument('--pid', type=int, help="only sockets owned by this process")
+    conns.add_argument('--group-by', choices=('remote', 'local_port', 'process', 'state'),
+                       help="count connections per group instead of listing them")
+    conns.add_argument('--top', type=int, default=20, help="rows or groups to show (default: 20)")
+    conns.add_argument('--json', action='store_true', help="write the result as JSON")
+    
+    record = subparsers.add_parser('record', help="sample metrics into a fixed-size history file")
+    record.add_argument('--interval', type=float, default=history.DEFAULT_INTERVAL,
+                        help=f"seconds between samples (default: {history.DEFAULT_INTERVAL:g})")
+    record.add_argument('--hours', type=float, default=history.DEFAULT_HOURS,
+                        help=f"hours of history to keep before overwriting the oldest samples "
+                             f"(default: {history.DEFAULT_HOURS})")
+    record.add_argument('--file', help=f"history file (default: {history.history_path()})")
+    record.add_argument('--samples', type=int, help="stop after this many samples instead of running until killed")
+    record.add_argument('--reset', action='store_true',
+                        help="replace an existing history file recorded with other settings")
+    
+    speed = subparsers.add_parser('speedtest', help="run a network speed test and store the result")
+    speed.add_argument('--server', help="speedtest.net server ID or Speedtest Mini URL "
+                                        "(default: $A2A_SPEEDTEST_SERVER, else the closest server)")
+    speed.add_argument('--last', action='store_true', help="show the stored result instead of running a test")
+    speed.add_argument('--json', action='store_true', help="write the result as JSON")
+    
+    capture = subparsers.add_parser('capture', help="copy the files a2a reads into a snapshot tarball")
+    capture.add_argument('output', help="snapshot file to write, or - for stdout")
+    capture.add_argument('--compression', choices=('gzip', 'xz', 'none'),
+                         help="default: from the file name (.tar, .tar.xz), otherwise gzip")
+    return parser
+
+
+def select_sections(keys=None, categories=None):
+    """Return the specs named by ``keys`` or belonging to ``categories``, in report order"""
+    if not keys and not categories:
+        return list(sections.SECTIONS)
+    keys = set(keys or ())
+    categories = set(categories or ())
+    return [spec for spec in sections.SECTIONS if spec.key in keys or spec.category in categories]
+
+
+def result_to_dict(result):
+    from src import renderers
+    
+    return {
+        'section': result.spec.key,
+        'category': result.spec.category,
+        'title': result.spec.title,
+        'status': result.status,
+        'elapsed': round(result.elapsed, 4),
+        'error': result.error,
+        'data': renderers.to_dict(result.value) if result.status == 'ok' else None,
+    }
+
+
+def exit_code_for(section, status='ok'):
+    """EXIT_SECTION_FAILED if a section did not finish or failed to fetch its data, the same rule for every command
+
+    Absent hardware and tests not run yet are Notice records, not errors, so they never fail a command.
+    """
+    if status != 'ok' or section is None or section.errors:
+        return EXIT_SECTION_FAILED
+    return EXIT_OK
+
+
+def run_collect(args):
+    from src import renderers
+    
+    specs = select_sections(args.sections, args.categories)
+    exit_code = EXIT_OK
+    out = sys.stdout
+    for result in collect_sections(specs, max_workers=max(1, args.workers), timeout=args.timeout):
+        if exit_code_for(result.value, result.status) != EXIT_OK:
+            exit_code = EXIT_SECTION_FAILED
+        if args.json:
+            out.write(json.dumps(result_to_dict(result), default=str) + '\n')
+        elif result.status == 'ok':
+            out.write(renderers.to_text(result.value) + '\n')
+        else:
+            print(f"{result.spec.title}: {result.error}", file=sys.stderr)
+        out.flush()
+    return exit_code
+
+
+def run_connections(args):
+    from src import network_info, renderers
+    
+    states = None if args.all_states else [state.upper() for state in args.states or ['ESTABLISHED']]
+    section = network_info.collect_active_connections(
+        states=states, port=args.port, pid=args.pid, group_by=args.group_by, top=max(1, args.top))
+    if args.json:
+        sys.stdout.write(renderers.to_json(section) + '\n')
+    else:
+        sys.stdout.write(renderers.to_text(section))
+    return exit_code_for(section)
+
+
+def run_record(args):
+    import signal
+    
+    if args.interval <= 0 or args.hours <= 0:
+        print("a2a record: --interval and --hours must be positive", file=sys.stderr)
+        return EXIT_USAGE
+    capacity = max(1, int(args.hours * 3600 / args.interval))
+    path = args.file or history.history_path()
+    size_mb = history.file_size(capacity) / (1024 ** 2)
+    print(f"Recording every {args.interval:g}s into {path} ({capacity} samples, {size_mb:.1f} MB)",
+          file=sys.stderr)
+    
+    # Leave through the normal exit path on SIGTERM so the mapping is flushed and closed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(EXIT_OK))
+    try:
+        history.record(path, interval=args.interval, capacity=capacity, samples=args.samples,
+                       reset=args.reset)
+    except history.HistoryFormatError as e:
+        print(f"a2a record: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    except KeyboardInterrupt:
+        pass
+    return EXIT_OK
+
+
+def run_speedtest(args):
+    from src import network_info, renderers
+    
+    if args.last:
+        section = network_info.collect_network_speed()
+    else:
+        print("Running speed test (this may take 15-20 seconds)...", file=sys.stderr)
+        section = network_info.run_network_speed_test(args.server)
+    if args.json:
+        sys.stdout.write(renderers.to_json(section) + '\n')
+    else:
+        sys.stdout.write(renderers.to_text(section))
+    return exit_code_for(section)
+
+
+def run_capture(args):
+    from src import snapshot
+    
+    compression = args.compression
+    if compression is None:
+        name = args.output.lower()
+        compression = 'none' if name.endswith('.tar') else 'xz' if name.endswith(('.tar.xz', '.txz')) else 'gzip'
+    started = time.monotonic()
+    try:
+        files, size = snapshot.capture(args.output, compression)
+    except snapshot.SnapshotError as e:
+        print(f"a2a capture: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    where = "stdout" if args.output == '-' else args.output
+    print(f"Captured {files} files ({size / 1024:.0f} KiB) to {where} in {time.monotonic() - started:.1f}s",
+          file=sys.stderr)
+    return EXIT_OK
+
+
+def run_list_sections():
+    for spec in sections.SECTIONS:
+        print(f"{spec.key:<12} {spec.category:<9} {spec.title}")
+    return EXIT_OK
+
+
+def run_command(args):
+    try:
+        if args.command == 'collect':
+            return run_collect(args)
+        if args.command == 'sections':
+            return run_list_sections()
+        if args.command == 'connections':
+            return run_connections(args)
+        if args.command == 'record':
+            return run_record(args)
+        if args.command == 'speedtest':
+            return run_speedtest(args)
+        if args.command == 'capture':
+            return run_capture(args)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); nothing left to report
+        sys.stderr.close()
+        return EXIT_OK
+    
+    from src.system_info import main as run_interactive
+    run_interactive(banner=not args.no_banner)
+    return EXIT_OK
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    
+    if args.root:
+        from src import snapshot
+        try:
+            snapshot.use(args.root)
+        except snapshot.SnapshotError as e:
+            print(f"a2a: {e}", file=sys.stderr)
+            return EXIT_USAGE
+    
+    if not args.profile and not args.profile_section:
+        return run_command(args)
+    
+    if args.profiler == 'pyinstrument' and args.profile_section:
+        import importlib.util
+        if importlib.util.find_spec('pyinstrument') is None:
+            print("a2a: --profiler pyinstrument needs the pyinstrument package", file=sys.stderr)
+            return EXIT_USAGE
+    profiling.enable(args.profile_section, args.profiler, args.profile_output)
+    try:
+        return run_command(args)
+    finally:
+        profile = profiling.disable()
+        if args.profile and not sys.stderr.closed:
+            profiling.report(profile, args.profile_format)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Collect report sections concurrently.
+
+Most collectors spend their time waiting on subprocesses, the network or
+sampling intervals, so they run on a bounded pool of worker threads. Results
+are handed back in the order the sections were requested, and a section that
+runs past its timeout is reported as timed out instead of holding up the rest
+of the report.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+from src import paths, profiling, sections
+
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 30.0
+
+
+@dataclass
+class SectionResult:
+    __slots__ = ('spec', 'value', 'error', 'status', 'elapsed')
+    spec: object
+    value: object
+    error: str
+    status: str  # 'ok', 'error' or 'timeout'
+    elapsed: float
+
+
+class _Job:
+    __slots__ = ('spec', 'started', 'done', 'start_time', 'value', 'error', 'elapsed',
+                 'on_start', 'on_done', '_reported')
+
+    def __init__(self, spec, on_start=None, on_done=None):
+        self.spec = spec
+        self.started = threading.Event()
+        self.done = threading.Event()
+        self.start_time = None
+        self.value = None
+        self.error = None
+        self.elapsed = 0.0
+        self.on_start = on_start
+        self.on_done = on_done
+        self._reported = threading.Lock()
+
+    def result(self):
+        if self.error is not None:
+            return SectionResult(self.spec, None, self.error, 'error', self.elapsed)
+        return SectionResult(self.spec, self.value, None, 'ok', self.elapsed)
+
+    def report(self, result):
+        """Pass result to on_done, once: a timed-out job that finishes later stays timed out"""
+        if self.on_done is not None and self._reported.acquire(blocking=False):
+            self.on_done(result)
+
+    def run(self):
+        self.start_time = time.monotonic()
+        self.started.set()
+        if self.on_start is not None:
+            self.on_start(self.spec)
+        collect = None
+        if not paths.is_live() and self.spec.key in sections.LIVE_ONLY:
+            self.error = "Only available on the running system"
+        else:
+            try:
+                collect = self.spec.load()
+            except Exception as e:
+                self.error = str(e) or type(e).__name__
+        if collect is not None:
+            # Imports stay outside the measurement; only the collector itself is timed
+            with profiling.measure(self.spec) as outcome:
+                try:
+                    self.value = collect()
+                except Exception as e:
+                    self.error = str(e) or type(e).__name__
+                    outcome['status'] = 'error'
+        self.elapsed = time.monotonic() - self.start_time
+        self.done.set()
+        self.report(self.result())
+
+
+def _worker(jobs):
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        job.run()
+
+
+def _start_worker(jobs):
+    # Daemon threads, so a collector stuck in a syscall never keeps the process alive
+    threading.Thread(target=_worker, args=(jobs,), daemon=True).start()
+
+
+def collect_sections(specs, max_workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT,
+                     on_start=None, on_done=None):
+    """Start the collectors for ``specs`` concurrently and return an iterator of SectionResults, in order.
+
+    The sections start running as soon as this is called, not when the results
+    are first asked for, so callers can wait on other work in the meantime.
+    ``timeout`` is counted from the moment a section starts running; a spec's own
+    ``timeout`` overrides it. ``on_start(spec)`` and ``on_done(result)`` are called
+    from the worker threads as each section actually starts and finishes (or
+    times out), whatever order the results are yielded in.
+    """
+    jobs = [_Job(spec, on_start, on_done) for spec in specs]
+    pending = queue.Queue()
+    for job in jobs:
+        pending.put(job)
+    workers = max(1, min(max_workers, len(jobs)))
+    for _ in range(workers):
+        pending.put(None)
+        _start_worker(pending)
+    return _results(jobs, pending, timeout)
+
+
+def _results(jobs, pending, timeout):
+    """Yield each job's result in order, reporting jobs that run past their limit as timed out"""
+    for job in jobs:
+        job.started.wait()
+        limit = job.spec.timeout or timeout
+        remaining = job.start_time + limit - time.monotonic()
+        if not job.done.wait(max(remaining, 0)):
+            # The stuck worker is lost to the pool; replace it so queued sections still run.
+            # Each worker leaves on one sentinel: add one for the replacement, or the stuck
+            # worker, once it finishes, would wait on the queue forever.
+            pending.put(None)
+            _start_worker(pending)
+            result = SectionResult(job.spec, None, f"Timed out after {limit:g}s", 'timeout',
+                                   time.monotonic() - job.start_time)
+            job.report(result)
+            yield result
+        else:
+            yield job.result()
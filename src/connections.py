@@ -0,0 +1,258 @@
+"""Stream TCP sockets from /proc/net/tcp and /proc/net/tcp6.
+
+Busy load balancers hold hundreds of thousands of sockets, so nothing here
+materialises the full socket list: lines are filtered by state and port before
+any address is decoded, listings stop after ``limit`` rows, and aggregation
+keeps at most ``max_keys`` distinct groups.
+"""
+import heapq
+import os
+import socket
+import struct
+from collections import namedtuple
+from functools import lru_cache
+
+from src import paths
+
+PROC_ROOT = '/proc'
+TCP_TABLES = ('net/tcp', 'net/tcp6')
+
+TCP_STATES = {
+    '01': 'ESTABLISHED',
+    '02': 'SYN_SENT',
+    '03': 'SYN_RECV',
+    '04': 'FIN_WAIT1',
+    '05': 'FIN_WAIT2',
+    '06': 'TIME_WAIT',
+    '07': 'CLOSE',
+    '08': 'CLOSE_WAIT',
+    '09': 'LAST_ACK',
+    '0A': 'LISTEN',
+    '0B': 'CLOSING',
+    '0C': 'NEW_SYN_RECV',
+}
+
+GROUP_BY = ('remote', 'local_port', 'process', 'state')
+
+DEFAULT_MAX_KEYS = 10000
+# Socket inodes matched against the fd tables per pass when grouping by process
+INODE_BATCH = 65536
+
+
+@lru_cache(maxsize=4096)
+def _decode_ip(hex_ip):
+    if len(hex_ip) == 8:
+        return socket.inet_ntop(socket.AF_INET, struct.pack('<I', int(hex_ip, 16)))
+    words = [int(hex_ip[i:i + 8], 16) for i in range(0, 32, 8)]
+    return socket.inet_ntop(socket.AF_INET6, struct.pack('<4I', *words))
+
+
+class Socket(namedtuple('Socket', 'local remote state inode')):
+    """One line of /proc/net/tcp*; addresses stay hex until they are asked for"""
+    __slots__ = ()
+
+    @property
+    def local_address(self):
+        return _decode_ip(self.local[:-5])
+
+    @property
+    def local_port(self):
+        return int(self.local[-4:], 16)
+
+    @property
+    def remote_address(self):
+        return _decode_ip(self.remote[:-5])
+
+    @property
+    def remote_port(self):
+        return int(self.remote[-4:], 16)
+
+    @property
+    def status(self):
+        return TCP_STATES.get(self.state, self.state)
+
+
+def tables_available():
+    return os.path.exists(os.path.join(paths.resolve(PROC_ROOT), TCP_TABLES[0]))
+
+
+def iter_sockets(states=None, port=None, inodes=None):
+    """Yield matching sockets one at a time.
+
+    ``states`` is a collection of state names, ``port`` matches either end of the
+    connection and ``inodes`` restricts the result to sockets owned by a process.
+    """
+    codes = {code for code, name in TCP_STATES.items() if name in states} if states else None
+    for table in TCP_TABLES:
+        try:
+            f = open(os.path.join(paths.resolve(PROC_ROOT), table))
+        except OSError:
+            continue
+        with f:
+            next(f, None)  # header
+            for line in f:
+                fields = line.split(None, 10)
+                if len(fields) < 10:
+                    continue
+                if codes is not None and fields[3] not in codes:
+                    continue
+                local, remote = fields[1], fields[2]
+                if port is not None and port != int(local[-4:], 16) and port != int(remote[-4:], 16):
+                    continue
+                if inodes is not None and fields[9] not in inodes:
+                    continue
+                yield Socket(local, remote, fields[3], fields[9])
+
+
+def _iter_pids():
+    try:
+        names = os.listdir(paths.resolve(PROC_ROOT))
+    except OSError:
+        return
+    for name in names:
+        if name.isdigit():
+            yield int(name)
+
+
+def socket_inodes(pid):
+    """Inodes (as strings) of the sockets held open by ``pid``"""
+    inodes = set()
+    try:
+        dir_fd = os.open(os.path.join(paths.resolve(PROC_ROOT), str(pid), 'fd'), os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return inodes
+    try:
+        # Links are read relative to the open directory, with no path joined per descriptor
+        for fd in os.listdir(dir_fd):
+            try:
+                link = os.readlink(fd, dir_fd=dir_fd)
+            except OSError:
+                continue
+            if link.startswith('socket:['):
+                inodes.add(link[8:-1])
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+    return inodes
+
+
+def find_owners(inodes):
+    """Map socket inodes to PIDs, stopping as soon as every inode has been found"""
+    wanted = set(inodes)
+    wanted.discard('0')  # TIME_WAIT and orphaned sockets belong to nobody
+    owners = {}
+    if not wanted:
+        return owners
+    for pid in _iter_pids():
+        for inode in socket_inodes(pid) & wanted:
+            owners[inode] = pid
+        if len(owners) == len(wanted):
+            break
+    return owners
+
+
+def process_name(pid):
+    try:
+        with open(os.path.join(paths.resolve(PROC_ROOT), str(pid), 'comm')) as f:
+            return f.read().strip()
+    except OSError:
+        return "?"
+
+
+def list_sockets(states=None, port=None, pid=None, limit=100):
+    """Return ``(sockets, owners, total)``: the first ``limit`` matches, their owning PIDs
+    and how many sockets matched in all"""
+    inodes = socket_inodes(pid) if pid is not None else None
+    shown = []
+    total = 0
+    for sock in iter_sockets(states, port, inodes):
+        total += 1
+        if len(shown) < limit:
+            shown.append(sock)
+    if pid is not None:
+        owners = {sock.inode: pid for sock in shown}
+    else:
+        owners = find_owners(sock.inode for sock in shown)
+    return shown, owners, total
+
+
+def _count_by_process(counts, sockets, max_keys, batch_size=INODE_BATCH):
+    """Count sockets per owning process.
+
+    Matching inodes are collected ``batch_size`` at a time and every process's
+    fd table is checked against the batch, so memory stays bounded however many
+    sockets match. An inode found in one process is removed from the batch, so
+    sockets shared between fds or processes are counted once. Sockets no process
+    holds, such as TIME_WAIT ones (inode 0), count under "N/A", so the total is
+    the same as with every other grouping.
+    """
+    total = 0
+    other = 0
+    found = 0
+    batch = set()
+    sockets = iter(sockets)
+    while True:
+        for sock in sockets:
+            total += 1
+            if sock.inode == '0':
+                continue
+            batch.add(sock.inode)
+            if len(batch) >= batch_size:
+                break
+        if not batch:
+            break
+        for pid in _iter_pids():
+            owned = socket_inodes(pid) & batch
+            if not owned:
+                continue
+            batch -= owned
+            found += len(owned)
+            key = f"{pid} ({process_name(pid)})"
+            if key in counts:
+                counts[key] += len(owned)
+            elif len(counts) < max_keys:
+                counts[key] = len(owned)
+            else:
+                other += len(owned)
+            if not batch:
+                break
+        batch.clear()
+    if total > found:
+        counts["N/A"] = total - found
+    return total, other
+
+
+def aggregate_sockets(group_by, states=None, port=None, pid=None, top=20, max_keys=DEFAULT_MAX_KEYS):
+    """Count matching sockets per group and return ``(top_groups, total, other)``.
+
+    At most ``max_keys`` distinct groups are tracked; sockets that would open a
+    new group beyond that are counted in ``other`` so memory stays bounded.
+    """
+    if group_by not in GROUP_BY:
+        raise ValueError(f"Cannot group connections by {group_by!r}")
+    inodes = socket_inodes(pid) if pid is not None else None
+    sockets = iter_sockets(states, port, inodes)
+    counts = {}
+    
+    if group_by == 'process':
+        total, other = _count_by_process(counts, sockets, max_keys)
+    else:
+        key_of = {
+            'remote': lambda sock: sock.remote_address,
+            'local_port': lambda sock: sock.local_port,
+            'state': lambda sock: sock.status,
+        }[group_by]
+        total = 0
+        other = 0
+        for sock in sockets:
+            total += 1
+            key = key_of(sock)
+            if key in counts:
+                counts[key] += 1
+            elif len(counts) < max_keys:
+                counts[key] = 1
+            else:
+                other += 1
+    
+    return heapq.nlargest(top, counts.items(), key=lambda item: item[1]), total, other
@@ -0,0 +1,181 @@
+"""Disk I/O rates from two /proc/diskstats snapshots.
+
+The kernel counters are cumulative since boot, so throughput, IOPS,
+utilization and latency only exist as the difference between two snapshots
+divided by the time between them. Partitions, device-mapper (LVM, LUKS) and
+md RAID devices are mapped to the physical disks behind them through sysfs,
+so a mount can be matched to the disk whose queue and rotational flag apply.
+"""
+import os
+import threading
+import time
+from collections import namedtuple
+
+from src import paths
+
+DISKSTATS = '/proc/diskstats'
+SYS_BLOCK = '/sys/block'
+SYS_CLASS_BLOCK = '/sys/class/block'
+SYS_DEV_BLOCK = '/sys/dev/block'
+
+SECTOR_SIZE = 512  # diskstats always counts 512-byte sectors
+SAMPLE_INTERVAL = 0.5
+MIN_INTERVAL = 0.2
+RATES_MAX_AGE = 1.0
+
+DiskCounters = namedtuple('DiskCounters', 'reads read_sectors read_ms writes write_sectors write_ms io_ms')
+DiskRates = namedtuple('DiskRates', 'read_bytes write_bytes read_iops write_iops utilization latency')
+
+_lock = threading.Lock()
+_snapshot = None
+_rates = None
+
+
+def parse_diskstats(lines):
+    """Return {device name: DiskCounters} from /proc/diskstats lines"""
+    counters = {}
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 14:
+            continue
+        values = [int(value) for value in fields[3:14]]
+        counters[fields[2]] = DiskCounters(values[0], values[2], values[3], values[4], values[6],
+                                           values[7], values[9])
+    return counters
+
+
+def read_snapshot(path=None):
+    """Return (monotonic time, counters), or None when diskstats is unavailable"""
+    try:
+        with open(path or paths.resolve(DISKSTATS)) as f:
+            return time.monotonic(), parse_diskstats(f)
+    except OSError:
+        return None
+
+
+def compute_rates(before, after):
+    """Return {device name: DiskRates} per second between two snapshots"""
+    elapsed = after[0] - before[0]
+    if elapsed <= 0:
+        return {}
+    rates = {}
+    for name, now in after[1].items():
+        then = before[1].get(name)
+        if then is None:
+            continue
+        # Counters can wrap (32-bit on older kernels) or reset when a device is re-created
+        delta = DiskCounters(*(max(0, a - b) for a, b in zip(now, then)))
+        ios = delta.reads + delta.writes
+        rates[name] = DiskRates(
+            read_bytes=delta.read_sectors * SECTOR_SIZE / elapsed,
+            write_bytes=delta.write_sectors * SECTOR_SIZE / elapsed,
+            read_iops=delta.reads / elapsed,
+            write_iops=delta.writes / elapsed,
+            utilization=min(100.0, delta.io_ms / (elapsed * 1000) * 100),
+            latency=(delta.read_ms + delta.write_ms) / ios if ios else 0.0,
+        )
+    return rates
+
+
+def sample_rates(interval=SAMPLE_INTERVAL):
+    """Return ({device name: DiskRates}, counters), or (None, None) without diskstats
+
+    Sections collected together share one measurement: rates computed less
+    than RATES_MAX_AGE ago are reused, and a recent enough snapshot serves as
+    the first of the pair instead of sleeping for a fresh interval. Under
+    another root the counters are one frozen reading, so there are no rates.
+    """
+    global _snapshot, _rates
+    if not paths.is_live():
+        snapshot = read_snapshot()
+        return ({}, snapshot[1]) if snapshot is not None else (None, None)
+    with _lock:
+        now = time.monotonic()
+        if _rates is not None and now - _rates[0] < RATES_MAX_AGE:
+            return _rates[1], _rates[2]
+        before = _snapshot
+        if before is None or not MIN_INTERVAL <= now - before[0] <= 60:
+            before = read_snapshot()
+            if before is None:
+                return None, None
+            time.sleep(interval)
+        after = read_snapshot()
+        if after is None:
+            return None, None
+        rates = compute_rates(before, after)
+        _snapshot = after
+        _rates = (after[0], rates, after[1])
+        return rates, after[1]
+
+
+def kernel_name(device):
+    """Map a device path such as /dev/mapper/vg-root or /dev/disk/by-uuid/... to its kernel name"""
+    try:
+        rdev = os.stat(paths.resolve(device)).st_rdev
+    except OSError:
+        rdev = 0
+    if rdev:
+        link = os.path.join(paths.resolve(SYS_DEV_BLOCK), f'{os.major(rdev)}:{os.minor(rdev)}')
+        if os.path.exists(link):
+            return os.path.basename(os.path.realpath(link))
+    return os.path.basename(os.path.realpath(paths.resolve(device)))
+
+
+def parent_disks(name, _seen=None):
+    """Return the sorted physical disks behind a partition, dm or md device"""
+    seen = _seen if _seen is not None else set()
+    if name in seen:
+        return []
+    seen.add(name)
+
+    node = os.path.join(paths.resolve(SYS_CLASS_BLOCK), name)
+    if os.path.exists(os.path.join(node, 'partition')):
+        return parent_disks(os.path.basename(os.path.dirname(os.path.realpath(node))), seen)
+    try:
+        slaves = os.listdir(os.path.join(node, 'slaves'))
+    except OSError:
+        slaves = []
+    if not slaves:
+        return [name]
+    disks = set()
+    for slave in slaves:
+        disks.update(parent_disks(slave, seen))
+    return sorted(disks)
+
+
+def device_kind(name):
+    """Classify a /sys/block device as disk, partition, dm, md, loop, zram or virtual"""
+    if os.path.exists(os.path.join(paths.resolve(SYS_CLASS_BLOCK), name, 'partition')):
+        return 'partition'
+    for prefix in ('dm', 'md', 'loop', 'zram'):
+        if name.startswith(prefix) and name[len(prefix):len(prefix) + 1].isdigit() \
+                or name.startswith(prefix + '-'):
+            return prefix
+    if os.path.exists(os.path.join(paths.resolve(SYS_BLOCK), name, 'device')):
+        return 'disk'
+    return 'virtual'
+
+
+def rotational(name):
+    """True for spinning disks, False for SSDs, None when the kernel does not say"""
+    try:
+        with open(os.path.join(paths.resolve(SYS_BLOCK), name, 'queue', 'rotational')) as f:
+            return f.read().strip() == '1'
+    except OSError:
+        return None
+
+
+def block_devices():
+    try:
+        return sorted(os.listdir(paths.resolve(SYS_BLOCK)))
+    except OSError:
+        return []
+
+
+def physical_totals(counters):
+    """Sum the counters of physical disks only, so partitions, dm and md are not counted twice"""
+    totals = [0] * len(DiskCounters._fields)
+    for name in block_devices():
+        if name in counters and device_kind(name) == 'disk':
+            totals = [a + b for a, b in zip(totals, counters[name])]
+    return DiskCounters(*totals)
@@ -0,0 +1,331 @@
+"""Report writers used by the interactive export.
+
+Each writer takes a file-like object and writes the report into it one
+section at a time, so nothing is assembled in a single big string; with
+``open_report`` that object is the export file itself, optionally gzip or
+zstd compressed on the fly, and memory use does not grow with the report.
+
+Sections are exported from the collectors' structured data; a Rich
+``Table`` is read column by column through ``Column.cells`` rather than
+printed and parsed back, so cells keep their spaces and wrapped columns
+stay intact.
+"""
+import gzip
+import html
+import importlib.util
+import io
+import json
+import os
+from contextlib import contextmanager
+
+from src import renderers
+
+FOOTER = "Generated by _a2a (Linux System Info Tool) | © PearlK Tech"
+
+# Compression name -> file name suffix
+COMPRESSIONS = {
+    'none': '',
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+HTML_HEADER = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>System Information Report</title>
+    <meta charset="utf-8">
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            margin: 20px;
+            background-color: #f5f5f5;
+            color: #333;
+            line-height: 1.6;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background-color: white;
+            padding: 20px;
+            border-radius: 5px;
+            box-shadow: 0 0 10px rgba(0,0,0,0.1);
+        }
+        .section {
+            margin-bottom: 20px;
+            padding: 15px;
+            border: 1px solid #ddd;
+            border-radius: 4px;
+        }
+        .title {
+            color: #333;
+            border-bottom: 2px solid #007bff;
+            padding-bottom: 5px;
+            margin-bottom: 15px;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 15px 0;
+            background-color: white;
+        }
+        th, td {
+            padding: 12px 8px;
+            text-align: left;
+            border: 1px solid #ddd;
+        }
+        th {
+            background-color: #f8f9fa;
+            font-weight: bold;
+        }
+        tr:nth-child(even) {
+            background-color: #f9f9f9;
+        }
+        tr:hover {
+            background-color: #f5f5f5;
+        }
+        pre {
+            background-color: #f8f9fa;
+            padding: 10px;
+            border-radius: 4px;
+            overflow-x: auto;
+            white-space: pre-wrap;
+            word-wrap: break-word;
+        }
+        .timestamp {
+            color: #666;
+            font-style: italic;
+            margin-bottom: 20px;
+        }
+        .footer {
+            margin-top: 30px;
+            padding-top: 20px;
+            border-top: 1px solid #ddd;
+            text-align: center;
+            color: #666;
+            font-style: italic;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1 class="title">System Information Report</h1>
+"""
+
+HTML_FOOTER = f"""        <div class="footer">
+            <p>{FOOTER}</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+def zstd_available():
+    return importlib.util.find_spec('zstandard') is not None
+
+
+@contextmanager
+def open_report(path, compression='none'):
+    """Open path for writing a report as text, compressing it on the fly
+
+    The file is removed again if writing fails part way, so an interrupted
+    export does not leave a truncated report behind.
+    """
+    raw = open(path, 'wb')
+    try:
+        if compression == 'gzip':
+            stream = gzip.GzipFile(fileobj=raw, mode='wb')
+        elif compression == 'zstd':
+            import zstandard
+            stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+        else:
+            stream = raw
+        out = io.TextIOWrapper(stream, encoding='utf-8')
+        yield out
+        # Closing the wrapper flushes the compressor's trailer into raw
+        out.close()
+        raw.close()
+    except BaseException:
+        raw.close()
+        os.unlink(path)
+        raise
+
+
+def cell_text(cell):
+    """Plain text of a Rich table cell: a markup string, a Text or another renderable"""
+    if cell is None:
+        return ""
+    plain = getattr(cell, 'plain', None)
+    if plain is not None:
+        return plain
+    if isinstance(cell, str):
+        if '[' not in cell:
+            return cell
+        from rich.text import Text
+        return Text.from_markup(cell).plain
+    return str(cell)
+
+
+def table_parts(value):
+    """Return (title, headers, rows) of a collected Section or a Rich Table"""
+    if hasattr(value, 'records'):
+        return value.title, value.headers(), value.rows()
+    columns = value.columns
+    cells = [[cell_text(cell) for cell in column.cells] for column in columns]
+    title = cell_text(value.title) if value.title is not None else None
+    return title, [cell_text(column.header) for column in columns], zip(*cells)
+
+
+class SectionRows:
+    """A section's rows, produced afresh on every pass instead of being kept in a list"""
+
+    def __init__(self, section):
+        self.section = section
+
+    def __iter__(self):
+        return iter(self.section.rows())
+
+
+def table_data(value):
+    """JSON-ready form of a Section (its records) or a Rich Table (its rows)"""
+    if hasattr(value, 'records'):
+        return renderers.to_dict(value)
+    title, headers, rows = table_parts(value)
+    return {'title': title, 'columns': headers, 'rows': [list(row) for row in rows]}
+
+
+class TextWriter:
+    """Plain-text report: one aligned table per section under its category heading"""
+
+    def __init__(self, out):
+        self.out = out
+
+    def begin(self, metadata):
+        self.out.write("System Information Report\n")
+        self.out.write(f"Generated on: {metadata['generated']}\n")
+        if 'read_on' in metadata:
+            # A report read from a snapshot: who generated it, where, and which host it shows
+            self.out.write(f"Generated by: {metadata['user']} on {metadata['read_on']}\n")
+            self.out.write(f"Hostname: {metadata['hostname']} (snapshot")
+            self.out.write(f" captured {metadata['captured']})\n" if 'captured' in metadata else ")\n")
+        else:
+            self.out.write(f"Generated by: {metadata['user']}\n")
+            self.out.write(f"Hostname: {metadata['hostname']}\n")
+        self.out.write("=" * 50 + "\n\n")
+
+    def begin_category(self, name):
+        self.out.write(f"\n{name}\n{'=' * len(name)}\n\n")
+
+    def write_section(self, key, title, value, error=None):
+        self.out.write(f"{title}\n{'-' * len(title)}\n")
+        if error is not None:
+            self.out.write(f"{title}: {error}\n\n")
+            return
+        _, headers, rows = table_parts(value)
+        # Column widths need a first pass; a Section can produce its rows twice without storing them
+        rows = SectionRows(value) if hasattr(value, 'records') else list(rows)
+        for line in renderers.text_lines(None, headers, rows):
+            self.out.write(line + "\n")
+        self.out.write("\n")
+
+    def end_category(self):
+        pass
+
+    def end(self):
+        self.out.write(f"\n{FOOTER}\n")
+
+
+class HtmlWriter:
+    """HTML report: a div per category holding one table per section"""
+
+    def __init__(self, out):
+        self.out = out
+
+    def begin(self, metadata):
+        self.out.write(HTML_HEADER)
+        self.out.write(f'        <p class="timestamp">Generated on: {html.escape(metadata["generated"])}</p>\n')
+        if 'read_on' in metadata:
+            captured = f', captured {metadata["captured"]}' if 'captured' in metadata else ''
+            self.out.write(f'        <p class="timestamp">Snapshot of {html.escape(metadata["hostname"])}{html.escape(captured)}, '
+                           f'read on {html.escape(metadata["read_on"])}</p>\n')
+
+    def begin_category(self, name):
+        section_id = name.lower().replace(' ', '-')
+        self.out.write(f'<div class="section" id="{html.escape(section_id)}">\n')
+        self.out.write(f'<h2 class="section-header">{html.escape(name)}</h2>\n')
+        self.out.write('<div class="section-content">\n')
+
+    def write_section(self, key, title, value, error=None):
+        self.out.write(f'<h3 class="subsection-header">{html.escape(title)}</h3>\n')
+        if error is not None:
+            self.out.write(f'<p class="error">{html.escape(error)}</p>\n')
+            return
+        _, headers, rows = table_parts(value)
+        for chunk in renderers.html_chunks(None, headers, rows):
+            self.out.write(chunk)
+
+    def end_category(self):
+        self.out.write('</div>\n</div>\n')
+
+    def end(self):
+        self.out.write(HTML_FOOTER)
+
+
+class JsonWriter:
+    """JSON report written incrementally: {metadata..., "categories": [{"name", "sections": [...]}]}"""
+
+    def __init__(self, out):
+        self.out = out
+        self._first_category = True
+        self._first_section = True
+        self._encoder = json.JSONEncoder(default=str)
+
+    def begin(self, metadata):
+        self.out.write('{')
+        for name, value in metadata.items():
+            self.out.write(f'{json.dumps(name)}: {json.dumps(value, default=str)}, ')
+        self.out.write('"categories": [')
+
+    def begin_category(self, name):
+        if not self._first_category:
+            self.out.write(', ')
+        self._first_category = False
+        self._first_section = True
+        self.out.write(f'\n{{"name": {json.dumps(name)}, "sections": [')
+
+    def write_section(self, key, title, value, error=None):
+        if not self._first_section:
+            self.out.write(', ')
+        self._first_section = False
+        entry = {'section': key, 'title': title, 'status': 'error' if error is not None else 'ok',
+                 'error': error}
+        self.out.write('\n' + self._encoder.encode(entry)[:-1] + ', "data": ')
+        if error is not None:
+            self.out.write('null}')
+        elif hasattr(value, 'records'):
+            # One record at a time, so a huge section never exists as one JSON string
+            self.out.write(f'{{"title": {self._encoder.encode(value.title)}, "records": [')
+            for i, record in enumerate(value.records):
+                if i:
+                    self.out.write(', ')
+                for chunk in self._encoder.iterencode(renderers.record_to_dict(record)):
+                    self.out.write(chunk)
+            self.out.write(f'], "errors": {self._encoder.encode([list(e) for e in value.errors])}}}}}')
+        else:
+            for chunk in self._encoder.iterencode(table_data(value)):
+                self.out.write(chunk)
+            self.out.write('}')
+
+    def end_category(self):
+        self.out.write(']}')
+
+    def end(self):
+        self.out.write('\n]}\n')
+
+
+WRITERS = {
+    'txt': TextWriter,
+    'html': HtmlWriter,
+    'json': JsonWriter,
+}
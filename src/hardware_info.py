@@ -1,170 +1,342 @@
 import psutil
-import cpuinfo
-import GPUtil
 import platform
 import os
 import subprocess
-from rich.table import Table
 from datetime import datetime
-from rich.console import Console
+from src import cache
+from src import diskstats
+from src import history
+from src import hwids
+from src import mounts
+from src import paths
+from src import renderers
+from src import sysfs
+from src.models import (
+    PROPERTY_COLUMNS, Section, Property, Notice, Temperature, CpuInfo, MemoryInfo, GpuDevice,
+    DiskPartition, DiskIo, MotherboardInfo, UsbDevice, PciDevice, SoundDevice,
+)
 
-console = Console()
+# Fields from py-cpuinfo that cannot change without a reboot or kernel update
+STATIC_CPU_FIELDS = ('brand_raw', 'arch', 'l3_cache_size', 'stepping', 'vendor_id_raw')
 
-def get_cpu_info():
-    table = Table(title="CPU Information")
-    table.add_column("Property", style="cyan")
-    table.add_column("Value", style="green")
+_static_cpu_info = None
+
+def get_static_cpu_info():
+    """Static CPU details from py-cpuinfo, cached on disk per boot and kernel"""
+    global _static_cpu_info
+    if not paths.is_live():
+        # py-cpuinfo would probe the CPU running a2a, not the one in the snapshot
+        return read_proc_cpuinfo()
+    if _static_cpu_info is not None:
+        return _static_cpu_info
     
+    key = cache.boot_key()
+    info = cache.load('cpuinfo', key)
+    if info is None:
+        # py-cpuinfo may spawn a subprocess and probe CPUID, so only pay for it once per boot
+        import cpuinfo
+        raw = cpuinfo.get_cpu_info()
+        info = {field: raw.get(field) for field in STATIC_CPU_FIELDS}
+        if key['boot_id'] is not None:
+            cache.store('cpuinfo', key, info)
+    
+    _static_cpu_info = info
+    return info
+
+def read_proc_cpuinfo():
+    """Static CPU details and core counts parsed from /proc/cpuinfo under the current root"""
+    info = dict.fromkeys(STATIC_CPU_FIELDS)
+    info['arch'] = paths.read('/proc/sys/kernel/arch')
+    processors = 0
+    cores = set()
+    physical_id = None
     try:
-        cpu_info = cpuinfo.get_cpu_info()
-        cpu_freq = psutil.cpu_freq()
-        
-        table.add_row("CPU Model", str(cpu_info.get('brand_raw', 'N/A')))
-        table.add_row("Architecture", str(cpu_info.get('arch', 'N/A')))
-        table.add_row("Physical Cores", str(psutil.cpu_count(logical=False)))
-        table.add_row("Total Cores", str(psutil.cpu_count(logical=True)))
-        table.add_row("Max Frequency", f"{cpu_freq.max:.2f}MHz" if cpu_freq else "N/A")
-        table.add_row("Current Frequency", f"{cpu_freq.current:.2f}MHz" if cpu_freq else "N/A")
-        table.add_row("Min Frequency", f"{cpu_freq.min:.2f}MHz" if cpu_freq else "N/A")
-        table.add_row("CPU Usage", f"{psutil.cpu_percent()}%")
-        table.add_row("Cache Size", str(cpu_info.get('l3_cache_size', 'N/A')))
-        table.add_row("Stepping", str(cpu_info.get('stepping', 'N/A')))
-        table.add_row("Vendor ID", str(cpu_info.get('vendor_id_raw', 'N/A')))
+        with open(paths.resolve('/proc/cpuinfo')) as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                key = key.strip()
+                value = value.strip()
+                if key == 'processor':
+                    processors += 1
+                elif key == 'physical id':
+                    physical_id = value
+                elif key == 'core id':
+                    cores.add((physical_id, value))
+                elif processors == 1:
+                    if key == 'model name':
+                        info['brand_raw'] = value
+                    elif key == 'vendor_id':
+                        info['vendor_id_raw'] = value
+                    elif key == 'stepping':
+                        info['stepping'] = value
+                    elif key == 'cache size':
+                        info['l3_cache_size'] = value
+    except OSError:
+        pass
+    info['logical_cores'] = processors or None
+    info['physical_cores'] = len(cores) or processors or None
+    return info
+
+def cpu_usage_since_boot():
+    """Average busy percentage of all CPUs since boot, from /proc/stat under the current root"""
+    try:
+        with open(paths.resolve('/proc/stat')) as f:
+            times = [int(value) for value in f.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+    total = sum(times[:8])  # guest time is already counted in user and nice
+    idle = sum(times[3:5])
+    return round((total - idle) / total * 100, 1) if total else None
+
+def collect_cpu_info():
+    section = Section("CPU Information", PROPERTY_COLUMNS, [], [])
+    
+    try:
+        cpu_info = get_static_cpu_info()
+        live = paths.is_live()
+        # Frequencies and sensors only exist on the running system
+        cpu_freq = psutil.cpu_freq() if live else None
         
         # CPU Temperature (if available)
+        temperatures = []
         try:
-            temperatures = psutil.sensors_temperatures()
-            if temperatures:
-                for name, entries in temperatures.items():
-                    for entry in entries:
-                        table.add_row(f"Temperature ({name})", f"{entry.current}°C")
+            for name, entries in (psutil.sensors_temperatures() if live else {}).items():
+                for entry in entries:
+                    temperatures.append(Temperature(name, entry.current))
         except:
             pass
+        
+        section.records.append(CpuInfo(
+            model=cpu_info.get('brand_raw'),
+            arch=cpu_info.get('arch'),
+            physical_cores=psutil.cpu_count(logical=False) if live else cpu_info['physical_cores'],
+            logical_cores=psutil.cpu_count(logical=True) if live else cpu_info['logical_cores'],
+            max_frequency=cpu_freq.max if cpu_freq else None,
+            current_frequency=cpu_freq.current if cpu_freq else None,
+            min_frequency=cpu_freq.min if cpu_freq else None,
+            usage=psutil.cpu_percent() if live else cpu_usage_since_boot(),
+            cache_size=cpu_info.get('l3_cache_size'),
+            stepping=cpu_info.get('stepping'),
+            vendor_id=cpu_info.get('vendor_id_raw'),
+            temperatures=temperatures,
+        ))
     except Exception as e:
-        table.add_row("Error", f"Unable to fetch CPU info: {str(e)}")
+        section.errors.append(("Error", f"Unable to fetch CPU info: {str(e)}"))
+    
+    # Recorded by 'a2a record'; nothing is added when no history exists
+    section.records.extend(history.trends([('cpu_percent', "CPU Usage", '%')]))
     
-    return table
+    return section
 
-def get_memory_info():
-    table = Table(title="Memory Information")
-    table.add_column("Property", style="cyan")
-    table.add_column("Value", style="green")
+def get_cpu_info():
+    return renderers.to_rich(collect_cpu_info())
+
+def collect_memory_info():
+    section = Section("Memory Information", PROPERTY_COLUMNS, [], [])
     
     try:
         virtual_memory = psutil.virtual_memory()
         swap = psutil.swap_memory()
         
-        # RAM Information
-        table.add_row("Total RAM", f"{virtual_memory.total / (1024**3):.2f} GB")
-        table.add_row("Available RAM", f"{virtual_memory.available / (1024**3):.2f} GB")
-        table.add_row("Used RAM", f"{virtual_memory.used / (1024**3):.2f} GB")
-        table.add_row("RAM Usage", f"{virtual_memory.percent}%")
-        table.add_row("RAM Speed", str(get_ram_speed()))
-        
-        # Swap Information
-        table.add_row("Total Swap", f"{swap.total / (1024**3):.2f} GB")
-        table.add_row("Used Swap", f"{swap.used / (1024**3):.2f} GB")
-        table.add_row("Free Swap", f"{swap.free / (1024**3):.2f} GB")
-        table.add_row("Swap Usage", f"{swap.percent}%")
+        section.records.append(MemoryInfo(
+            total=virtual_memory.total,
+            available=virtual_memory.available,
+            used=virtual_memory.used,
+            percent=virtual_memory.percent,
+            ram_speed=get_ram_speed(),
+            swap_total=swap.total,
+            swap_used=swap.used,
+            swap_free=swap.free,
+            swap_percent=swap.percent,
+        ))
     except Exception as e:
-        table.add_row("Error", f"Unable to fetch memory info: {str(e)}")
+        section.errors.append(("Error", f"Unable to fetch memory info: {str(e)}"))
+    
+    section.records.extend(history.trends([
+        ('memory_percent', "RAM Usage", '%'),
+        ('swap_percent', "Swap Usage", '%'),
+    ]))
     
-    return table
+    return section
 
-def get_gpu_info():
-    table = Table(title="GPU Information")
-    table.add_column("Property", style="cyan")
-    table.add_column("Value", style="green")
+def get_memory_info():
+    return renderers.to_rich(collect_memory_info())
+
+def collect_gpu_info():
+    section = Section("GPU Information", PROPERTY_COLUMNS, [], [])
     
     try:
-        gpus = GPUtil.getGPUs()
+        # GPUtil drags in distutils/pkg_resources, so only load it when GPU info is wanted;
+        # it asks nvidia-smi about this host, so a snapshot only has its PCI devices
+        gpus = None
+        if paths.is_live():
+            import GPUtil
+            gpus = GPUtil.getGPUs()
         if gpus:
             for i, gpu in enumerate(gpus):
-                table.add_row(f"GPU {i+1} Name", str(gpu.name))
-                table.add_row(f"GPU {i+1} Driver", str(gpu.driver))
-                table.add_row(f"GPU {i+1} Memory Total", f"{gpu.memoryTotal} MB")
-                table.add_row(f"GPU {i+1} Memory Used", f"{gpu.memoryUsed} MB")
-                table.add_row(f"GPU {i+1} Memory Free", f"{gpu.memoryFree} MB")
-                table.add_row(f"GPU {i+1} Temperature", f"{gpu.temperature} °C")
-                table.add_row(f"GPU {i+1} Load", f"{gpu.load * 100:.1f}%")
+                section.records.append(GpuDevice(
+                    index=i + 1,
+                    name=gpu.name,
+                    driver=gpu.driver,
+                    memory_total=gpu.memoryTotal,
+                    memory_used=gpu.memoryUsed,
+                    memory_free=gpu.memoryFree,
+                    temperature=gpu.temperature,
+                    load=gpu.load,
+                ))
         else:
-            # Try to get GPU info using lspci on Linux
+            # Fall back to the display controllers on the PCI bus on Linux
             if platform.system() == "Linux":
-                try:
-                    gpu_info = subprocess.check_output("lspci | grep -i 'vga\|3d\|2d'", shell=True).decode()
-                    for line in gpu_info.split('\n'):
-                        if line.strip():
-                            table.add_row("GPU", line.split(': ')[1] if ': ' in line else line)
-                except:
-                    table.add_row("GPU Information", "No GPU information available")
+                pci_devices = _pci_devices_from_sysfs()
+                if pci_devices is not None:
+                    for device in pci_devices:
+                        if device.class_id.startswith('03'):
+                            section.records.append(Property("GPU", f"{device.vendor} {device.device}"))
+                    if not section.records:
+                        section.records.append(Notice("GPU Information", "No GPU information available"))
+                elif not paths.is_live():
+                    section.records.append(Notice("GPU Information", "Not in the snapshot"))
+                else:
+                    try:
+                        gpu_info = subprocess.check_output("lspci | grep -i 'vga\|3d\|2d'", shell=True).decode()
+                        for line in gpu_info.split('\n'):
+                            if line.strip():
+                                section.records.append(Property("GPU", line.split(': ')[1] if ': ' in line else line))
+                    except:
+                        section.records.append(Notice("GPU Information", "No GPU information available"))
             else:
-                table.add_row("GPU Information", "No GPU information available")
+                section.records.append(Notice("GPU Information", "No GPU information available"))
     except Exception as e:
-        table.add_row("Error", f"Unable to fetch GPU info: {str(e)}")
+        section.errors.append(("Error", f"Unable to fetch GPU info: {str(e)}"))
     
-    return table
+    return section
 
-def get_disk_info():
-    table = Table(title="Disk Information")
-    table.add_column("Device", style="cyan")
-    table.add_column("Mount Point", style="green")
-    table.add_column("File System", style="yellow")
-    table.add_column("Type", style="magenta")
-    table.add_column("Total", style="blue")
-    table.add_column("Used", style="red")
-    table.add_column("Free", style="green")
-    table.add_column("Read Speed", style="yellow")
-    table.add_column("Write Speed", style="yellow")
+def get_gpu_info():
+    return renderers.to_rich(collect_gpu_info())
+
+DISK_COLUMNS = (
+    ("Device", "cyan"),
+    ("Disk", "cyan"),
+    ("Mount Point", "green"),
+    ("File System", "yellow"),
+    ("Type", "magenta"),
+    ("Total", "blue"),
+    ("Used", "red"),
+    ("Free", "green"),
+    ("Read Speed", "yellow"),
+    ("Write Speed", "yellow"),
+    ("Status", "magenta"),
+)
+
+def collect_disk_info(include_network=None, include_pseudo=False, timeout=mounts.DEFAULT_TIMEOUT):
+    """Disk usage per mount; network mounts only with include_network or A2A_NETWORK_MOUNTS=1"""
+    section = Section("Disk Information", DISK_COLUMNS, [], [])
+    if include_network is None:
+        include_network = os.environ.get('A2A_NETWORK_MOUNTS') == '1'
     
     try:
-        console.print("[yellow]Analyzing disk drives (this may take a few moments)...[/yellow]")
-        # Get disk I/O counters
-        disk_io = psutil.disk_io_counters(perdisk=True)
+        # Rates over a short interval from /proc/diskstats; None where it does not exist
+        rates, _ = diskstats.sample_rates()
         
-        for partition in psutil.disk_partitions():
+        # Filtered by fstype before any syscall; each statvfs has its own deadline
+        selected = mounts.list_mounts(include_network, include_pseudo)
+        for usage in mounts.disk_usage(selected, timeout=timeout):
+            mount = usage.mount
             try:
-                with console.status(f"[bold blue]Analyzing {partition.device}..."):
-                    usage = psutil.disk_usage(partition.mountpoint)
-                
-                # Determine if disk is SSD or HDD
-                disk_type = get_disk_type(partition.device)
-                
-                # Get disk I/O speeds
-                disk_name = partition.device.split('/')[-1] if '/' in partition.device else partition.device
-                io_info = disk_io.get(disk_name, None)
-                
-                read_speed = "N/A"
-                write_speed = "N/A"
-                if io_info:
-                    read_speed = f"{io_info.read_bytes / (1024**2):.2f} MB/s"
-                    write_speed = f"{io_info.write_bytes / (1024**2):.2f} MB/s"
+                # Partitions, LVM/dm and md devices have their own diskstats line under the kernel name
+                disk = io_info = None
+                local = not mounts.is_network(mount.fstype)
+                if rates is not None and local and mount.device.startswith('/dev/'):
+                    name = diskstats.kernel_name(mount.device)
+                    disk = ', '.join(diskstats.parent_disks(name))
+                    io_info = rates.get(name)
                 
-                table.add_row(
-                    str(partition.device),
-                    str(partition.mountpoint),
-                    str(partition.fstype),
-                    str(disk_type),
-                    f"{usage.total / (1024**3):.2f} GB",
-                    f"{usage.used / (1024**3):.2f} GB",
-                    f"{usage.free / (1024**3):.2f} GB",
-                    str(read_speed),
-                    str(write_speed)
-                )
+                section.records.append(DiskPartition(
+                    device=mount.device,
+                    disk=disk,
+                    mountpoint=mount.mountpoint,
+                    fstype=mount.fstype,
+                    disk_type=get_disk_type(mount.device) if local else "Network",
+                    total=usage.total,
+                    used=usage.used,
+                    free=usage.free,
+                    read_rate=io_info.read_bytes if io_info else None,
+                    write_rate=io_info.write_bytes if io_info else None,
+                    status=usage.status,
+                ))
             except:
                 continue
     except Exception as e:
-        table.add_row("Error", f"Unable to fetch disk info: {str(e)}", "", "", "", "", "", "", "")
+        section.errors.append(("Error", f"Unable to fetch disk info: {str(e)}"))
+    
+    return section
+
+DISK_IO_COLUMNS = (
+    ("Device", "cyan"),
+    ("Kind", "magenta"),
+    ("Backing Disks", "cyan"),
+    ("Read Speed", "yellow"),
+    ("Write Speed", "yellow"),
+    ("Read IOPS", "green"),
+    ("Write IOPS", "green"),
+    ("Utilization", "red"),
+    ("Avg Latency", "blue"),
+)
+
+def collect_disk_io():
+    section = Section("Disk I/O Activity", DISK_IO_COLUMNS, [], [])
     
-    return table
+    rates, counters = diskstats.sample_rates()
+    if rates is None:
+        section.errors.append(("Disk I/O", "/proc/diskstats is not available"))
+        return section
+    
+    for name in diskstats.block_devices():
+        total = counters.get(name)
+        # Skip devices that were never used, such as unattached loop devices
+        if total is None or not (total.reads or total.writes):
+            continue
+        io_info = rates.get(name)
+        # A snapshot has no rates, only its devices; live, the device appeared between the samples
+        if io_info is None and paths.is_live():
+            continue
+        kind = diskstats.device_kind(name)
+        section.records.append(DiskIo(
+            device=name,
+            kind=kind,
+            disks=', '.join(diskstats.parent_disks(name)) if kind in ('dm', 'md') else None,
+            read_rate=io_info.read_bytes if io_info else None,
+            write_rate=io_info.write_bytes if io_info else None,
+            read_iops=io_info.read_iops if io_info else None,
+            write_iops=io_info.write_iops if io_info else None,
+            utilization=io_info.utilization if io_info else None,
+            latency=io_info.latency if io_info else None,
+        ))
+    
+    return section
+
+def get_disk_info():
+    from rich.console import Console
+    console = Console()
+    
+    console.print("[yellow]Analyzing disk drives (this may take a few moments)...[/yellow]")
+    with console.status("[bold blue]Analyzing disk drives..."):
+        section = collect_disk_info()
+    return renderers.to_rich(section)
+
+def get_disk_io():
+    return renderers.to_rich(collect_disk_io())
 
 def get_disk_type(device):
     """Determine if disk is SSD or HDD"""
     if platform.system() == "Linux":
         try:
-            # Remove partition numbers to get base device
-            base_device = ''.join([i for i in device if not i.isdigit()])
-            rotational = open(f"/sys/block/{os.path.basename(base_device)}/queue/rotational").read().strip()
-            return "HDD" if rotational == "1" else "SSD"
+            # Ask the physical disks behind partitions, LVM and RAID devices
+            disks = diskstats.parent_disks(diskstats.kernel_name(device))
+            flags = [diskstats.rotational(disk) for disk in disks]
+            if any(flags):
+                return "HDD"
+            return "SSD" if flags and all(flag is False for flag in flags) else "Unknown"
         except:
             return "Unknown"
     elif platform.system() == "Windows":
@@ -182,7 +354,7 @@ def get_ram_speed():
     """Get RAM speed if possible"""
     if platform.system() == "Linux":
         try:
-            with open("/proc/cpuinfo") as f:
+            with open(paths.resolve("/proc/cpuinfo")) as f:
                 for line in f:
                     if "MHz" in line:
                         return line.split(":")[1].strip()
@@ -198,10 +370,8 @@ def get_ram_speed():
             return "N/A"
     return "N/A"
 
-def get_motherboard_info():
-    table = Table(title="Motherboard Information")
-    table.add_column("Property", style="cyan")
-    table.add_column("Value", style="green")
+def collect_motherboard_info():
+    section = Section("Motherboard Information", PROPERTY_COLUMNS, [], [])
     
     if platform.system() == "Windows":
         try:
@@ -210,52 +380,90 @@ def get_motherboard_info():
             board = c.Win32_BaseBoard()[0]
             bios = c.Win32_BIOS()[0]
             
-            table.add_row("Manufacturer", board.Manufacturer)
-            table.add_row("Model", board.Product)
-            table.add_row("Serial Number", board.SerialNumber)
-            table.add_row("BIOS Version", bios.Version)
-            table.add_row("BIOS Vendor", bios.Manufacturer)
-            table.add_row("BIOS Date", bios.ReleaseDate.split('.')[0])
+            section.records.append(MotherboardInfo(
+                manufacturer=board.Manufacturer,
+                model=board.Product,
+                serial_number=board.SerialNumber,
+                bios_version=bios.Version,
+                bios_vendor=bios.Manufacturer,
+                bios_date=bios.ReleaseDate.split('.')[0],
+            ))
         except:
-            table.add_row("Motherboard Info", "Unable to fetch on Windows")
+            section.errors.append(("Motherboard Info", "Unable to fetch on Windows"))
     else:
+        info = dict.fromkeys(('board_vendor', 'board_name', 'bios_version', 'bios_date'))
         try:
-            with open('/sys/class/dmi/id/board_vendor') as f:
-                table.add_row("Manufacturer", f.read().strip())
-            with open('/sys/class/dmi/id/board_name') as f:
-                table.add_row("Model", f.read().strip())
-            with open('/sys/class/dmi/id/bios_version') as f:
-                table.add_row("BIOS Version", f.read().strip())
-            with open('/sys/class/dmi/id/bios_date') as f:
-                table.add_row("BIOS Date", f.read().strip())
+            for name in info:
+                with open(paths.resolve(f'/sys/class/dmi/id/{name}')) as f:
+                    info[name] = f.read().strip()
+        except FileNotFoundError:
+            # No DMI tables: virtual machines and most ARM boards
+            section.records.append(Notice("Motherboard Info", "No motherboard information available"))
         except:
-            table.add_row("Motherboard Info", "Unable to fetch on Linux")
+            section.errors.append(("Motherboard Info", "Unable to fetch on Linux"))
+        
+        if any(value is not None for value in info.values()):
+            section.records.append(MotherboardInfo(
+                manufacturer=info['board_vendor'],
+                model=info['board_name'],
+                serial_number=None,
+                bios_version=info['bios_version'],
+                bios_vendor=None,
+                bios_date=info['bios_date'],
+            ))
     
-    return table
+    return section
 
-def get_usb_devices():
-    table = Table(title="USB Devices")
-    table.add_column("Device", style="cyan")
-    table.add_column("Vendor ID", style="green")
-    table.add_column("Product ID", style="blue")
-    table.add_column("Manufacturer", style="yellow")
-    table.add_column("Product", style="magenta")
+def get_motherboard_info():
+    return renderers.to_rich(collect_motherboard_info())
+
+USB_COLUMNS = (
+    ("Device", "cyan"),
+    ("Vendor ID", "green"),
+    ("Product ID", "blue"),
+    ("Manufacturer", "yellow"),
+    ("Product", "magenta"),
+)
+
+def collect_usb_devices():
+    section = Section("USB Devices", USB_COLUMNS, [], [])
     
     if platform.system() == "Windows":
         try:
             import wmi
             c = wmi.WMI()
             for device in c.Win32_USBHub():
-                table.add_row(
+                section.records.append(UsbDevice(
                     device.DeviceID,
                     device.DeviceID.split("\\")[-1].split("&")[0],
                     device.DeviceID.split("\\")[-1].split("&")[1],
                     device.Manufacturer,
                     device.Description
-                )
+                ))
         except:
-            table.add_row("USB Devices", "Unable to fetch on Windows", "", "", "")
+            section.errors.append(("USB Devices", "Unable to fetch on Windows"))
     else:
+        devices = sysfs.usb_devices()
+        if devices is not None:
+            index = hwids.load_index('usb')
+            for device in devices:
+                vendor_id = device['vendor_id']
+                product_id = device['product_id']
+                section.records.append(UsbDevice(
+                    f"Bus {device['bus']:03d} Device {device['device']:03d}",
+                    vendor_id,
+                    product_id,
+                    device['manufacturer'] or hwids.vendor_name(index, vendor_id) or "",
+                    device['product'] or hwids.device_name(index, vendor_id, product_id) or ""
+                ))
+            return section
+        
+        # The tools would list this host's devices, not the snapshot's
+        if not paths.is_live():
+            section.records.append(Notice("USB Devices", "Not in the snapshot"))
+            return section
+        
+        # No sysfs (e.g. a non-Linux kernel or a restricted container): ask lsusb
         try:
             usb_devices = subprocess.check_output(['lsusb']).decode().split('\n')
             for device in usb_devices:
@@ -268,18 +476,49 @@ def get_usb_devices():
                         vendor = id_parts[0]
                         product = id_parts[1]
                         name = ' '.join(parts[6:])
-                        table.add_row(f"Bus {bus} Device {device}", vendor, product, "", name)
+                        section.records.append(UsbDevice(f"Bus {bus} Device {device}", vendor, product, "", name))
+        except (FileNotFoundError, subprocess.CalledProcessError):
+            # No lsusb, or no USB bus for it to read
+            section.records.append(Notice("USB Devices", "No USB information available"))
         except:
-            table.add_row("USB Devices", "Unable to fetch on Linux", "", "", "")
+            section.errors.append(("USB Devices", "Unable to fetch on Linux"))
     
-    return table
+    return section
 
-def get_pci_devices():
-    table = Table(title="PCI Devices")
-    table.add_column("Device", style="cyan")
-    table.add_column("Vendor", style="green")
-    table.add_column("Device ID", style="blue")
-    table.add_column("Class", style="yellow")
+def get_usb_devices():
+    return renderers.to_rich(collect_usb_devices())
+
+PCI_COLUMNS = (
+    ("Device", "cyan"),
+    ("Vendor", "green"),
+    ("Device ID", "blue"),
+    ("Class", "yellow"),
+)
+
+def _pci_devices_from_sysfs():
+    """PciDevice records built from sysfs, or None when sysfs is unavailable"""
+    devices = sysfs.pci_devices()
+    if devices is None:
+        return None
+    
+    index = hwids.load_index('pci')
+    records = []
+    for device in devices:
+        vendor_id = device['vendor_id']
+        device_id = device['device_id']
+        class_id = device['class_id']
+        subclass_id = device['subclass_id']
+        records.append(PciDevice(
+            hwids.device_name(index, vendor_id, device_id) or f"Device {device_id}",
+            hwids.vendor_name(index, vendor_id) or f"Vendor {vendor_id}",
+            f"{vendor_id}:{device_id}",
+            hwids.class_name(index, class_id, subclass_id) or f"Class {class_id}{subclass_id}",
+            f"{class_id}{subclass_id}"
+        ))
+    return records
+
+def collect_pci_devices():
+    section = Section("PCI Devices", PCI_COLUMNS, [], [])
     
     if platform.system() == "Windows":
         try:
@@ -287,15 +526,27 @@ def get_pci_devices():
             c = wmi.WMI()
             for device in c.Win32_PnPEntity():
                 if device.PNPClass == "PCI":
-                    table.add_row(
+                    section.records.append(PciDevice(
                         device.Name or "Unknown",
                         device.Manufacturer or "Unknown",
                         device.DeviceID or "Unknown",
-                        device.PNPClass or "Unknown"
-                    )
+                        device.PNPClass or "Unknown",
+                        None
+                    ))
         except:
-            table.add_row("PCI Devices", "Unable to fetch on Windows", "", "")
+            section.errors.append(("PCI Devices", "Unable to fetch on Windows"))
     else:
+        pci_devices = _pci_devices_from_sysfs()
+        if pci_devices is not None:
+            section.records.extend(pci_devices)
+            return section
+        
+        # The tools would list this host's devices, not the snapshot's
+        if not paths.is_live():
+            section.records.append(Notice("PCI Devices", "Not in the snapshot"))
+            return section
+        
+        # No sysfs (e.g. a non-Linux kernel or a restricted container): ask lspci
         try:
             pci_devices = subprocess.check_output(['lspci', '-vmm']).decode().split('\n\n')
             for device in pci_devices:
@@ -307,36 +558,58 @@ def get_pci_devices():
                             key, value = line.split(':', 1)
                             info[key.strip()] = value.strip()
                     
-                    table.add_row(
+                    section.records.append(PciDevice(
                         info.get('Device', 'Unknown'),
                         info.get('Vendor', 'Unknown'),
                         info.get('SVendor', 'Unknown'),
-                        info.get('Class', 'Unknown')
-                    )
+                        info.get('Class', 'Unknown'),
+                        None
+                    ))
         except:
-            table.add_row("PCI Devices", "Unable to fetch on Linux", "", "")
+            section.errors.append(("PCI Devices", "Unable to fetch on Linux"))
     
-    return table
+    return section
 
-def get_sound_devices():
-    table = Table(title="Sound Devices")
-    table.add_column("Name", style="cyan")
-    table.add_column("Manufacturer", style="green")
-    table.add_column("Status", style="yellow")
+def get_pci_devices():
+    return renderers.to_rich(collect_pci_devices())
+
+SOUND_COLUMNS = (
+    ("Name", "cyan"),
+    ("Manufacturer", "green"),
+    ("Status", "yellow"),
+)
+
+def collect_sound_devices():
+    section = Section("Sound Devices", SOUND_COLUMNS, [], [])
     
     if platform.system() == "Windows":
         try:
             import wmi
             c = wmi.WMI()
             for device in c.Win32_SoundDevice():
-                table.add_row(
+                section.records.append(SoundDevice(
                     device.Name or "Unknown",
                     device.Manufacturer or "Unknown",
                     "Enabled" if device.StatusInfo == 3 else "Disabled"
-                )
+                ))
         except:
-            table.add_row("Sound Devices", "Unable to fetch on Windows", "")
+            section.errors.append(("Sound Devices", "Unable to fetch on Windows"))
     else:
+        devices = sysfs.sound_devices()
+        if devices is not None:
+            for device in devices:
+                name = f"{device['card_id']} [{device['card_name']}]"
+                if device['device'] is not None:
+                    name += f", device {device['device']}"
+                section.records.append(SoundDevice(name, "N/A", "Available"))
+            return section
+        
+        # The tools would list this host's devices, not the snapshot's
+        if not paths.is_live():
+            section.records.append(Notice("Sound Devices", "Not in the snapshot"))
+            return section
+        
+        # No /proc/asound (ALSA not loaded or procfs not mounted): ask aplay
         try:
             sound_devices = subprocess.check_output(['aplay', '-l']).decode().split('\n')
             for line in sound_devices:
@@ -344,8 +617,14 @@ def get_sound_devices():
                     parts = line.split(':')
                     if len(parts) >= 2:
                         name = parts[1].strip()
-                        table.add_row(name, "N/A", "Available")
+                        section.records.append(SoundDevice(name, "N/A", "Available"))
+        except (FileNotFoundError, subprocess.CalledProcessError):
+            # No aplay, or it found no sound cards
+            section.records.append(Notice("Sound Devices", "No sound devices found"))
         except:
-            table.add_row("Sound Devices", "Unable to fetch on Linux", "")
+            section.errors.append(("Sound Devices", "Unable to fetch on Linux"))
     
-    return table 
\ No newline at end of file
+    return section
+
+def get_sound_devices():
+    return renderers.to_rich(collect_sound_devices())
@@ -0,0 +1,307 @@
+"""Fixed-size metrics history kept in a memory-mapped ring buffer file.
+
+``a2a record`` samples CPU, memory, disk and network throughput and the
+busiest processes at a fixed interval and writes them into one file of a
+size chosen up front, so history never grows past it. The file is laid out
+column by column: a 64-byte header followed by one contiguous array per
+metric, each ``capacity`` slots long. Writers and readers map the file and
+view every column as a typed ``memoryview``, so appending a sample touches
+a few bytes per column and reading one metric never touches the others.
+"""
+import math
+import mmap
+import os
+import struct
+import time
+
+MAGIC = b'A2AH'
+VERSION = 1
+HEADER = struct.Struct('=4sHHdIQ')  # magic, version, columns, interval, capacity, samples written
+HEADER_SIZE = 64
+
+TOP_PROCESSES = 3
+NAME_SIZE = 16
+
+COLUMNS = (
+    ('time', 'd'),
+    ('cpu_percent', 'f'),
+    ('memory_percent', 'f'),
+    ('swap_percent', 'f'),
+    ('disk_read', 'f'),
+    ('disk_write', 'f'),
+    ('net_sent', 'f'),
+    ('net_recv', 'f'),
+) + tuple(
+    column
+    for i in range(TOP_PROCESSES)
+    for column in ((f'top{i}_pid', 'I'), (f'top{i}_cpu', 'f'), (f'top{i}_name', f'{NAME_SIZE}s'))
+)
+
+DEFAULT_INTERVAL = 10.0
+DEFAULT_HOURS = 72
+TREND_WINDOW = 24 * 3600
+TREND_POINTS = 24
+
+
+class HistoryFormatError(Exception):
+    """The file is not a history file, or was written with a different layout"""
+
+
+def history_path():
+    base = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(base, 'a2a', 'history.bin')
+
+
+def _slot_size(typecode):
+    return struct.calcsize(typecode)
+
+
+def file_size(capacity):
+    return HEADER_SIZE + sum(_slot_size(typecode) for _, typecode in COLUMNS) * capacity
+
+
+class History:
+    """A mapped history file; use as a context manager so the mapping is released"""
+
+    def __init__(self, path=None, writable=False):
+        self.path = path or history_path()
+        self.writable = writable
+        self._file = open(self.path, 'r+b' if writable else 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise HistoryFormatError(f"{self.path} is empty")
+        if len(self._map) < HEADER_SIZE:
+            self._map.close()
+            self._file.close()
+            raise HistoryFormatError(f"{self.path} is not a compatible history file")
+        magic, version, columns, self.interval, self.capacity, _ = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or columns != len(COLUMNS) \
+                or len(self._map) != file_size(self.capacity):
+            self.close()
+            raise HistoryFormatError(f"{self.path} is not a compatible history file")
+
+        self._buffer = memoryview(self._map)
+        self.columns = {}
+        offset = HEADER_SIZE
+        for name, typecode in COLUMNS:
+            size = _slot_size(typecode) * self.capacity
+            view = self._buffer[offset:offset + size]
+            # Name columns stay raw bytes; numeric ones become typed arrays
+            self.columns[name] = view if typecode.endswith('s') else view.cast(typecode)
+            offset += size
+
+    @classmethod
+    def create(cls, path=None, interval=DEFAULT_INTERVAL, capacity=None):
+        """Create (or replace) a history file sized for capacity samples"""
+        path = path or history_path()
+        capacity = capacity or int(DEFAULT_HOURS * 3600 / interval)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.truncate(file_size(capacity))
+            f.write(HEADER.pack(MAGIC, VERSION, len(COLUMNS), interval, capacity, 0))
+        return cls(path, writable=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if getattr(self, '_buffer', None) is not None:
+            for view in self.columns.values():
+                view.release()
+            self._buffer.release()
+            self._buffer = None
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    @property
+    def written(self):
+        return HEADER.unpack_from(self._map)[5]
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+    def append(self, sample):
+        """Write one sample (a dict keyed by column name) over the oldest slot"""
+        written = self.written
+        slot = written % self.capacity
+        for name, typecode in COLUMNS:
+            value = sample.get(name)
+            if typecode.endswith('s'):
+                start = slot * NAME_SIZE
+                self.columns[name][start:start + NAME_SIZE] = (value or b'')[:NAME_SIZE].ljust(NAME_SIZE, b'\0')
+            elif typecode == 'I':
+                self.columns[name][slot] = value or 0
+            else:
+                self.columns[name][slot] = math.nan if value is None else value
+        # Publish the sample only once every column holds it
+        struct.pack_into('=Q', self._map, HEADER.size - 8, written + 1)
+
+    def _slots(self, last=None):
+        written = self.written
+        count = min(written, self.capacity, last or self.capacity)
+        first = written - count
+        return [(first + i) % self.capacity for i in range(count)]
+
+    def series(self, name, seconds=None):
+        """Return (timestamps, values) for one numeric column, oldest first
+
+        With seconds, only samples from that long before the newest one are
+        returned. Slots never written or skipped (NaN) are left out.
+        """
+        times = self.columns['time']
+        values = self.columns[name]
+        slots = self._slots(int(seconds / self.interval) + 1 if seconds else None)
+        if slots and seconds:
+            cutoff = times[slots[-1]] - seconds
+            slots = [slot for slot in slots if times[slot] >= cutoff]
+        pairs = [(times[slot], values[slot]) for slot in slots if not math.isnan(values[slot])]
+        return [t for t, _ in pairs], [v for _, v in pairs]
+
+    def top_processes(self, last=1):
+        """Return the busiest processes of the newest samples as (time, [(pid, name, cpu)]) pairs"""
+        result = []
+        for slot in self._slots(last):
+            entries = []
+            for i in range(TOP_PROCESSES):
+                pid = self.columns[f'top{i}_pid'][slot]
+                if not pid:
+                    continue
+                raw = self.columns[f'top{i}_name'][slot * NAME_SIZE:(slot + 1) * NAME_SIZE].tobytes()
+                entries.append((pid, raw.rstrip(b'\0').decode(errors='replace'),
+                                self.columns[f'top{i}_cpu'][slot]))
+            result.append((self.columns['time'][slot], entries))
+        return result
+
+
+def open_history(path=None):
+    """Open the history file read-only, or return None when nothing has been recorded"""
+    try:
+        history = History(path)
+    except (OSError, HistoryFormatError):
+        return None
+    if not len(history):
+        history.close()
+        return None
+    return history
+
+
+class Sampler:
+    """Produces one history sample per call, turning cumulative counters into rates"""
+
+    def __init__(self):
+        import psutil
+        from src.processes import create_sampler
+
+        self.psutil = psutil
+        self.processes = create_sampler()
+        self._previous = None
+
+    def _disk_bytes(self):
+        from src import diskstats
+
+        snapshot = diskstats.read_snapshot()
+        if snapshot is not None:
+            # Physical disks only; psutil's total also adds dm and md devices on top of them
+            totals = diskstats.physical_totals(snapshot[1])
+            return totals.read_sectors * diskstats.SECTOR_SIZE, totals.write_sectors * diskstats.SECTOR_SIZE
+        disk = self.psutil.disk_io_counters()
+        return (disk.read_bytes, disk.write_bytes) if disk else (None, None)
+
+    def _counters(self):
+        net = self.psutil.net_io_counters()
+        return (time.monotonic(),) + self._disk_bytes() + (
+            net.bytes_sent if net else None, net.bytes_recv if net else None)
+
+    def sample(self):
+        psutil = self.psutil
+        counters = self._counters()
+        sample = {
+            'time': time.time(),
+            'cpu_percent': self.processes.system_cpu_percent(),
+            'memory_percent': psutil.virtual_memory().percent,
+            'swap_percent': psutil.swap_memory().percent,
+        }
+        if self._previous:
+            elapsed = counters[0] - self._previous[0]
+            for name, now, before in zip(('disk_read', 'disk_write', 'net_sent', 'net_recv'),
+                                         counters[1:], self._previous[1:]):
+                if elapsed > 0 and now is not None and before is not None and now >= before:
+                    sample[name] = (now - before) / elapsed
+        self._previous = counters
+
+        for i, proc in enumerate(self.processes.refresh(sort_by='cpu', limit=TOP_PROCESSES)):
+            sample[f'top{i}_pid'] = proc['pid']
+            sample[f'top{i}_cpu'] = proc['cpu_percent']
+            sample[f'top{i}_name'] = (proc['name'] or '').encode()[:NAME_SIZE]
+        return sample
+
+
+def record(path=None, interval=DEFAULT_INTERVAL, capacity=None, samples=None, reset=False):
+    """Append samples every interval seconds until stopped (or until samples were written)
+
+    An existing file keeps its history as long as it was created with the same
+    interval and capacity; otherwise reset must be passed to replace it.
+    """
+    path = path or history_path()
+    capacity = capacity or int(DEFAULT_HOURS * 3600 / interval)
+    history = None
+    if not reset and os.path.exists(path):
+        history = History(path, writable=True)
+        if history.interval != interval or history.capacity != capacity:
+            history.close()
+            raise HistoryFormatError(
+                f"{path} was created with a {history.interval:g}s interval and {history.capacity} samples; "
+                "pass --reset to replace it")
+    if history is None:
+        history = History.create(path, interval, capacity)
+
+    sampler = Sampler()
+    written = 0
+    next_tick = time.monotonic() + interval
+    with history:
+        while samples is None or written < samples:
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+            next_tick += interval
+            history.append(sampler.sample())
+            written += 1
+    return written
+
+
+def downsample(values, points=TREND_POINTS):
+    """Average values into at most points equal buckets, oldest first"""
+    if len(values) <= points:
+        return list(values)
+    size = len(values) / points
+    buckets = []
+    for i in range(points):
+        bucket = values[int(i * size):int((i + 1) * size)]
+        buckets.append(sum(bucket) / len(bucket))
+    return buckets
+
+
+def trends(metrics, seconds=TREND_WINDOW, path=None):
+    """Return a HistoryTrend per (column, label, unit) with recorded values, or [] without history"""
+    from src import paths
+    from src.models import HistoryTrend
+
+    if not paths.is_live():
+        # The history was recorded on this machine, not on the one being analysed
+        return []
+    history = open_history(path)
+    if history is None:
+        return []
+    with history:
+        records = []
+        for column, label, unit in metrics:
+            times, values = history.series(column, seconds)
+            if values:
+                records.append(HistoryTrend(label, unit, times[-1] - times[0], min(values),
+                                            sum(values) / len(values), max(values), downsample(values)))
+        return records
@@ -0,0 +1,98 @@
+"""Vendor, device and class names from the pci.ids and usb.ids databases.
+
+The databases are plain text and take a noticeable moment to parse, so the
+parsed index is kept in memory and in the on-disk cache, keyed by the file's
+path, size and modification time.
+"""
+import os
+
+from src import cache
+
+PCI_IDS_PATHS = ('/usr/share/hwdata/pci.ids', '/usr/share/misc/pci.ids', '/usr/share/pci.ids')
+USB_IDS_PATHS = ('/usr/share/hwdata/usb.ids', '/usr/share/misc/usb.ids', '/var/lib/usbutils/usb.ids',
+                 '/usr/share/usb.ids')
+
+_indexes = {}
+
+
+def _is_hex(text):
+    try:
+        int(text, 16)
+    except ValueError:
+        return False
+    return True
+
+
+def parse_ids(lines):
+    """Parse an ids database into ``{'vendors': {...}, 'classes': {...}}``.
+
+    Both maps are ``{id: [name, {child_id: name}]}``; the third indentation level
+    (subsystems, programming interfaces) is not needed and is skipped.
+    """
+    vendors = {}
+    classes = {}
+    current = None
+    in_classes = False
+    for line in lines:
+        if not line.strip() or line.startswith('#'):
+            continue
+        if line.startswith('\t\t'):
+            continue
+        if line.startswith('\t'):
+            if current is not None:
+                child_id, _, name = line.strip().partition(' ')
+                current[1][child_id.lower()] = name.strip()
+            continue
+        if line.startswith('C '):
+            in_classes = True
+            _, class_id, name = line.rstrip('\n').split(' ', 2)
+            current = classes[class_id.lower()] = [name.strip(), {}]
+            continue
+        ident, _, name = line.partition(' ')
+        if in_classes or len(ident) != 4 or not _is_hex(ident):
+            # usb.ids lists more tables (AT, HID, L, ...) after the vendors; ignore them
+            current = None
+            continue
+        current = vendors[ident.lower()] = [name.strip(), {}]
+    return {'vendors': vendors, 'classes': classes}
+
+
+def load_index(kind):
+    """Return the parsed index for ``kind`` ('pci' or 'usb'), or None if no database is installed"""
+    if kind in _indexes:
+        return _indexes[kind]
+    
+    index = None
+    for path in PCI_IDS_PATHS if kind == 'pci' else USB_IDS_PATHS:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        key = {'path': path, 'size': stat.st_size, 'mtime': stat.st_mtime}
+        index = cache.load(f'{kind}.ids', key)
+        if index is None:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                index = parse_ids(f)
+            cache.store(f'{kind}.ids', key, index)
+        break
+    
+    _indexes[kind] = index
+    return index
+
+
+def vendor_name(index, vendor_id):
+    entry = index and index['vendors'].get(vendor_id)
+    return entry[0] if entry else None
+
+
+def device_name(index, vendor_id, device_id):
+    entry = index and index['vendors'].get(vendor_id)
+    return entry[1].get(device_id) if entry else None
+
+
+def class_name(index, class_id, subclass_id):
+    """Most specific name for a class/subclass pair, like lspci's 'Class' field"""
+    entry = index and index['classes'].get(class_id)
+    if not entry:
+        return None
+    return entry[1].get(subclass_id) or entry[0]
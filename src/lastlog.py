@@ -0,0 +1,127 @@
+"""Last-login times for many accounts at once.
+
+The binary ``/var/log/lastlog`` file holds one fixed-size record per UID, so
+the login time of any account is a single positioned read. When the file is
+missing (systems that moved to lastlog2) one ``lastlog`` run lists every
+account instead of forking ``lastlog -u`` per user.
+"""
+import os
+import struct
+import subprocess
+from datetime import datetime
+
+from src import paths
+
+LASTLOG_PATH = '/var/log/lastlog'
+LASTLOG_COMMANDS = (['lastlog'], ['lastlog2'])
+
+# struct lastlog { int32_t ll_time; char ll_line[32]; char ll_host[256]; }
+RECORD = struct.Struct('=i32s256s')
+
+NEVER = "Never"
+UNKNOWN = "Unknown"
+
+
+def format_login(timestamp, line=None, host=None):
+    if not timestamp:
+        return NEVER
+    text = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    if host:
+        text += f" from {host}"
+    elif line:
+        text += f" on {line}"
+    return text
+
+
+def read_records(uids, path=None):
+    """Return {uid: display string} from the binary lastlog file, or None if it is unreadable
+
+    The file is sparse and indexed by UID, so each record is fetched with one
+    pread at ``uid * RECORD.size`` rather than reading the whole file, which
+    can be gigabytes long on hosts with directory-service UIDs.
+    """
+    try:
+        fd = os.open(path or paths.resolve(LASTLOG_PATH), os.O_RDONLY)
+    except OSError:
+        return None
+    logins = {}
+    try:
+        for uid in sorted(set(uids)):
+            data = os.pread(fd, RECORD.size, uid * RECORD.size)
+            if len(data) < RECORD.size:
+                logins[uid] = NEVER
+                continue
+            timestamp, line, host = RECORD.unpack(data)
+            logins[uid] = format_login(timestamp,
+                                       line.split(b'\0', 1)[0].decode(errors='replace'),
+                                       host.split(b'\0', 1)[0].decode(errors='replace'))
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    return logins
+
+
+def parse_lastlog_output(output):
+    """Parse the fixed-width table printed by ``lastlog`` into {username: display string}"""
+    lines = output.splitlines()
+    if not lines:
+        return {}
+    latest = lines[0].find('Latest')
+    logins = {}
+    for line in lines[1:]:
+        fields = line.split(None, 1)
+        if not fields:
+            continue
+        if '**Never logged in**' in line or len(fields) < 2:
+            logins[fields[0]] = NEVER
+        elif latest >= 0:
+            logins[fields[0]] = line[latest:].strip() or NEVER
+        else:
+            logins[fields[0]] = ' '.join(line.split()[-4:])
+    return logins
+
+
+def read_command():
+    """Return {username: display string} from a single lastlog run, or None if none is available"""
+    for cmd in LASTLOG_COMMANDS:
+        try:
+            output = subprocess.check_output(cmd, stderr=subprocess.DEVNULL)
+        except (OSError, subprocess.CalledProcessError):
+            continue
+        return parse_lastlog_output(output.decode(errors='replace'))
+    return None
+
+
+class LastLogins:
+    """Lazy last-login lookup shared by every row of one user listing"""
+
+    def __init__(self, path=None):
+        self.path = path or paths.resolve(LASTLOG_PATH)
+        self._by_uid = {}
+        self._by_name = None
+        self._use_file = os.path.exists(self.path)
+
+    def prefetch(self, users):
+        """Resolve a page of pwd entries with one pass over the lastlog file"""
+        if not self._use_file:
+            return
+        missing = [user.pw_uid for user in users if user.pw_uid not in self._by_uid]
+        if not missing:
+            return
+        logins = read_records(missing, self.path)
+        if logins is None:
+            self._use_file = False
+        else:
+            self._by_uid.update(logins)
+
+    def get(self, user):
+        if self._use_file:
+            if user.pw_uid not in self._by_uid:
+                self.prefetch([user])
+            if self._use_file:
+                return self._by_uid.get(user.pw_uid, UNKNOWN)
+        if self._by_name is None:
+            # The lastlog command only knows the running system
+            self._by_name = (read_command() if paths.is_live() else None) or {}
+        return self._by_name.get(user.pw_name, UNKNOWN)
@@ -0,0 +1,524 @@
+"""Typed records returned by the collectors.
+
+Every ``collect_*`` function fills in one of these records and wraps them in
+a ``Section``. The renderers in ``src.renderers`` turn a section into a Rich
+table, plain text, HTML or JSON, so data is collected once and can be shown
+or exported in any format.
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+PROPERTY_COLUMNS = (("Property", "cyan"), ("Value", "green"))
+
+
+def format_gb(value):
+    return f"{value / (1024**3):.2f} GB"
+
+
+def format_mb(value):
+    return f"{value / (1024**2):.2f} MB"
+
+
+def format_rate(value):
+    return "N/A" if value is None else f"{format_mb(value)}/s"
+
+
+def format_mhz(value):
+    return f"{value:.2f}MHz" if value is not None else "N/A"
+
+
+def or_na(value):
+    return "N/A" if value is None else str(value)
+
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(points):
+    low, high = min(points), max(points)
+    if high <= low:
+        return SPARK_CHARS[0] * len(points)
+    scale = (len(SPARK_CHARS) - 1) / (high - low)
+    return "".join(SPARK_CHARS[round((point - low) * scale)] for point in points)
+
+
+def format_span(seconds):
+    if seconds < 60:
+        return f"{int(seconds)}s"
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes}m"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m" if minutes else f"{hours}h"
+
+
+@dataclass
+class Section:
+    """A titled group of records plus any errors hit while collecting them"""
+    __slots__ = ('title', 'columns', 'records', 'errors')
+    title: str
+    columns: tuple
+    records: list
+    errors: list
+
+    def headers(self):
+        return [header for header, _ in self.columns]
+
+    def rows(self):
+        """Yield every row as a tuple of display strings, padded to the column count"""
+        width = len(self.columns)
+        for record in self.records:
+            for row in record.rows():
+                yield tuple(row) + ("",) * (width - len(row))
+        for error in self.errors:
+            yield tuple(error) + ("",) * (width - len(error))
+
+
+@dataclass
+class Property:
+    __slots__ = ('name', 'value')
+    name: str
+    value: str
+
+    def rows(self):
+        return [(self.name, str(self.value))]
+
+
+@dataclass
+class Notice:
+    """Why a section has nothing to list, such as hardware that is not there; data, not an error"""
+    __slots__ = ('subject', 'message')
+    subject: str
+    message: str
+
+    def rows(self):
+        return [(self.subject, self.message)]
+
+
+@dataclass
+class Temperature:
+    __slots__ = ('sensor', 'current')
+    sensor: str
+    current: float
+
+    def rows(self):
+        return [(f"Temperature ({self.sensor})", f"{self.current}°C")]
+
+
+@dataclass
+class CpuInfo:
+    __slots__ = ('model', 'arch', 'physical_cores', 'logical_cores', 'max_frequency',
+                 'current_frequency', 'min_frequency', 'usage', 'cache_size', 'stepping',
+                 'vendor_id', 'temperatures')
+    model: str
+    arch: str
+    physical_cores: int
+    logical_cores: int
+    max_frequency: float
+    current_frequency: float
+    min_frequency: float
+    usage: float
+    cache_size: object
+    stepping: object
+    vendor_id: str
+    temperatures: list
+
+    def rows(self):
+        rows = [
+            ("CPU Model", or_na(self.model)),
+            ("Architecture", or_na(self.arch)),
+            ("Physical Cores", str(self.physical_cores)),
+            ("Total Cores", str(self.logical_cores)),
+            ("Max Frequency", format_mhz(self.max_frequency)),
+            ("Current Frequency", format_mhz(self.current_frequency)),
+            ("Min Frequency", format_mhz(self.min_frequency)),
+            ("CPU Usage", f"{self.usage}%"),
+            ("Cache Size", or_na(self.cache_size)),
+            ("Stepping", or_na(self.stepping)),
+            ("Vendor ID", or_na(self.vendor_id)),
+        ]
+        for temperature in self.temperatures:
+            rows.extend(temperature.rows())
+        return rows
+
+
+@dataclass
+class MemoryInfo:
+    __slots__ = ('total', 'available', 'used', 'percent', 'ram_speed',
+                 'swap_total', 'swap_used', 'swap_free', 'swap_percent')
+    total: int
+    available: int
+    used: int
+    percent: float
+    ram_speed: str
+    swap_total: int
+    swap_used: int
+    swap_free: int
+    swap_percent: float
+
+    def rows(self):
+        return [
+            ("Total RAM", format_gb(self.total)),
+            ("Available RAM", format_gb(self.available)),
+            ("Used RAM", format_gb(self.used)),
+            ("RAM Usage", f"{self.percent}%"),
+            ("RAM Speed", str(self.ram_speed)),
+            ("Total Swap", format_gb(self.swap_total)),
+            ("Used Swap", format_gb(self.swap_used)),
+            ("Free Swap", format_gb(self.swap_free)),
+            ("Swap Usage", f"{self.swap_percent}%"),
+        ]
+
+
+@dataclass
+class GpuDevice:
+    __slots__ = ('index', 'name', 'driver', 'memory_total', 'memory_used',
+                 'memory_free', 'temperature', 'load')
+    index: int
+    name: str
+    driver: str
+    memory_total: float
+    memory_used: float
+    memory_free: float
+    temperature: float
+    load: float
+
+    def rows(self):
+        prefix = f"GPU {self.index}"
+        return [
+            (f"{prefix} Name", str(self.name)),
+            (f"{prefix} Driver", str(self.driver)),
+            (f"{prefix} Memory Total", f"{self.memory_total} MB"),
+            (f"{prefix} Memory Used", f"{self.memory_used} MB"),
+            (f"{prefix} Memory Free", f"{self.memory_free} MB"),
+            (f"{prefix} Temperature", f"{self.temperature} °C"),
+            (f"{prefix} Load", f"{self.load * 100:.1f}%"),
+        ]
+
+
+@dataclass
+class DiskPartition:
+    __slots__ = ('device', 'disk', 'mountpoint', 'fstype', 'disk_type', 'total', 'used', 'free',
+                 'read_rate', 'write_rate', 'status')
+    device: str
+    disk: str  # physical disk(s) behind the device, e.g. 'nvme0n1' for an LVM volume on it
+    mountpoint: str
+    fstype: str
+    disk_type: str
+    total: int  # None when the mount did not answer
+    used: int
+    free: int
+    read_rate: float  # bytes per second
+    write_rate: float
+    status: str  # 'ok', 'slow', 'timeout' or 'error' for the usage query
+
+    def rows(self):
+        return [(
+            str(self.device),
+            or_na(self.disk),
+            str(self.mountpoint),
+            str(self.fstype),
+            str(self.disk_type),
+            format_gb(self.total) if self.total is not None else "N/A",
+            format_gb(self.used) if self.used is not None else "N/A",
+            format_gb(self.free) if self.free is not None else "N/A",
+            format_rate(self.read_rate),
+            format_rate(self.write_rate),
+            self.status,
+        )]
+
+
+@dataclass
+class DiskIo:
+    __slots__ = ('device', 'kind', 'disks', 'read_rate', 'write_rate', 'read_iops', 'write_iops',
+                 'utilization', 'latency')
+    device: str
+    kind: str  # disk, dm, md, loop, zram or virtual
+    disks: str  # physical disks behind a dm or md device
+    read_rate: float  # bytes per second; the rates are None without two samples, as in a snapshot
+    write_rate: float
+    read_iops: float
+    write_iops: float
+    utilization: float  # percent of the interval the device was busy
+    latency: float  # average milliseconds per completed request
+
+    def rows(self):
+        if self.read_iops is None:
+            return [(self.device, self.kind, self.disks or "") + ("N/A",) * 6]
+        return [(
+            self.device,
+            self.kind,
+            self.disks or "",
+            format_rate(self.read_rate),
+            format_rate(self.write_rate),
+            f"{self.read_iops:.1f}",
+            f"{self.write_iops:.1f}",
+            f"{self.utilization:.1f}%",
+            f"{self.latency:.2f} ms",
+        )]
+
+
+@dataclass
+class MotherboardInfo:
+    __slots__ = ('manufacturer', 'model', 'serial_number', 'bios_version', 'bios_vendor',
+                 'bios_date')
+    manufacturer: str
+    model: str
+    serial_number: str
+    bios_version: str
+    bios_vendor: str
+    bios_date: str
+
+    def rows(self):
+        labels = (
+            ("Manufacturer", self.manufacturer),
+            ("Model", self.model),
+            ("Serial Number", self.serial_number),
+            ("BIOS Version", self.bios_version),
+            ("BIOS Vendor", self.bios_vendor),
+            ("BIOS Date", self.bios_date),
+        )
+        return [(label, str(value)) for label, value in labels if value is not None]
+
+
+@dataclass
+class UsbDevice:
+    __slots__ = ('device', 'vendor_id', 'product_id', 'manufacturer', 'product')
+    device: str
+    vendor_id: str
+    product_id: str
+    manufacturer: str
+    product: str
+
+    def rows(self):
+        return [(str(self.device), str(self.vendor_id), str(self.product_id),
+                 str(self.manufacturer), str(self.product))]
+
+
+@dataclass
+class PciDevice:
+    __slots__ = ('device', 'vendor', 'device_id', 'device_class', 'class_id')
+    device: str
+    vendor: str
+    device_id: str
+    device_class: str
+    class_id: str  # 'ccss' class/subclass code in hex, when known
+
+    def rows(self):
+        return [(str(self.device), str(self.vendor), str(self.device_id), str(self.device_class))]
+
+
+@dataclass
+class SoundDevice:
+    __slots__ = ('name', 'manufacturer', 'status')
+    name: str
+    manufacturer: str
+    status: str
+
+    def rows(self):
+        return [(str(self.name), str(self.manufacturer), str(self.status))]
+
+
+@dataclass
+class NetworkInterface:
+    __slots__ = ('name', 'ip_address', 'mac_address', 'netmask', 'gateway', 'is_up',
+                 'speed', 'bytes_sent', 'bytes_recv')
+    name: str
+    ip_address: str
+    mac_address: str
+    netmask: str
+    gateway: str
+    is_up: bool
+    speed: int
+    bytes_sent: int
+    bytes_recv: int
+
+    def rows(self):
+        if self.is_up is None:
+            status = "Unknown"
+        else:
+            status = "Up" if self.is_up else "Down"
+        return [(
+            self.name,
+            or_na(self.ip_address),
+            or_na(self.mac_address),
+            or_na(self.netmask),
+            or_na(self.gateway),
+            status,
+            f"{self.speed} Mb/s" if self.speed else "N/A",
+            format_mb(self.bytes_sent) if self.bytes_sent is not None else "N/A",
+            format_mb(self.bytes_recv) if self.bytes_recv is not None else "N/A",
+        )]
+
+
+@dataclass
+class SpeedTestResult:
+    __slots__ = ('download', 'upload', 'ping', 'server', 'measured')
+    download: float
+    upload: float
+    ping: float
+    server: str
+    measured: float  # Unix time of the test; results are shown from the cache long after
+
+    def rows(self):
+        age = max(0.0, time.time() - self.measured)
+        return [
+            ("Download Speed", f"{self.download:.2f} Mbps"),
+            ("Upload Speed", f"{self.upload:.2f} Mbps"),
+            ("Ping", f"{self.ping:.2f} ms"),
+            ("Server", or_na(self.server)),
+            ("Measured", f"{datetime.fromtimestamp(self.measured):%Y-%m-%d %H:%M} ({format_span(age)} ago)"),
+        ]
+
+
+@dataclass
+class PublicIpInfo:
+    __slots__ = ('ip', 'city', 'region', 'country', 'isp', 'latitude', 'longitude', 'timezone')
+    ip: str
+    city: str
+    region: str
+    country: str
+    isp: str
+    latitude: float
+    longitude: float
+    timezone: str
+
+    def rows(self):
+        return [
+            ("Public IP", or_na(self.ip)),
+            ("City", or_na(self.city)),
+            ("Region", or_na(self.region)),
+            ("Country", or_na(self.country)),
+            ("ISP", or_na(self.isp)),
+            ("Latitude", or_na(self.latitude)),
+            ("Longitude", or_na(self.longitude)),
+            ("Timezone", or_na(self.timezone)),
+        ]
+
+
+@dataclass
+class Connection:
+    __slots__ = ('local_address', 'local_port', 'remote_address', 'remote_port', 'status', 'pid')
+    local_address: str
+    local_port: int
+    remote_address: str
+    remote_port: int
+    status: str
+    pid: int
+
+    def rows(self):
+        return [(self.local_address, str(self.local_port), self.remote_address,
+                 str(self.remote_port), self.status, or_na(self.pid))]
+
+
+@dataclass
+class ConnectionGroup:
+    __slots__ = ('key', 'count', 'share')
+    key: str
+    count: int
+    share: float
+
+    def rows(self):
+        return [(str(self.key), str(self.count), f"{self.share:.1f}%")]
+
+
+@dataclass
+class ConnectionSummary:
+    """Trailer saying how much of a large connection listing is shown"""
+    __slots__ = ('shown', 'total', 'other')
+    shown: int
+    total: int
+    other: int  # connections not counted in any shown group
+
+    def rows(self):
+        text = f"Showing {self.shown} of {self.total} connections"
+        if self.other:
+            text += f" ({self.other} in untracked groups)"
+        return [(text,)]
+
+
+@dataclass
+class NetworkStatistics:
+    __slots__ = ('bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv',
+                 'errin', 'errout', 'dropin', 'dropout')
+    bytes_sent: int
+    bytes_recv: int
+    packets_sent: int
+    packets_recv: int
+    errin: int
+    errout: int
+    dropin: int
+    dropout: int
+
+    def rows(self):
+        return [
+            ("Bytes Sent", format_gb(self.bytes_sent)),
+            ("Bytes Received", format_gb(self.bytes_recv)),
+            ("Packets Sent", str(self.packets_sent)),
+            ("Packets Received", str(self.packets_recv)),
+            ("Errors In", str(self.errin)),
+            ("Errors Out", str(self.errout)),
+            ("Drops In", str(self.dropin)),
+            ("Drops Out", str(self.dropout)),
+        ]
+
+
+@dataclass
+class Route:
+    __slots__ = ('destination', 'gateway', 'interface', 'metric')
+    destination: str
+    gateway: str
+    interface: str
+    metric: str
+
+    def rows(self):
+        return [(str(self.destination), str(self.gateway), str(self.interface), str(self.metric))]
+
+
+@dataclass
+class HistoryTrend:
+    """Recorded history of one metric, summarised for display next to its current value"""
+    __slots__ = ('label', 'unit', 'span', 'minimum', 'average', 'maximum', 'points')
+    label: str
+    unit: str  # '%' or 'B/s'
+    span: float  # seconds covered by the samples
+    minimum: float
+    average: float
+    maximum: float
+    points: list  # bucket averages, oldest first, for the sparkline
+
+    def format(self, value):
+        return format_rate(value) if self.unit == 'B/s' else f"{value:.1f}{self.unit}"
+
+    def rows(self):
+        return [(f"{self.label} (last {format_span(self.span)})",
+                 f"{sparkline(self.points)}  min {self.format(self.minimum)}  "
+                 f"avg {self.format(self.average)}  max {self.format(self.maximum)}")]
+
+
+@dataclass
+class ProcessEntry:
+    __slots__ = ('pid', 'name', 'cpu_percent', 'memory_percent', 'status', 'create_time')
+    pid: int
+    name: str
+    cpu_percent: float
+    memory_percent: float
+    status: str
+    create_time: float
+
+    def rows(self):
+        created = datetime.fromtimestamp(self.create_time).strftime("%Y-%m-%d %H:%M:%S")
+        return [(str(self.pid), self.name, f"{self.cpu_percent:.1f}", f"{self.memory_percent:.1f}",
+                 self.status, created)]
+
+
+@dataclass
+class PackageManager:
+    __slots__ = ('name', 'status', 'updates')
+    name: str
+    status: str
+    updates: str
+
+    def rows(self):
+        return [(self.name, self.status, or_na(self.updates))]
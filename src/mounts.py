@@ -0,0 +1,177 @@
+"""Mount table and disk usage that cannot hang on dead network mounts.
+
+A statvfs on a stale NFS, CIFS or sshfs mount blocks in the kernel until the
+server answers, which may be never, and the calling thread cannot be
+interrupted. Mounts are therefore filtered by filesystem type straight from
+/proc/self/mounts before any syscall touches them, and each statvfs runs in
+its own daemon thread with a deadline. A mount that misses its deadline is
+reported as timed out, and while that call is still stuck no new one is
+started for the same mount point.
+"""
+import os
+import threading
+import time
+from collections import namedtuple
+
+from src import paths
+
+MOUNTS = '/proc/self/mounts'
+FILESYSTEMS = '/proc/filesystems'
+
+NETWORK_FSTYPES = frozenset((
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'ncpfs', 'afs', 'ceph', 'glusterfs', 'lustre',
+    'gpfs', 'ocfs2', 'gfs2', '9p', 'davfs', 'sshfs', 'fuse.sshfs', 'fuse.rclone', 'fuse.s3fs',
+    'fuse.glusterfs', 'fuse.gvfsd-fuse', 'fuse.davfs', 'fuse.cephfs',
+))
+# Block-backed filesystems that /proc/filesystems lists as nodev anyway
+LOCAL_NODEV_FSTYPES = frozenset(('zfs', 'fuseblk', 'fuse.ntfs-3g'))
+
+DEFAULT_TIMEOUT = 2.0
+SLOW_THRESHOLD = 0.5
+
+Mount = namedtuple('Mount', 'device mountpoint fstype options')
+MountUsage = namedtuple('MountUsage', 'mount total used free status elapsed')
+
+_stuck_lock = threading.Lock()
+_stuck = {}  # mount point -> statvfs calls past their deadline that have not returned yet
+
+
+def _unescape(field):
+    # /proc/self/mounts escapes space, tab, newline and backslash as octal
+    if '\\' not in field:
+        return field
+    return field.encode().decode('unicode_escape').encode('latin-1').decode(errors='replace')
+
+
+def read_mounts(path=None):
+    """Return every Mount in the mount table, or None when there is none to read"""
+    try:
+        with open(path or paths.resolve(MOUNTS), encoding='utf-8', errors='replace') as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    mounts = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) >= 4:
+            mounts.append(Mount(_unescape(fields[0]), _unescape(fields[1]), fields[2], fields[3]))
+    return mounts
+
+
+def nodev_fstypes(path=None):
+    """Filesystem types the kernel marks 'nodev', i.e. not backed by a block device"""
+    try:
+        with open(path or paths.resolve(FILESYSTEMS)) as f:
+            return {line.split()[1] for line in f if line.startswith('nodev') and len(line.split()) > 1}
+    except OSError:
+        return set()
+
+
+def is_network(fstype):
+    return fstype in NETWORK_FSTYPES or fstype.startswith('fuse.') and fstype not in LOCAL_NODEV_FSTYPES
+
+
+def select_mounts(mounts, include_network=False, include_pseudo=False):
+    """Filter mounts by type only, without touching the mount points themselves"""
+    nodev = nodev_fstypes()
+    selected = {}
+    for mount in mounts:
+        if is_network(mount.fstype):
+            if not include_network:
+                continue
+        elif mount.fstype in nodev and mount.fstype not in LOCAL_NODEV_FSTYPES and not include_pseudo:
+            continue
+        # Of several mounts on one point only the last is visible; keep it at the first one's position
+        selected[mount.mountpoint] = mount
+    return list(selected.values())
+
+
+def _statvfs(mountpoint):
+    if hasattr(os, 'statvfs'):
+        st = os.statvfs(mountpoint)
+        return (st.f_blocks * st.f_frsize, (st.f_blocks - st.f_bfree) * st.f_frsize,
+                st.f_bavail * st.f_frsize)
+    import psutil
+    usage = psutil.disk_usage(mountpoint)
+    return usage.total, usage.used, usage.free
+
+
+def disk_usage(mounts, timeout=DEFAULT_TIMEOUT, slow=SLOW_THRESHOLD):
+    """Return a MountUsage per mount, each statvfs bounded by timeout seconds
+
+    Status is 'ok', 'slow' (answered after more than slow seconds), 'timeout'
+    or 'error'. All mounts are queried in parallel, so the whole call takes at
+    most about timeout seconds however many mounts are dead.
+    """
+    if not paths.is_live():
+        from src import snapshot
+        # A snapshot's mounts were measured when it was captured; a plain directory is asked directly
+        recorded = snapshot.disk_usage()
+        if recorded is not None:
+            return [MountUsage(mount, *recorded.get(mount.mountpoint, (None, None, None, 'error')), 0.0)
+                    for mount in mounts]
+
+    results = [None] * len(mounts)
+    done = [threading.Event() for _ in mounts]
+    hung = [False] * len(mounts)
+    started = time.monotonic()
+
+    def worker(index, mount):
+        begin = time.monotonic()
+        value = None
+        try:
+            value = _statvfs(paths.resolve(mount.mountpoint))
+        except OSError:
+            pass
+        finally:
+            # Under the lock, so the call is either finished or marked hung, never both
+            with _stuck_lock:
+                if hung[index]:
+                    _stuck[mount.mountpoint] -= 1
+                    if not _stuck[mount.mountpoint]:
+                        del _stuck[mount.mountpoint]
+                results[index] = (value, time.monotonic() - begin)
+                done[index].set()
+
+    for index, mount in enumerate(mounts):
+        with _stuck_lock:
+            if mount.mountpoint in _stuck:
+                # An earlier call is still blocked there; report it instead of piling up another
+                results[index] = 'stuck'
+                done[index].set()
+                continue
+        threading.Thread(target=worker, args=(index, mount), daemon=True,
+                         name=f'statvfs {mount.mountpoint}').start()
+
+    usages = []
+    for index, mount in enumerate(mounts):
+        remaining = timeout - (time.monotonic() - started)
+        if not done[index].wait(max(0.0, remaining)):
+            with _stuck_lock:
+                if not done[index].is_set():
+                    # Past its deadline: later calls skip this mount until the statvfs returns
+                    hung[index] = True
+                    _stuck[mount.mountpoint] = _stuck.get(mount.mountpoint, 0) + 1
+            if hung[index]:
+                usages.append(MountUsage(mount, None, None, None, 'timeout', time.monotonic() - started))
+                continue
+        if results[index] == 'stuck':
+            usages.append(MountUsage(mount, None, None, None, 'timeout', 0.0))
+            continue
+        value, elapsed = results[index]
+        if value is None:
+            usages.append(MountUsage(mount, None, None, None, 'error', elapsed))
+        else:
+            usages.append(MountUsage(mount, *value, 'slow' if elapsed > slow else 'ok', elapsed))
+    return usages
+
+
+def list_mounts(include_network=False, include_pseudo=False):
+    """Return the mounts worth reporting, selected by filesystem type"""
+    mounts = read_mounts()
+    if mounts is None:
+        import psutil
+        # No procfs (Windows, macOS); psutil's default listing already leaves pseudo filesystems out
+        mounts = [Mount(part.device, part.mountpoint, part.fstype, part.opts)
+                  for part in psutil.disk_partitions(all=include_pseudo)]
+    return select_mounts(mounts, include_network, include_pseudo)
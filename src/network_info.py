@@ -1,36 +1,55 @@
 import psutil
 import socket
-import requests
-import speedtest
-from rich.table import Table
 import subprocess
 import platform
-import netifaces
-from rich.console import Console
+from src import connections
+from src import history
+from src import paths
+from src import renderers
+from src import routes
+from src.models import (
+    PROPERTY_COLUMNS, Section, Property, Notice, NetworkInterface, SpeedTestResult, PublicIpInfo,
+    Connection, ConnectionGroup, ConnectionSummary, NetworkStatistics, Route,
+)
 
-console = Console()
+INTERFACE_COLUMNS = (
+    ("Interface", "cyan"),
+    ("IP Address", "green"),
+    ("MAC Address", "blue"),
+    ("Netmask", "yellow"),
+    ("Gateway", "magenta"),
+    ("Status", "red"),
+    ("Speed", "green"),
+    ("Bytes Sent", "yellow"),
+    ("Bytes Received", "yellow"),
+)
 
-def get_network_interfaces():
-    table = Table(title="Network Interfaces")
-    table.add_column("Interface", style="cyan")
-    table.add_column("IP Address", style="green")
-    table.add_column("MAC Address", style="blue")
-    table.add_column("Netmask", style="yellow")
-    table.add_column("Gateway", style="magenta")
-    table.add_column("Status", style="red")
-    table.add_column("Speed", style="green")
-    table.add_column("Bytes Sent", style="yellow")
-    table.add_column("Bytes Received", style="yellow")
+def get_interface_gateways():
+    """Map each interface to the IPv4 default gateway routed through it"""
+    snapshot = routes.get_snapshot()
+    if snapshot is not None:
+        return snapshot.gateways
+    
+    # No /proc/net/route (non-Linux): ask netifaces, once for all interfaces
+    try:
+        import netifaces
+        return {iface: gateway for gateway, iface, is_default
+                in netifaces.gateways().get(netifaces.AF_INET, []) if is_default}
+    except:
+        return {}
+
+def collect_network_interfaces():
+    section = Section("Network Interfaces", INTERFACE_COLUMNS, [], [])
     
     net_io = psutil.net_io_counters(pernic=True)
     addrs = psutil.net_if_addrs()
     stats = psutil.net_if_stats()
+    gateways = get_interface_gateways()
     
     for interface, addresses in addrs.items():
-        ip_addr = "N/A"
-        mac_addr = "N/A"
-        netmask = "N/A"
-        gateway = "N/A"
+        ip_addr = None
+        mac_addr = None
+        netmask = None
         
         # Get interface information
         for addr in addresses:
@@ -40,130 +59,187 @@ def get_network_interfaces():
             elif addr.family == psutil.AF_LINK:
                 mac_addr = addr.address
         
-        # Get gateway
-        try:
-            gws = netifaces.gateways()
-            default_gw = gws.get('default', {}).get(netifaces.AF_INET, [None])[0]
-            if default_gw:
-                gateway = default_gw
-        except:
-            pass
-        
         # Get interface statistics
-        if interface in stats:
-            status = "Up" if stats[interface].isup else "Down"
-            speed = f"{stats[interface].speed} Mb/s" if stats[interface].speed > 0 else "N/A"
-        else:
-            status = "Unknown"
-            speed = "N/A"
+        is_up = stats[interface].isup if interface in stats else None
+        speed = stats[interface].speed if interface in stats and stats[interface].speed > 0 else None
         
         # Get I/O statistics
-        if interface in net_io:
-            io_stats = net_io[interface]
-            bytes_sent = f"{io_stats.bytes_sent / (1024**2):.2f} MB"
-            bytes_recv = f"{io_stats.bytes_recv / (1024**2):.2f} MB"
-        else:
-            bytes_sent = "N/A"
-            bytes_recv = "N/A"
+        io_stats = net_io.get(interface)
         
-        table.add_row(
-            interface,
-            ip_addr,
-            mac_addr,
-            netmask,
-            gateway,
-            status,
-            speed,
-            bytes_sent,
-            bytes_recv
-        )
+        section.records.append(NetworkInterface(
+            name=interface,
+            ip_address=ip_addr,
+            mac_address=mac_addr,
+            netmask=netmask,
+            gateway=gateways.get(interface),
+            is_up=is_up,
+            speed=speed,
+            bytes_sent=io_stats.bytes_sent if io_stats else None,
+            bytes_recv=io_stats.bytes_recv if io_stats else None,
+        ))
     
-    return table
+    return section
 
-def get_network_speed():
-    table = Table(title="Network Speed Test")
-    table.add_column("Test", style="cyan")
-    table.add_column("Value", style="green")
+def get_network_interfaces():
+    return renderers.to_rich(collect_network_interfaces())
+
+SPEED_COLUMNS = (("Test", "cyan"), ("Value", "green"))
+
+def _speed_section(result):
+    section = Section("Network Speed Test", SPEED_COLUMNS, [], [])
+    section.records.append(SpeedTestResult(result['download'], result['upload'], result['ping'],
+                                           result.get('server'), result['measured']))
+    return section
+
+def collect_network_speed():
+    """The last stored speed test result; reports never start a test themselves"""
+    from src import speed_test
+    
+    result = speed_test.last_result()
+    if result is None:
+        section = Section("Network Speed Test", SPEED_COLUMNS, [], [])
+        section.records.append(Notice("Speed Test", "Not run yet (run 'a2a speedtest' or use the Speed Test menu)"))
+        return section
+    return _speed_section(result)
+
+def run_network_speed_test(server=None):
+    """Run a new speed test, store its result and return it as a section"""
+    from src import speed_test
     
     try:
-        console.print("[yellow]Starting speed test (this may take 15-20 seconds)...[/yellow]")
-        st = speedtest.Speedtest()
-        
-        with console.status("[bold blue]Testing download speed...") as status:
-            download_speed = st.download() / 1_000_000  # Convert to Mbps
-        
-        with console.status("[bold blue]Testing upload speed...") as status:
-            upload_speed = st.upload() / 1_000_000  # Convert to Mbps
-        
-        with console.status("[bold blue]Finding best server...") as status:
-            ping = st.results.ping
-        
-        table.add_row("Download Speed", f"{download_speed:.2f} Mbps")
-        table.add_row("Upload Speed", f"{upload_speed:.2f} Mbps")
-        table.add_row("Ping", f"{ping:.2f} ms")
-    except Exception as e:
-        table.add_row("Error", f"Unable to perform speed test: {str(e)}")
+        result = speed_test.run(server)
+    except speed_test.SpeedTestError as e:
+        section = Section("Network Speed Test", SPEED_COLUMNS, [], [])
+        section.errors.append(("Error", str(e)))
+        return section
+    return _speed_section(result)
+
+def get_network_speed():
+    return renderers.to_rich(collect_network_speed())
+
+def get_network_speed_test(server=None):
+    from rich.console import Console
+    console = Console()
     
-    return table
+    console.print("[yellow]Starting speed test (this may take 15-20 seconds)...[/yellow]")
+    with console.status("[bold blue]Testing download and upload speed..."):
+        section = run_network_speed_test(server)
+    return renderers.to_rich(section)
 
-def get_public_ip():
-    table = Table(title="Public IP Information")
-    table.add_column("Property", style="cyan")
-    table.add_column("Value", style="green")
+def collect_public_ip():
+    from src import public_ip
+    
+    section = Section("Public IP Information", PROPERTY_COLUMNS, [], [])
     
     try:
-        response = requests.get('https://ipapi.co/json/')
-        data = response.json()
-        
-        table.add_row("Public IP", data.get('ip', 'N/A'))
-        table.add_row("City", data.get('city', 'N/A'))
-        table.add_row("Region", data.get('region', 'N/A'))
-        table.add_row("Country", data.get('country_name', 'N/A'))
-        table.add_row("ISP", data.get('org', 'N/A'))
-        table.add_row("Latitude", str(data.get('latitude', 'N/A')))
-        table.add_row("Longitude", str(data.get('longitude', 'N/A')))
-        table.add_row("Timezone", data.get('timezone', 'N/A'))
-    except:
-        table.add_row("Public IP Info", "Unable to fetch")
+        data = public_ip.lookup()
+    except public_ip.PublicIpError as e:
+        section.errors.append(("Public IP Info", str(e)))
+        return section
     
-    return table
+    section.records.append(PublicIpInfo(
+        ip=data.get('ip'),
+        city=data.get('city'),
+        region=data.get('region'),
+        country=data.get('country_name'),
+        isp=data.get('org'),
+        latitude=data.get('latitude'),
+        longitude=data.get('longitude'),
+        timezone=data.get('timezone'),
+    ))
+    return section
+
+def get_public_ip():
+    return renderers.to_rich(collect_public_ip())
+
+CONNECTION_COLUMNS = (
+    ("Local Address", "cyan"),
+    ("Local Port", "green"),
+    ("Remote Address", "blue"),
+    ("Remote Port", "yellow"),
+    ("Status", "magenta"),
+    ("PID", "red"),
+)
+
+GROUP_COLUMN_LABELS = {
+    'remote': "Remote Address",
+    'local_port': "Local Port",
+    'process': "Process",
+    'state': "Status",
+}
 
-def get_active_connections():
-    table = Table(title="Active Network Connections")
-    table.add_column("Local Address", style="cyan")
-    table.add_column("Local Port", style="green")
-    table.add_column("Remote Address", style="blue")
-    table.add_column("Remote Port", style="yellow")
-    table.add_column("Status", style="magenta")
-    table.add_column("PID", style="red")
+def collect_active_connections(states=('ESTABLISHED',), port=None, pid=None, group_by=None, top=100):
+    """Established connections, or connection counts per group when ``group_by`` is set.
+
+    Filters are applied while the socket tables are streamed, and at most ``top``
+    rows are kept, so hosts with hundreds of thousands of sockets stay cheap.
+    """
+    if group_by:
+        columns = ((GROUP_COLUMN_LABELS[group_by], "cyan"), ("Connections", "green"), ("Share", "yellow"))
+        section = Section("Active Network Connections", columns, [], [])
+        if not connections.tables_available():
+            section.errors.append(("Connections", "Unable to read /proc/net/tcp"))
+            return section
+        
+        groups, total, other = connections.aggregate_sockets(group_by, states, port, pid, top)
+        shown = 0
+        for key, count in groups:
+            shown += count
+            section.records.append(ConnectionGroup(key, count, 100.0 * count / total))
+        # Connections in groups past ``top`` or beyond the tracked keys are not in any row
+        if shown < total:
+            section.records.append(ConnectionSummary(shown, total, other))
+        return section
+    
+    section = Section("Active Network Connections", CONNECTION_COLUMNS, [], [])
+    if connections.tables_available():
+        sockets, owners, total = connections.list_sockets(states, port, pid, top)
+        for sock in sockets:
+            section.records.append(Connection(
+                local_address=sock.local_address,
+                local_port=sock.local_port,
+                remote_address=sock.remote_address,
+                remote_port=sock.remote_port,
+                status=sock.status,
+                pid=owners.get(sock.inode),
+            ))
+        if total > len(sockets):
+            section.records.append(ConnectionSummary(len(sockets), total, 0))
+        return section
     
+    # No procfs socket tables (non-Linux): fall back to psutil
+    total = 0
     for conn in psutil.net_connections():
         try:
-            if conn.status == 'ESTABLISHED':
-                local_addr = f"{conn.laddr.ip}"
-                local_port = str(conn.laddr.port)
-                remote_addr = f"{conn.raddr.ip}"
-                remote_port = str(conn.raddr.port)
-                status = conn.status
-                pid = str(conn.pid) if conn.pid else "N/A"
-                
-                table.add_row(
-                    local_addr,
-                    local_port,
-                    remote_addr,
-                    remote_port,
-                    status,
-                    pid
-                )
+            if states and conn.status not in states:
+                continue
+            if port is not None and port not in (conn.laddr.port, conn.raddr.port if conn.raddr else None):
+                continue
+            if pid is not None and conn.pid != pid:
+                continue
+            total += 1
+            if total > top:
+                continue
+            section.records.append(Connection(
+                local_address=conn.laddr.ip,
+                local_port=conn.laddr.port,
+                remote_address=conn.raddr.ip if conn.raddr else "",
+                remote_port=conn.raddr.port if conn.raddr else "",
+                status=conn.status,
+                pid=conn.pid or None,
+            ))
         except:
             continue
+    if total > top:
+        section.records.append(ConnectionSummary(top, total, 0))
     
-    return table
+    return section
 
-def get_wifi_info():
-    table = Table(title="WiFi Information")
-    table.add_column("Property", style="cyan")
-    table.add_column("Value", style="green")
+def get_active_connections(**filters):
+    return renderers.to_rich(collect_active_connections(**filters))
+
+def collect_wifi_info():
+    section = Section("WiFi Information", PROPERTY_COLUMNS, [], [])
     
     if platform.system() == "Windows":
         try:
@@ -171,9 +247,9 @@ def get_wifi_info():
             for line in output.split('\n'):
                 if ':' in line:
                     key, value = line.split(':', 1)
-                    table.add_row(key.strip(), value.strip())
+                    section.records.append(Property(key.strip(), value.strip()))
         except:
-            table.add_row("WiFi Info", "Unable to fetch on Windows")
+            section.errors.append(("WiFi Info", "Unable to fetch on Windows"))
     else:
         try:
             output = subprocess.check_output(['iwconfig']).decode('utf-8')
@@ -183,81 +259,110 @@ def get_wifi_info():
                         key, value = line.split(':', 1)
                     else:
                         key, value = line.split(' ', 1)
-                    table.add_row(key.strip(), value.strip())
+                    section.records.append(Property(key.strip(), value.strip()))
+        except (FileNotFoundError, subprocess.CalledProcessError):
+            # No wireless tools, or no wireless interface
+            section.records.append(Notice("WiFi Info", "No WiFi information available"))
         except:
-            table.add_row("WiFi Info", "Unable to fetch on Linux")
+            section.errors.append(("WiFi Info", "Unable to fetch on Linux"))
     
-    return table
+    return section
 
-def get_network_statistics():
-    table = Table(title="Network Statistics")
-    table.add_column("Property", style="cyan")
-    table.add_column("Value", style="green")
+def get_wifi_info():
+    return renderers.to_rich(collect_wifi_info())
+
+def collect_network_statistics():
+    section = Section("Network Statistics", PROPERTY_COLUMNS, [], [])
     
     stats = psutil.net_io_counters()
+    section.records.append(NetworkStatistics(
+        bytes_sent=stats.bytes_sent,
+        bytes_recv=stats.bytes_recv,
+        packets_sent=stats.packets_sent,
+        packets_recv=stats.packets_recv,
+        errin=stats.errin,
+        errout=stats.errout,
+        dropin=stats.dropin,
+        dropout=stats.dropout,
+    ))
+    section.records.extend(history.trends([
+        ('net_sent', "Send Rate", 'B/s'),
+        ('net_recv', "Receive Rate", 'B/s'),
+    ]))
     
-    table.add_row("Bytes Sent", f"{stats.bytes_sent / (1024**3):.2f} GB")
-    table.add_row("Bytes Received", f"{stats.bytes_recv / (1024**3):.2f} GB")
-    table.add_row("Packets Sent", str(stats.packets_sent))
-    table.add_row("Packets Received", str(stats.packets_recv))
-    table.add_row("Errors In", str(stats.errin))
-    table.add_row("Errors Out", str(stats.errout))
-    table.add_row("Drops In", str(stats.dropin))
-    table.add_row("Drops Out", str(stats.dropout))
-    
-    return table
+    return section
 
-def get_dns_info():
-    table = Table(title="DNS Information")
-    table.add_column("Property", style="cyan")
-    table.add_column("Value", style="green")
+def get_network_statistics():
+    return renderers.to_rich(collect_network_statistics())
+
+def collect_dns_info():
+    section = Section("DNS Information", PROPERTY_COLUMNS, [], [])
     
     try:
-        with open('/etc/resolv.conf', 'r') as f:
+        with open(paths.resolve('/etc/resolv.conf'), 'r') as f:
             for line in f:
                 if line.startswith('nameserver'):
-                    table.add_row("DNS Server", line.split()[1])
+                    section.records.append(Property("DNS Server", line.split()[1]))
     except:
+        if not paths.is_live():
+            section.errors.append(("DNS Info", "Not in the snapshot"))
+            return section
         try:
             output = subprocess.check_output(['ipconfig', '/all']).decode('utf-8')
-            dns_servers = []
             for line in output.split('\n'):
                 if 'DNS Servers' in line:
-                    dns_servers.append(line.split(':')[1].strip())
-            for server in dns_servers:
-                table.add_row("DNS Server", server)
+                    section.records.append(Property("DNS Server", line.split(':')[1].strip()))
         except:
-            table.add_row("DNS Info", "Unable to fetch")
+            section.errors.append(("DNS Info", "Unable to fetch"))
     
-    return table
+    return section
 
-def get_route_table():
-    table = Table(title="Routing Table")
-    table.add_column("Destination", style="cyan")
-    table.add_column("Gateway", style="green")
-    table.add_column("Interface", style="yellow")
-    table.add_column("Metric", style="magenta")
+def get_dns_info():
+    return renderers.to_rich(collect_dns_info())
+
+ROUTE_COLUMNS = (
+    ("Destination", "cyan"),
+    ("Gateway", "green"),
+    ("Interface", "yellow"),
+    ("Metric", "magenta"),
+)
+
+def collect_route_table():
+    section = Section("Routing Table", ROUTE_COLUMNS, [], [])
     
     try:
+        snapshot = routes.get_snapshot()
         if platform.system() == "Windows":
             output = subprocess.check_output(['route', 'print']).decode('utf-8')
-            routes = False
+            in_routes = False
             for line in output.split('\n'):
                 if 'Active Routes:' in line:
-                    routes = True
+                    in_routes = True
                     continue
-                if routes and len(line.strip()) > 0:
+                if in_routes and len(line.strip()) > 0:
                     parts = line.split()
                     if len(parts) >= 4:
-                        table.add_row(parts[0], parts[1], parts[2], parts[3])
+                        section.records.append(Route(parts[0], parts[1], parts[2], parts[3]))
+        elif snapshot is not None:
+            for route in snapshot.routes:
+                unspecified = '0.0.0.0' if route.family == socket.AF_INET else '::'
+                section.records.append(Route(
+                    f"{route.destination}/{route.prefix}",
+                    route.gateway or unspecified,
+                    route.interface,
+                    route.metric
+                ))
         else:
             output = subprocess.check_output(['route', '-n']).decode('utf-8')
             for line in output.split('\n')[2:]:
                 if len(line.strip()) > 0:
                     parts = line.split()
                     if len(parts) >= 8:
-                        table.add_row(parts[0], parts[1], parts[7], parts[5])
+                        section.records.append(Route(parts[0], parts[1], parts[7], parts[5]))
     except:
-        table.add_row("Route Table", "Unable to fetch", "", "")
+        section.errors.append(("Route Table", "Unable to fetch"))
     
-    return table 
\ No newline at end of file
+    return section
+
+def get_route_table():
+    return renderers.to_rich(collect_route_table())
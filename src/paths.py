@@ -0,0 +1,48 @@
+"""Where system files such as /proc, /sys and /etc are read from.
+
+Normally that is the running system. ``set_root`` points the readers at a
+directory laid out like a filesystem root instead, holding ``proc``, ``sys``
+and ``etc`` subtrees, such as the synthetic fixtures the benchmarks
+generate. Readers keep their absolute paths as constants and pass them
+through ``resolve`` when they open them, so the root can change at any time
+and costs nothing while it is the real one.
+"""
+import os
+
+LIVE_ROOT = '/'
+
+_root = LIVE_ROOT
+
+
+def root():
+    return _root
+
+
+def is_live():
+    """True while files are read from the running system rather than another root"""
+    return _root == LIVE_ROOT
+
+
+def set_root(path=None):
+    """Read system files from under path from now on; None goes back to the running system"""
+    global _root
+    _root = os.path.abspath(path) if path else LIVE_ROOT
+    # psutil keeps its own procfs location, used by the helpers still going through it
+    import psutil
+    psutil.PROCFS_PATH = resolve('/proc')
+
+
+def resolve(path):
+    """Map an absolute path on the running system to the same file under the current root"""
+    if _root == LIVE_ROOT:
+        return path
+    return os.path.join(_root, path.lstrip('/'))
+
+
+def read(path, default=None):
+    """Stripped contents of a small text file under the current root, or default if it cannot be read"""
+    try:
+        with open(resolve(path), encoding='utf-8', errors='replace') as f:
+            return f.read().strip()
+    except OSError:
+        return default
@@ -0,0 +1,58 @@
+"""Background collection of report sections ahead of the first menu action.
+
+The interactive viewer starts a ``Prefetcher`` at launch, while the banner
+plays and the user reads the menu. Each prefetched result is handed out
+once, as long as it is recent enough; after that sections are collected
+fresh again, so later views never show stale data.
+"""
+import threading
+import time
+
+from src.collector import collect_sections
+
+MAX_AGE = 60.0
+
+
+class Prefetcher:
+    """Collects ``specs`` in a background thread and hands each result out once"""
+
+    def __init__(self, specs, max_age=MAX_AGE):
+        self.specs = list(specs)
+        self.max_age = max_age
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+        self._ready = {spec.key: threading.Event() for spec in self.specs}
+        self._unclaimed = set(self._ready)
+        self._results = {}
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True, name='prefetch').start()
+        return self
+
+    def _run(self):
+        try:
+            for result in collect_sections(self.specs):
+                self._results[result.spec.key] = (time.monotonic(), result)
+                self._ready[result.spec.key].set()
+        finally:
+            # Never leave a taker waiting, even if collection itself failed
+            for ready in self._ready.values():
+                ready.set()
+            self.finished.set()
+
+    def pending(self, keys):
+        """Return the keys among ``keys`` that this prefetch still has to hand out"""
+        with self._lock:
+            return {key for key in keys if key in self._unclaimed}
+
+    def take(self, key):
+        """Wait for the prefetched result of ``key`` and return it, or None if it is gone or too old"""
+        with self._lock:
+            if key not in self._unclaimed:
+                return None
+            self._unclaimed.discard(key)
+        self._ready[key].wait()
+        entry = self._results.pop(key, None)
+        if entry is None or time.monotonic() - entry[0] > self.max_age:
+            return None
+        return entry[1]
@@ -0,0 +1,387 @@
+"""Process sampling shared by the task manager and the process report.
+
+Samplers keep state between refreshes so CPU % comes from deltas against the
+previous snapshot instead of a blocking interval. ``ProcScanner`` reads /proc
+directly; ``ProcessSampler`` goes through psutil where /proc is unavailable.
+"""
+import heapq
+import os
+import time
+
+import psutil
+
+from src import paths
+
+PROC_ROOT = '/proc'
+
+
+SORT_ORDERS = {
+    'cpu': (lambda x: x['cpu_percent'], True),
+    'memory': (lambda x: x['memory_percent'] or 0, True),
+    'pid': (lambda x: x['pid'], False),
+    'name': (lambda x: (x['name'] or '').lower(), False),
+}
+
+
+def _elapsed(last, now):
+    """Seconds since the snapshot taken at last
+
+    None when there is no previous snapshot, or when reading another root, whose
+    CPU counters never move; rows then get each process's lifetime average.
+    """
+    if last is None or not paths.is_live():
+        return None
+    return now - last
+
+
+class ProcessSnapshot:
+    """One refresh worth of process rows, ordered on demand without re-collecting
+
+    top() picks the first k rows for a sort key with heapq in O(n log k), which
+    is all the default views need. Full orderings, used only when every
+    process is shown, are built once per key as index lists and kept, so
+    switching back and forth between sort keys reuses them.
+
+    ``cpu_averaged`` is set when no sampling window has been measured yet, so
+    cpu_percent holds each process's lifetime average rather than current usage.
+    """
+
+    def __init__(self, processes, total=None, cpu_averaged=False):
+        self.processes = processes
+        self.total = len(processes) if total is None else total
+        self.cpu_averaged = cpu_averaged
+        self._orders = {}  # sort key -> indices into processes in sorted order
+
+    def __len__(self):
+        return len(self.processes)
+
+    def __iter__(self):
+        return iter(self.processes)
+
+    def top(self, sort_by, k):
+        order = self._orders.get(sort_by)
+        if order is not None:
+            return [self.processes[i] for i in order[:k]]
+        if sort_by not in SORT_ORDERS:
+            return self.processes[:k]
+        key, reverse = SORT_ORDERS[sort_by]
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return select(k, self.processes, key=key)
+
+    def ordered(self, sort_by):
+        if sort_by not in SORT_ORDERS:
+            return list(self.processes)
+        order = self._orders.get(sort_by)
+        if order is None:
+            key, reverse = SORT_ORDERS[sort_by]
+            processes = self.processes
+            order = sorted(range(len(processes)), key=lambda i: key(processes[i]), reverse=reverse)
+            self._orders[sort_by] = order
+        return [self.processes[i] for i in order]
+
+    def select(self, sort_by, limit=None):
+        """Top limit rows for sort_by, or every row in order when limit is None"""
+        return self.top(sort_by, limit) if limit else self.ordered(sort_by)
+
+    def filter(self, predicate):
+        return ProcessSnapshot([proc for proc in self.processes if predicate(proc)], self.total,
+                               self.cpu_averaged)
+
+
+class ProcessSampler:
+    """Keeps psutil.Process objects between refreshes and derives CPU % from deltas
+
+    psutil's own cpu_percent() returns 0.0 the first time it is asked about a
+    process and otherwise needs a blocking interval. The sampler instead keeps
+    the CPU times from the previous refresh, so a refresh costs only the reads
+    of /proc and never sleeps. A refresh less than MIN_INTERVAL after the
+    baseline shows each process's CPU % from the last full window, and keeps
+    the baseline so the next refresh measures a full one; before the first full
+    window it shows lifetime averages and says so with cpu_averaged.
+    """
+    ATTRS = ['pid', 'name', 'cpu_times', 'memory_percent', 'status', 'username',
+             'nice', 'num_threads', 'create_time']
+    # CPU times tick in 10 ms steps, so shorter windows are mostly rounding noise
+    MIN_INTERVAL = 0.5
+
+    def __init__(self, prime=True):
+        self._procs = {}
+        self._cpu = {}  # pid -> (create_time, user + system seconds)
+        self._percents = {}  # pid -> (create_time, cpu_percent) over the last full window
+        self._last = None
+        if prime:
+            # Prime both the per-process baseline and psutil's system-wide counter
+            self.snapshot()
+            psutil.cpu_percent(interval=None)
+
+    def refresh(self, sort_by=None, limit=None, complete=True):
+        """Collect a snapshot and return its rows ordered by sort_by, cut to limit"""
+        return self.snapshot().select(sort_by, limit)
+
+    def snapshot(self):
+        """Return a ProcessSnapshot of every live process, with cpu_percent since the previous one"""
+        now = time.monotonic()
+        elapsed = _elapsed(self._last, now)
+        full = elapsed is not None and elapsed >= self.MIN_INTERVAL
+        wall = time.time()
+        procs = {}
+        cpu = {}
+        percents = {}
+        processes = []
+        
+        for pid in psutil.pids():
+            proc = self._procs.get(pid)
+            try:
+                if proc is None:
+                    proc = psutil.Process(pid)
+                info = proc.as_dict(self.ATTRS)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            
+            procs[pid] = proc
+            times = info.pop('cpu_times')
+            create_time = info['create_time']
+            total = times.user + times.system if times else None
+            info['cpu_percent'] = self._percent(pid, create_time, total, elapsed, full, wall)
+            if total is not None:
+                cpu[pid] = (create_time, total)
+                percents[pid] = (create_time, info['cpu_percent'])
+            processes.append(info)
+        
+        self._procs = procs
+        if full or elapsed is None:
+            self._last = now
+            self._percents = percents if full else {}
+        else:
+            # Keep the older baseline so the next refresh measures a full window
+            cpu.update((pid, sample) for pid, sample in self._cpu.items() if pid in procs)
+        averaged = not full and not self._percents
+        self._cpu = cpu
+        return ProcessSnapshot(processes, cpu_averaged=averaged)
+
+    def complete_rows(self, processes):
+        """psutil already filled in every field, so there is nothing left to read"""
+
+    def _percent(self, pid, create_time, total, elapsed, full, wall):
+        if total is None:
+            return 0.0
+        if not full:
+            reused = self._percents.get(pid)
+            if reused and reused[0] == create_time:
+                return reused[1]
+        else:
+            previous = self._cpu.get(pid)
+            if previous and previous[0] == create_time and total >= previous[1]:
+                return (total - previous[1]) / elapsed * 100
+        # No full window yet (unprimed, just primed or another root) or a new or reused PID:
+        # average over the process lifetime
+        lifetime = wall - create_time if create_time else 0
+        return total / lifetime * 100 if lifetime > 0 else 0.0
+
+    def system_cpu_percent(self):
+        """System-wide CPU % since the previous call, without blocking"""
+        return psutil.cpu_percent(interval=None)
+
+
+class ProcScanner:
+    """Reads process rows straight from /proc with one os.read per file
+
+    psutil opens several files per process and looks up the username on every
+    call. The scanner reads only /proc/<pid>/stat for every process, and
+    /proc/<pid>/status (for the owner UID) only for the rows that are shown,
+    with UID to name lookups cached. Rows match ProcessSampler's.
+    """
+    STATUSES = {
+        'R': 'running', 'S': 'sleeping', 'D': 'disk-sleep', 'Z': 'zombie', 'T': 'stopped',
+        't': 'tracing-stop', 'X': 'dead', 'x': 'dead', 'K': 'wake-kill', 'W': 'waking',
+        'P': 'parked', 'I': 'idle',
+    }
+    MIN_INTERVAL = ProcessSampler.MIN_INTERVAL
+    READ_SIZE = 4096
+    COMM_LENGTH = 15
+
+    def __init__(self, root=None, prime=True):
+        self.root = root or paths.resolve(PROC_ROOT)
+        # USER_HZ is part of the kernel ABI (100 on every Linux port), so the host's holds for snapshots
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.page_size = os.sysconf('SC_PAGE_SIZE')
+        self.total_memory = self._memory_total()
+        self.boot_time = psutil.boot_time()
+        self._cpu = {}  # pid -> (start ticks, utime + stime ticks)
+        self._percents = {}  # pid -> (start ticks, cpu_percent) over the last full window
+        self._uids = {}  # pid -> (start ticks, uid)
+        self._names = {}  # uid -> username
+        self._last = None
+        if prime:
+            self.snapshot()
+            psutil.cpu_percent(interval=None)
+
+    @classmethod
+    def available(cls, root=None):
+        return os.path.exists(os.path.join(root or paths.resolve(PROC_ROOT), 'self', 'stat'))
+
+    def _read(self, path):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            return os.read(fd, self.READ_SIZE)
+        finally:
+            os.close(fd)
+
+    def _pids(self):
+        return [int(entry.name) for entry in os.scandir(self.root) if entry.name.isdigit()]
+
+    def _memory_total(self):
+        """MemTotal of the system under root, the total psutil's memory_percent uses too"""
+        try:
+            with open(os.path.join(self.root, 'meminfo'), 'rb') as f:
+                for line in f:
+                    if line.startswith(b'MemTotal:'):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+        return os.sysconf('SC_PHYS_PAGES') * self.page_size
+
+    def _uptime(self):
+        return float(self._read(os.path.join(self.root, 'uptime')).split()[0])
+
+    def refresh(self, sort_by=None, limit=None, complete=True):
+        """Collect a snapshot and return its rows ordered by sort_by, cut to limit
+
+        Sorting by PID with a limit stops after the first limit PIDs instead of
+        reading every process.
+        """
+        snapshot = self.snapshot(limit if sort_by == 'pid' else None)
+        processes = snapshot.select(sort_by, limit)
+        if complete:
+            self.complete_rows(processes)
+        return processes
+
+    def snapshot(self, first_pids=None):
+        """Return a ProcessSnapshot with cpu_percent since the previous one
+
+        With first_pids, only the lowest first_pids PIDs are read.
+        """
+        now = time.monotonic()
+        elapsed = _elapsed(self._last, now)
+        full = elapsed is not None and elapsed >= self.MIN_INTERVAL
+        uptime = self._uptime()
+        pids = self._pids()
+        total = len(pids)
+        if first_pids:
+            pids = sorted(pids)[:first_pids]
+        
+        cpu = {}
+        percents = {}
+        processes = []
+        for pid in pids:
+            try:
+                data = self._read(f"{self.root}/{pid}/stat")
+            except OSError:
+                continue  # exited since the directory listing
+            head, _, tail = data.rpartition(b')')
+            fields = tail.split()
+            if len(fields) < 22:
+                continue
+            start = int(fields[19])
+            ticks = int(fields[11]) + int(fields[12])
+            cpu[pid] = (start, ticks)
+            percent = self._percent(pid, start, ticks, elapsed, full, uptime)
+            percents[pid] = (start, percent)
+            processes.append({
+                'pid': pid,
+                'name': head.partition(b'(')[2].decode(errors='replace'),
+                'cpu_percent': percent,
+                'memory_percent': int(fields[21]) * self.page_size * 100 / self.total_memory,
+                'status': self.STATUSES.get(fields[0].decode(), fields[0].decode()),
+                'username': None,
+                'nice': int(fields[16]),
+                'num_threads': int(fields[17]),
+                'create_time': self.boot_time + start / self.clock_ticks,
+            })
+        
+        if full or elapsed is None:
+            self._last = now
+            self._percents = percents if full else {}
+        else:
+            # Keep the older baseline so the next refresh measures a full window
+            cpu.update((pid, sample) for pid, sample in self._cpu.items() if pid in cpu)
+        averaged = not full and not self._percents
+        self._cpu = cpu
+        self._uids = {pid: owner for pid, owner in self._uids.items() if pid in cpu}
+        return ProcessSnapshot(processes, total, cpu_averaged=averaged)
+
+    def _percent(self, pid, start, ticks, elapsed, full, uptime):
+        if not full:
+            reused = self._percents.get(pid)
+            if reused and reused[0] == start:
+                return reused[1]
+        else:
+            previous = self._cpu.get(pid)
+            if previous and previous[0] == start and ticks >= previous[1]:
+                return (ticks - previous[1]) / self.clock_ticks / elapsed * 100
+        # No full window yet (unprimed, just primed or another root) or a new or reused PID:
+        # average over the process lifetime
+        lifetime = uptime - start / self.clock_ticks
+        return ticks / self.clock_ticks / lifetime * 100 if lifetime > 0 else 0.0
+
+    def complete_rows(self, processes):
+        """Fill in the owner and untruncated name of the rows about to be shown
+
+        Each process's status file is read at most once per PID and start time.
+        """
+        for proc in processes:
+            if proc['username'] is not None:
+                continue
+            pid = proc['pid']
+            if len(proc['name']) == self.COMM_LENGTH:
+                proc['name'] = self._full_name(pid, proc['name'])
+            start = self._cpu.get(pid, (None,))[0]
+            owner = self._uids.get(pid)
+            if owner is None or owner[0] != start:
+                uid = self._read_uid(pid)
+                if uid is None:
+                    continue
+                owner = self._uids[pid] = (start, uid)
+            proc['username'] = self._username(owner[1])
+
+    def _full_name(self, pid, comm):
+        # comm is cut to 15 characters; like psutil, prefer the command line's program name
+        try:
+            argv0 = self._read(f"{self.root}/{pid}/cmdline").split(b'\0', 1)[0]
+        except OSError:
+            return comm
+        name = os.path.basename(argv0.decode(errors='replace'))
+        return name if name.startswith(comm) else comm
+
+    def _read_uid(self, pid):
+        try:
+            data = self._read(f"{self.root}/{pid}/status")
+        except OSError:
+            return None
+        marker = data.find(b'\nUid:')
+        if marker < 0:
+            return None
+        return int(data[marker + 5:].split(None, 1)[0])
+
+    def _username(self, uid):
+        name = self._names.get(uid)
+        if name is None:
+            from src import accounts
+            name = self._names[uid] = accounts.user_name(uid)
+        return name
+
+    def system_cpu_percent(self):
+        """System-wide CPU % since the previous call, without blocking"""
+        return psutil.cpu_percent(interval=None)
+
+
+def create_sampler(prime=True):
+    """Return the fastest process sampler available on this system
+
+    A primed sampler takes a first snapshot straight away, so the first
+    refresh already has a baseline to measure CPU % against. One-off reports
+    can skip priming and get each process's lifetime average instead.
+    """
+    if ProcScanner.available():
+        return ProcScanner(prime=prime)
+    return ProcessSampler(prime=prime)
@@ -0,0 +1,193 @@
+"""Opt-in per-section timing, enabled with ``a2a --profile``.
+
+Every section runs through ``collector._Job.run``, which wraps the collector
+in ``measure`` while profiling is on. A measurement records the wall time,
+the CPU time of the collecting thread, how many subprocesses it started
+(counted through the ``subprocess.Popen`` audit event, on Python 3.8 and
+later; older versions report N/A) and how many bytes it
+read (``rchar`` from ``/proc/thread-self/io``, which counts /proc and /sys
+reads as well as disk). Work a collector hands to helper threads of its own
+is included in its wall time only, and a section that never finishes (one
+that timed out and is still stuck) has no entry.
+
+One section can additionally be run under cProfile or pyinstrument, to see
+where inside the collector the time goes.
+"""
+import json
+import sys
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+THREAD_IO = '/proc/thread-self/io'
+PROFILERS = ('cprofile', 'pyinstrument')
+
+Timing = namedtuple('Timing', 'key title status wall cpu subprocesses bytes_read')
+
+_profile = None
+_local = threading.local()
+_hook_installed = False
+
+
+class Profile:
+    """Timings gathered during one run, plus the optional deep profile of one section"""
+
+    def __init__(self, section=None, profiler='cprofile', output=None):
+        self.section = section
+        self.profiler = profiler
+        self.output = output
+        self.started = time.monotonic()
+        self.timings = []
+        self._lock = threading.Lock()
+
+    def add(self, timing):
+        with self._lock:
+            self.timings.append(timing)
+
+
+def _audit(event, args):
+    if event == 'subprocess.Popen' and hasattr(_local, 'subprocesses'):
+        _local.subprocesses += 1
+
+
+def enable(section=None, profiler='cprofile', output=None):
+    """Start recording timings for every section collected from now on"""
+    global _profile, _hook_installed
+    if profiler not in PROFILERS:
+        raise ValueError(f"unknown profiler {profiler!r}")
+    if not _hook_installed and hasattr(sys, 'addaudithook'):
+        # Audit hooks cannot be removed; this one only counts for threads being measured
+        sys.addaudithook(_audit)
+        _hook_installed = True
+    _profile = Profile(section, profiler, output)
+    return _profile
+
+
+def disable():
+    global _profile
+    profile, _profile = _profile, None
+    return profile
+
+
+def active():
+    return _profile is not None
+
+
+def _bytes_read():
+    try:
+        with open(THREAD_IO, 'rb') as f:
+            for line in f:
+                if line.startswith(b'rchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+@contextmanager
+def _deep_profile(profile, key):
+    if profile.profiler == 'pyinstrument':
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            if profile.output:
+                with open(profile.output, 'w', encoding='utf-8') as f:
+                    f.write(profiler.output_text(unicode=True))
+            else:
+                sys.stderr.write(profiler.output_text(unicode=True, color=sys.stderr.isatty()))
+        return
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        if profile.output:
+            profiler.dump_stats(profile.output)
+        else:
+            sys.stderr.write(f"\ncProfile of section {key!r} (top 25 by cumulative time)\n")
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(25)
+
+
+@contextmanager
+def measure(spec):
+    """Record one Timing for spec while the block runs; yields a dict the caller sets 'status' in"""
+    profile = _profile
+    if profile is None:
+        yield {}
+        return
+    outcome = {'status': 'ok'}
+    # Without audit hooks (Python 3.7) subprocesses are not counted
+    _local.subprocesses = 0 if _hook_installed else None
+    read_before = _bytes_read()
+    cpu_before = time.thread_time()
+    wall_before = time.monotonic()
+    try:
+        if spec.key == profile.section:
+            with _deep_profile(profile, spec.key):
+                yield outcome
+        else:
+            yield outcome
+    finally:
+        wall = time.monotonic() - wall_before
+        cpu = time.thread_time() - cpu_before
+        read_after = _bytes_read()
+        bytes_read = read_after - read_before if read_before is not None and read_after is not None else None
+        profile.add(Timing(spec.key, spec.title, outcome.get('status', 'error'), wall, cpu,
+                           _local.subprocesses, bytes_read))
+        del _local.subprocesses
+
+
+def summary(profile):
+    """Return the profile as a JSON-ready dict, slowest sections first"""
+    timings = sorted(profile.timings, key=lambda timing: timing.wall, reverse=True)
+    return {
+        'elapsed': round(time.monotonic() - profile.started, 4),
+        'sections': [
+            dict(timing._asdict(), wall=round(timing.wall, 4), cpu=round(timing.cpu, 4))
+            for timing in timings
+        ],
+        'totals': {
+            'wall': round(sum(timing.wall for timing in timings), 4),
+            'cpu': round(sum(timing.cpu for timing in timings), 4),
+            'subprocesses': sum(timing.subprocesses for timing in timings) if _hook_installed else None,
+            'bytes_read': sum(timing.bytes_read or 0 for timing in timings),
+        },
+    }
+
+
+def report(profile, format='table', out=None):
+    """Write the profile to out (stderr by default) as a table or as JSON"""
+    out = out or sys.stderr
+    data = summary(profile)
+    if format == 'json':
+        out.write(json.dumps(data) + '\n')
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+    from src.models import or_na
+    from src.utils import format_bytes
+
+    table = Table(title=f"Section profile ({data['elapsed']:.2f}s elapsed, sections run in parallel)")
+    for header, justify in (("Section", "left"), ("Status", "left"), ("Wall", "right"), ("CPU", "right"),
+                            ("Subprocesses", "right"), ("Read", "right")):
+        table.add_column(header, justify=justify)
+    for timing in data['sections']:
+        table.add_row(timing['key'], timing['status'], f"{timing['wall']:.3f}s", f"{timing['cpu']:.3f}s",
+                      or_na(timing['subprocesses']),
+                      format_bytes(timing['bytes_read']) if timing['bytes_read'] is not None else "N/A")
+    totals = data['totals']
+    table.add_row("total", "", f"{totals['wall']:.3f}s", f"{totals['cpu']:.3f}s",
+                  or_na(totals['subprocesses']), format_bytes(totals['bytes_read']), style="bold")
+    Console(file=out).print(table)
@@ -0,0 +1,78 @@
+"""Live progress for sections being collected, driven by the collector's events.
+
+A section gets a line with its running time from the moment its collector
+actually starts until it finishes, so a slow host shows which collectors it
+is waiting on, under an overall count of finished sections. When the
+display closes, a summary line names the slowest sections and their times.
+"""
+from rich.progress import Progress, ProgressColumn, SpinnerColumn, TextColumn
+from rich.text import Text
+
+SLOWEST = 3
+
+
+class ElapsedColumn(ProgressColumn):
+    """Seconds a running section has taken so far, or sections done out of all for the overall line"""
+
+    def render(self, task):
+        if task.fields.get('overall'):
+            return Text(f"{task.completed:g}/{task.total:g}", style="green")
+        if not task.started:
+            return Text("queued", style="dim")
+        return Text(f"{task.elapsed:.1f}s", style="cyan")
+
+
+class SectionProgress:
+    """Context manager showing one progress line per section
+
+    Pass ``started`` and ``finished`` to ``collect_sections`` as ``on_start`` and
+    ``on_done``; results printed on the same console appear above the display.
+    """
+
+    def __init__(self, console, specs):
+        self.console = console
+        self.progress = Progress(
+            SpinnerColumn(finished_text="[green]✓[/green]"),
+            TextColumn("{task.description}"),
+            ElapsedColumn(),
+            console=console,
+            transient=True,
+        )
+        self.overall = self.progress.add_task("Collecting sections", total=len(specs), overall=True)
+        self.tasks = {spec.key: self.progress.add_task(spec.title, total=1, start=False, visible=False)
+                      for spec in specs}
+        self.results = []
+        self.prefetched = 0
+
+    def __enter__(self):
+        self.progress.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.progress.stop()
+        if exc[0] is None:
+            self.print_summary()
+
+    def started(self, spec):
+        # Only running sections get a line, so the display stays short for any report size
+        self.progress.start_task(self.tasks[spec.key])
+        self.progress.update(self.tasks[spec.key], visible=True)
+
+    def finished(self, result, prefetched=False):
+        task_id = self.tasks[result.spec.key]
+        self.progress.update(task_id, completed=1, visible=False)
+        self.progress.stop_task(task_id)
+        self.results.append(result)
+        self.prefetched += prefetched
+        self.progress.update(self.overall, completed=len(self.results))
+
+    def print_summary(self):
+        timed = [result for result in self.results if result.elapsed]
+        if not timed:
+            return
+        slowest = sorted(timed, key=lambda result: result.elapsed, reverse=True)[:SLOWEST]
+        background = f" ({self.prefetched} in the background)" if self.prefetched else ""
+        self.console.print(
+            f"[dim]Collected {len(self.results)} sections{background}; slowest: "
+            + ", ".join(f"{result.spec.key} {result.elapsed:.2f}s" for result in slowest)
+            + "[/dim]")
@@ -0,0 +1,174 @@
+"""Public IP lookup through a shared HTTP session, cached in memory and on disk.
+
+The geolocation service is asked at most once per ``PUBLIC_IP_TTL``: the
+answer is kept in memory for the running process and in the a2a cache for
+the next one. Lookups run in a background thread, so a report can start one
+early and pick the answer up later, and a caller never waits longer than
+the connect and read timeouts, DNS included. Without any default route the
+lookup fails at once instead of waiting for timeouts.
+
+``A2A_PUBLIC_IP_URL`` points the lookup at another endpoint returning the
+same JSON, such as a local HTTP server in tests.
+"""
+import ipaddress
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from src import cache
+from src import routes
+
+PUBLIC_IP_URL = 'https://ipapi.co/json/'
+PUBLIC_IP_TTL = 600
+FAILURE_TTL = 30  # failed lookups are not retried by every view in a row
+CONNECT_TIMEOUT = 2.0
+READ_TIMEOUT = 3.0
+USER_AGENT = 'linux-sys-info'
+
+_session = None
+_session_lock = threading.Lock()
+
+_lock = threading.Lock()
+_result = None  # (url, monotonic expiry, data, error)
+_pending = {}  # url -> Event set when its running lookup finishes
+
+
+class PublicIpError(Exception):
+    """The public IP could not be looked up; the message says why"""
+
+
+def endpoint():
+    return os.environ.get('A2A_PUBLIC_IP_URL') or PUBLIC_IP_URL
+
+
+def session():
+    """Return the process-wide requests session, so repeated lookups reuse one connection"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            new = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0)
+            new.mount('http://', adapter)
+            new.mount('https://', adapter)
+            new.headers['User-Agent'] = USER_AGENT
+            _session = new
+        return _session
+
+
+def _is_local(url):
+    host = urlsplit(url).hostname or ''
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def network_unreachable(url):
+    """True when the routing table shows the endpoint cannot be reached at all"""
+    if _is_local(url):
+        return False
+    snapshot = routes.get_snapshot()
+    if snapshot is None:
+        # No /proc/net/route to judge by; let the request try
+        return False
+    return not any(route.is_default for route in snapshot.routes)
+
+
+def fetch(url):
+    """Ask the endpoint directly, bypassing every cache"""
+    if network_unreachable(url):
+        raise PublicIpError("No network route")
+    import requests
+
+    try:
+        response = session().get(url, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        response.raise_for_status()
+        data = response.json()
+    except requests.Timeout:
+        raise PublicIpError("Lookup timed out")
+    except requests.HTTPError as e:
+        raise PublicIpError(f"Lookup failed (HTTP {e.response.status_code})")
+    except requests.RequestException:
+        raise PublicIpError("Unable to reach lookup service")
+    except ValueError:
+        raise PublicIpError("Lookup service returned invalid data")
+    if not isinstance(data, dict) or data.get('error'):
+        reason = data.get('reason') if isinstance(data, dict) else None
+        raise PublicIpError(f"Lookup refused: {reason}" if reason else "Lookup service returned invalid data")
+    return data
+
+
+def _cached(url):
+    if _result is not None and _result[0] == url and time.monotonic() < _result[1]:
+        return _result
+    return None
+
+
+def _run(url, done):
+    global _result
+    data = error = None
+    try:
+        data = fetch(url)
+    except PublicIpError as e:
+        error = str(e)
+    except Exception:
+        error = "Unable to fetch"
+    with _lock:
+        ttl = FAILURE_TTL if error else PUBLIC_IP_TTL
+        _result = (url, time.monotonic() + ttl, data, error)
+        _pending.pop(url, None)
+    if data is not None:
+        cache.store('public_ip', {'url': url}, data)
+    done.set()
+
+
+def start(url=None):
+    """Begin a background lookup unless the answer is cached or already on its way
+
+    Returns an Event that is set once an answer is available.
+    """
+    global _result
+    url = url or endpoint()
+    with _lock:
+        if _cached(url):
+            done = threading.Event()
+            done.set()
+            return done
+        if url in _pending:
+            return _pending[url]
+        entry = cache.load_entry('public_ip', {'url': url}, max_age=PUBLIC_IP_TTL)
+        if entry is not None:
+            stored_at, data = entry
+            # Expire with the disk entry, not a full TTL after it was read
+            expiry = time.monotonic() + PUBLIC_IP_TTL - (time.time() - stored_at)
+            _result = (url, expiry, data, None)
+            done = threading.Event()
+            done.set()
+            return done
+        done = _pending[url] = threading.Event()
+    threading.Thread(target=_run, args=(url, done), daemon=True, name='public ip lookup').start()
+    return done
+
+
+def lookup(url=None, timeout=CONNECT_TIMEOUT + READ_TIMEOUT):
+    """Return the endpoint's JSON answer as a dict, waiting at most timeout seconds
+
+    Raises PublicIpError when the lookup failed or did not finish in time; a
+    lookup still running keeps going and serves the next caller.
+    """
+    url = url or endpoint()
+    if not start(url).wait(timeout):
+        raise PublicIpError("Lookup timed out")
+    with _lock:
+        result = _cached(url)
+    if result is None:
+        raise PublicIpError("Unable to fetch")
+    if result[3]:
+        raise PublicIpError(result[3])
+    return result[2]
@@ -0,0 +1,72 @@
+"""Render collected sections as Rich tables, plain text, HTML or JSON.
+
+Only ``to_rich`` needs Rich; the other renderers work on the records alone so
+headless runs never pay for the Rich layout engine.
+"""
+import html
+import json
+from dataclasses import asdict
+
+
+def to_rich(section):
+    from rich.table import Table
+
+    table = Table(title=section.title)
+    for header, style in section.columns:
+        table.add_column(header, style=style)
+    for row in section.rows():
+        table.add_row(*row)
+    return table
+
+
+def text_lines(title, headers, rows):
+    """Yield the lines of a plain-text table; rows is iterated twice, widths first"""
+    widths = [len(header) for header in headers]
+    for row in rows:
+        for i, cell in enumerate(row):
+            widths[i] = max(widths[i], len(cell))
+
+    def format_row(cells):
+        return "  ".join(cell.ljust(width) for cell, width in zip(cells, widths)).rstrip()
+
+    if title is not None:
+        yield title
+    yield format_row(headers)
+    yield format_row(["-" * width for width in widths])
+    for row in rows:
+        yield format_row(row)
+
+
+def to_text(section):
+    return "\n".join(text_lines(section.title, section.headers(), list(section.rows()))) + "\n"
+
+
+def html_chunks(title, headers, rows):
+    """Yield an HTML table piece by piece, one row at a time, so it can be streamed"""
+    yield '<div class="table-responsive">\n<table class="info-table">\n<thead>\n'
+    if title is not None:
+        yield f'<tr>\n<th colspan="100%" class="table-title">{html.escape(title)}</th>\n</tr>\n'
+    yield '<tr>\n' + ''.join(f'<th>{html.escape(header)}</th>\n' for header in headers) + '</tr>\n</thead>\n<tbody>\n'
+    for row in rows:
+        yield '<tr>\n' + ''.join(f'<td>{html.escape(cell)}</td>\n' for cell in row) + '</tr>\n'
+    yield '</tbody>\n</table>\n</div>\n'
+
+
+def to_html(section):
+    return ''.join(html_chunks(section.title, section.headers(), section.rows()))
+
+
+def record_to_dict(record):
+    return dict(asdict(record), type=type(record).__name__)
+
+
+def to_dict(section):
+    return {
+        'title': section.title,
+        'records': [record_to_dict(record) for record in section.records],
+        'errors': [list(error) for error in section.errors],
+    }
+
+
+def to_json(section, **kwargs):
+    return json.dumps(to_dict(section), default=str, **kwargs)
@@ -0,0 +1,143 @@
+"""IPv4 and IPv6 routing snapshot read from /proc/net.
+
+One snapshot is parsed per report and shared by every section that needs
+routes or gateways, instead of forking ``route -n`` and asking netifaces for
+the gateway list once per interface.
+"""
+import ipaddress
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass
+
+from src import paths
+
+ROUTE_V4 = '/proc/net/route'
+ROUTE_V6 = '/proc/net/ipv6_route'
+
+RTF_UP = 0x0001
+RTF_GATEWAY = 0x0002
+RTF_REJECT = 0x0200
+RTF_LOCAL = 0x80000000
+
+SNAPSHOT_MAX_AGE = 1.0
+
+_lock = threading.Lock()
+_snapshot = None
+_snapshot_time = 0.0
+
+
+@dataclass
+class RouteEntry:
+    __slots__ = ('family', 'destination', 'prefix', 'gateway', 'interface', 'metric', 'flags')
+    family: int
+    destination: str
+    prefix: int
+    gateway: str  # None for directly connected routes
+    interface: str
+    metric: int
+    flags: int
+
+    @property
+    def is_default(self):
+        return self.prefix == 0
+
+
+@dataclass
+class RouteSnapshot:
+    __slots__ = ('routes', 'gateways')
+    routes: list
+    gateways: dict  # interface -> IPv4 default gateway
+
+    def default_gateway(self, family=socket.AF_INET):
+        """Gateway of the lowest-metric default route for ``family``, or None"""
+        defaults = [route for route in self.routes
+                    if route.family == family and route.is_default and route.gateway]
+        if not defaults:
+            return None
+        return min(defaults, key=lambda route: route.metric).gateway
+
+
+def _ipv4(hex_le):
+    return socket.inet_ntoa(struct.pack('<L', int(hex_le, 16)))
+
+
+def _ipv6(hex_be):
+    return str(ipaddress.IPv6Address(bytes.fromhex(hex_be)))
+
+
+def parse_ipv4_routes(lines):
+    routes = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 8 or fields[0] == 'Iface':
+            continue
+        flags = int(fields[3], 16)
+        if not flags & RTF_UP:
+            continue
+        mask = int(fields[7], 16)
+        routes.append(RouteEntry(
+            family=socket.AF_INET,
+            destination=_ipv4(fields[1]),
+            prefix=bin(mask).count('1'),
+            gateway=_ipv4(fields[2]) if flags & RTF_GATEWAY else None,
+            interface=fields[0],
+            metric=int(fields[6]),
+            flags=flags,
+        ))
+    return routes
+
+
+def parse_ipv6_routes(lines):
+    routes = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 10:
+            continue
+        flags = int(fields[8], 16)
+        # Skip the kernel's local table (own addresses, multicast) and reject routes
+        if not flags & RTF_UP or flags & (RTF_LOCAL | RTF_REJECT) or fields[0].startswith('ff'):
+            continue
+        routes.append(RouteEntry(
+            family=socket.AF_INET6,
+            destination=_ipv6(fields[0]),
+            prefix=int(fields[1], 16),
+            gateway=_ipv6(fields[4]) if flags & RTF_GATEWAY else None,
+            interface=fields[9],
+            metric=int(fields[5], 16),
+            flags=flags,
+        ))
+    return routes
+
+
+def read_snapshot():
+    """Parse the kernel routing tables, or return None if /proc/net/route is unavailable"""
+    try:
+        with open(paths.resolve(ROUTE_V4)) as f:
+            routes = parse_ipv4_routes(f)
+    except OSError:
+        return None
+    try:
+        with open(paths.resolve(ROUTE_V6)) as f:
+            routes.extend(parse_ipv6_routes(f))
+    except OSError:
+        # IPv6 disabled
+        pass
+    
+    gateways = {}
+    for route in sorted(routes, key=lambda route: route.metric, reverse=True):
+        if route.family == socket.AF_INET and route.is_default and route.gateway:
+            gateways[route.interface] = route.gateway
+    return RouteSnapshot(routes, gateways)
+
+
+def get_snapshot(max_age=SNAPSHOT_MAX_AGE):
+    """Return a routing snapshot no older than ``max_age`` seconds, shared between callers"""
+    global _snapshot, _snapshot_time
+    with _lock:
+        now = time.monotonic()
+        if _snapshot is None or now - _snapshot_time > max_age:
+            _snapshot = read_snapshot()
+            _snapshot_time = now
+        return _snapshot
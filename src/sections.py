@@ -0,0 +1,108 @@
+"""Registry of every report section and the collector that produces it.
+
+Collectors are referenced as ``module:function`` strings and only imported
+when a section is actually collected.
+"""
+import importlib
+from collections import namedtuple
+
+CATEGORIES = (
+    ('system', 'System Information'),
+    ('hardware', 'Hardware Information'),
+    ('network', 'Network Information'),
+)
+
+
+class SectionSpec(namedtuple('SectionSpec', 'key title category target message timeout')):
+    __slots__ = ()
+
+    def load(self):
+        """Import and return the collector function for this section"""
+        module, _, name = self.target.partition(':')
+        return getattr(importlib.import_module(module), name)
+
+
+SECTIONS = (
+    SectionSpec('basic', "Basic System Information", 'system',
+                'src.system_info:collect_basic_system_info',
+                "Fetching basic system information", None),
+    SectionSpec('detailed', "Detailed System Information", 'system',
+                'src.system_info:collect_detailed_system_info',
+                "Collecting detailed system information", None),
+    SectionSpec('processes', "Running Processes", 'system',
+                'src.system_info:collect_process_info',
+                "Analyzing running processes", None),
+    SectionSpec('packages', "Installed Packages", 'system',
+                'src.system_info:collect_installed_packages',
+                "Checking installed packages", 120),
+    SectionSpec('security', "Security Settings", 'system',
+                'src.system_info:collect_security_info',
+                "Verifying security settings", None),
+    SectionSpec('cpu', "CPU Information", 'hardware',
+                'src.hardware_info:collect_cpu_info',
+                "Fetching CPU information", None),
+    SectionSpec('memory', "Memory Information", 'hardware',
+                'src.hardware_info:collect_memory_info',
+                "Fetching memory information", None),
+    SectionSpec('gpu', "GPU Information", 'hardware',
+                'src.hardware_info:collect_gpu_info',
+                "Fetching GPU information", None),
+    SectionSpec('disks', "Disk Information", 'hardware',
+                'src.hardware_info:collect_disk_info',
+                "Analyzing disk drives", None),
+    SectionSpec('disk_io', "Disk I/O Activity", 'hardware',
+                'src.hardware_info:collect_disk_io',
+                "Measuring disk I/O", None),
+    SectionSpec('motherboard', "Motherboard Information", 'hardware',
+                'src.hardware_info:collect_motherboard_info',
+                "Fetching motherboard information", None),
+    SectionSpec('usb', "USB Devices", 'hardware',
+                'src.hardware_info:collect_usb_devices',
+                "Scanning USB devices", None),
+    SectionSpec('pci', "PCI Devices", 'hardware',
+                'src.hardware_info:collect_pci_devices',
+                "Scanning PCI devices", None),
+    SectionSpec('sound', "Sound Devices", 'hardware',
+                'src.hardware_info:collect_sound_devices',
+                "Detecting sound devices", None),
+    SectionSpec('interfaces', "Network Interfaces", 'network',
+                'src.network_info:collect_network_interfaces',
+                "Analyzing network interfaces", None),
+    SectionSpec('speed', "Network Speed (last test)", 'network',
+                'src.network_info:collect_network_speed',
+                "Reading the last speed test", None),
+    SectionSpec('public_ip', "Public IP Information", 'network',
+                'src.network_info:collect_public_ip',
+                "Fetching public IP information", None),
+    SectionSpec('wifi', "WiFi Information", 'network',
+                'src.network_info:collect_wifi_info',
+                "Scanning WiFi networks", None),
+    SectionSpec('net_stats', "Network Statistics", 'network',
+                'src.network_info:collect_network_statistics',
+                "Collecting network statistics", None),
+    SectionSpec('dns', "DNS Information", 'network',
+                'src.network_info:collect_dns_info',
+                "Fetching DNS information", None),
+    SectionSpec('routes', "Routing Table", 'network',
+                'src.network_info:collect_route_table',
+                "Reading routing table", None),
+    SectionSpec('connections', "Active Connections", 'network',
+                'src.network_info:collect_active_connections',
+                "Analyzing active connections", None),
+)
+
+# Sections that can only describe the running system: they use syscalls, external tools or the
+# network rather than files, so under another root (see paths) there is nothing to read
+LIVE_ONLY = frozenset(('packages', 'interfaces', 'speed', 'public_ip', 'wifi'))
+
+
+def get_sections(categories=None, keys=None):
+    """Return section specs in report order, optionally filtered by category or key"""
+    selected = []
+    for spec in SECTIONS:
+        if categories is not None and spec.category not in categories:
+            continue
+        if keys is not None and spec.key not in keys:
+            continue
+        selected.append(spec)
+    return selected
@@ -0,0 +1,281 @@
+"""Snapshot tarballs of the files a2a reads, for analysing a host somewhere else.
+
+``a2a capture`` copies the /proc, /sys and /etc files the report sections
+read into one tar archive in a single pass, with none of the collectors
+running: each file is read once into memory (procfs files report a size of
+zero, so they cannot be streamed by size) and written as an archive member.
+Symlinks the readers follow, such as /sys/class/block entries, are stored
+pointing inside the snapshot. Disk usage, which no file holds, is measured
+at capture time and kept in the archive's manifest.
+
+``a2a --root`` (or ``A2A_ROOT``) then points ``paths`` at a snapshot, which is
+unpacked into a temporary directory, or at a directory used in place, such
+as a mounted container root filesystem.
+"""
+import atexit
+import glob
+import io
+import json
+import os
+import shutil
+import socket
+import sys
+import tarfile
+import tempfile
+import time
+
+from src import paths
+
+MANIFEST = '/a2a-snapshot.json'
+FORMAT = 1
+
+# Compression name -> tarfile mode suffix
+COMPRESSIONS = {
+    'gzip': 'gz',
+    'xz': 'xz',
+    'none': '',
+}
+
+PROC_FILES = (
+    'cpuinfo', 'meminfo', 'stat', 'uptime', 'vmstat', 'diskstats', 'filesystems',
+    'self/mounts', 'self/stat', 'net/tcp', 'net/tcp6', 'net/route', 'net/ipv6_route', 'net/dev',
+    'asound/cards', 'asound/pcm',
+    'sys/kernel/hostname', 'sys/kernel/osrelease', 'sys/kernel/version', 'sys/kernel/ostype',
+    'sys/kernel/arch', 'sys/kernel/random/boot_id',
+)
+PROCESS_FILES = ('stat', 'status', 'cmdline', 'comm')
+ETC_FILES = ('os-release', 'lsb-release', 'selinux/config', 'resolv.conf', 'passwd', 'group')
+SYS_PATTERNS = (
+    'class/dmi/id/board_vendor', 'class/dmi/id/board_name', 'class/dmi/id/bios_version',
+    'class/dmi/id/bios_date',
+    'bus/pci/devices/*/vendor', 'bus/pci/devices/*/device', 'bus/pci/devices/*/class',
+    'bus/usb/devices/*/idVendor', 'bus/usb/devices/*/idProduct', 'bus/usb/devices/*/busnum',
+    'bus/usb/devices/*/devnum', 'bus/usb/devices/*/manufacturer', 'bus/usb/devices/*/product',
+)
+LASTLOG = '/var/log/lastlog'
+# lastlog is sparse and indexed by UID; with directory-service UIDs it can be gigabytes long
+LASTLOG_MAX_SIZE = 16 * 1024 * 1024
+
+
+class SnapshotError(Exception):
+    """A snapshot could not be written or opened; the message says why"""
+
+
+def _read(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 1 << 20)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+
+class _Writer:
+    """Adds members to the archive, each under its absolute path on the captured system"""
+
+    def __init__(self, archive, mtime):
+        self.archive = archive
+        self.mtime = mtime
+        self.files = 0
+        self.bytes = 0
+
+    def _info(self, path, type=tarfile.REGTYPE, mode=0o644):
+        info = tarfile.TarInfo(path.lstrip('/'))
+        info.type = type
+        info.mode = mode
+        info.mtime = self.mtime
+        return info
+
+    def data(self, path, data):
+        info = self._info(path)
+        info.size = len(data)
+        self.archive.addfile(info, io.BytesIO(data))
+        self.files += 1
+        self.bytes += len(data)
+
+    def file(self, path):
+        """Copy path if it can be read; files that vanish or are not readable are skipped"""
+        try:
+            data = _read(paths.resolve(path))
+        except OSError:
+            return
+        self.data(path, data)
+
+    def directory(self, path):
+        self.archive.addfile(self._info(path, tarfile.DIRTYPE, 0o755))
+
+    def symlink(self, path, target):
+        info = self._info(path, tarfile.SYMTYPE, 0o777)
+        info.linkname = target
+        self.archive.addfile(info)
+
+
+def _listdir(path):
+    try:
+        return sorted(os.listdir(paths.resolve(path)))
+    except OSError:
+        return []
+
+
+def _capture_processes(writer):
+    for name in _listdir('/proc'):
+        if not name.isdigit():
+            continue
+        for file in PROCESS_FILES:
+            writer.file(f'/proc/{name}/{file}')
+        # Only socket descriptors matter (for connection owners); other targets are host paths
+        fd_dir = f'/proc/{name}/fd'
+        for fd in _listdir(fd_dir):
+            try:
+                target = os.readlink(paths.resolve(f'{fd_dir}/{fd}'))
+            except OSError:
+                continue
+            if target.startswith('socket:['):
+                writer.symlink(f'{fd_dir}/{fd}', target)
+
+
+def _capture_block_devices(writer, mount_devices):
+    for name in _listdir('/sys/block'):
+        base = f'/sys/block/{name}'
+        writer.file(f'{base}/queue/rotational')
+        if os.path.exists(paths.resolve(f'{base}/device')):
+            writer.directory(f'{base}/device')
+        for slave in _listdir(f'{base}/slaves'):
+            writer.data(f'{base}/slaves/{slave}', b'')
+        # Partitions are subdirectories of their disk; /sys/class/block links point there
+        writer.symlink(f'/sys/class/block/{name}', f'../../block/{name}')
+        for entry in _listdir(base):
+            if os.path.exists(paths.resolve(f'{base}/{entry}/partition')):
+                writer.file(f'{base}/{entry}/partition')
+                writer.symlink(f'/sys/class/block/{entry}', f'../../block/{name}/{entry}')
+
+    # Mount devices such as /dev/mapper/vg-root are links to the kernel name (../dm-0)
+    for device in sorted(mount_devices):
+        try:
+            target = os.readlink(paths.resolve(device))
+        except OSError:
+            continue
+        if not os.path.isabs(target):
+            writer.symlink(device, target)
+
+
+def _disk_usage(selected):
+    from src import mounts
+
+    return {usage.mount.mountpoint: [usage.total, usage.used, usage.free, usage.status]
+            for usage in mounts.disk_usage(selected)}
+
+
+def capture(output, compression='gzip'):
+    """Write a snapshot of this system (or of the current root) to output, a path or '-' for stdout
+
+    Returns (files, bytes) copied.
+    """
+    from src import mounts
+
+    if compression not in COMPRESSIONS:
+        raise SnapshotError(f"unknown compression {compression!r}")
+    captured = time.time()
+    selected = mounts.list_mounts()
+    manifest = {
+        'format': FORMAT,
+        'captured': captured,
+        'hostname': paths.read('/proc/sys/kernel/hostname') or socket.gethostname(),
+        'disk_usage': _disk_usage(selected),
+    }
+
+    suffix = COMPRESSIONS[compression]
+    try:
+        if output == '-':
+            # Stream mode: nothing is seeked back, so the archive can go straight into a pipe
+            archive = tarfile.open(fileobj=sys.stdout.buffer, mode=f'w|{suffix}')
+        else:
+            archive = tarfile.open(output, mode=f'w:{suffix}' if suffix else 'w')
+    except OSError as e:
+        raise SnapshotError(f"cannot write {output}: {e.strerror or e}")
+
+    try:
+        with archive:
+            writer = _Writer(archive, int(captured))
+            for name in PROC_FILES:
+                writer.file(f'/proc/{name}')
+            _capture_processes(writer)
+            for name in ETC_FILES:
+                writer.file(f'/etc/{name}')
+            try:
+                if os.path.getsize(paths.resolve(LASTLOG)) <= LASTLOG_MAX_SIZE:
+                    writer.file(LASTLOG)
+            except OSError:
+                pass
+            for pattern in SYS_PATTERNS:
+                for path in sorted(glob.glob(paths.resolve(f'/sys/{pattern}'))):
+                    # glob returns paths under the root; store them as paths on the system
+                    writer.file('/' + os.path.relpath(path, paths.resolve('/')))
+            _capture_block_devices(writer, {mount.device for mount in selected
+                                            if mount.device.startswith('/dev/')})
+            writer.data(MANIFEST, json.dumps(manifest, indent=1).encode())
+    except BaseException:
+        if output != '-':
+            try:
+                os.unlink(output)
+            except OSError:
+                pass
+        raise
+    return writer.files, writer.bytes
+
+
+def _safe_members(archive):
+    """Members that stay inside the extraction directory, for Pythons without tarfile filters"""
+    for member in archive.getmembers():
+        name = os.path.normpath(member.name)
+        if os.path.isabs(name) or name.startswith('..'):
+            continue
+        if member.issym():
+            target = os.path.normpath(os.path.join(os.path.dirname(name), member.linkname))
+            if os.path.isabs(member.linkname) or target.startswith('..'):
+                continue
+        elif not (member.isreg() or member.isdir()):
+            continue
+        yield member
+
+
+def use(path):
+    """Read system files from the snapshot or directory at path from now on; returns the root used"""
+    if os.path.isdir(path):
+        paths.set_root(path)
+        return paths.root()
+    try:
+        archive = tarfile.open(path)
+    except (OSError, tarfile.TarError) as e:
+        raise SnapshotError(f"{path} is neither a directory nor a readable snapshot: {e}")
+    directory = tempfile.mkdtemp(prefix='a2a-root-')
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    with archive:
+        if hasattr(tarfile, 'data_filter'):
+            archive.extractall(directory, filter='data')
+        else:
+            archive.extractall(directory, members=_safe_members(archive))
+    paths.set_root(directory)
+    return directory
+
+
+def manifest():
+    """The manifest of the snapshot in use, or None for the running system or a plain directory"""
+    if paths.is_live():
+        return None
+    try:
+        with open(paths.resolve(MANIFEST), encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def disk_usage():
+    """{mount point: [total, used, free, status]} recorded when the current root was captured, or None"""
+    data = manifest()
+    return data.get('disk_usage') if data is not None else None
@@ -0,0 +1,70 @@
+"""Opt-in network speed test whose last result is kept on disk.
+
+A speed test saturates the link for 15-20 seconds, so reports never run
+one. It runs only when asked for (``a2a speedtest`` or the menu), and the
+result is stored in the a2a cache with the time it was measured; reports
+show that stored result and its age.
+
+The server is chosen by ``--server`` or ``A2A_SPEEDTEST_SERVER``: a numeric
+speedtest.net server ID, or the URL of a Speedtest Mini server for tests
+against an internal or local host. Without either, the lowest-latency
+public server is used.
+"""
+import os
+import time
+
+from src import cache
+
+CACHE_NAME = 'speedtest'
+CACHE_KEY = {'version': 1}
+TIMEOUT = 10
+
+
+class SpeedTestError(Exception):
+    """The speed test could not be run; the message says why"""
+
+
+def configured_server():
+    return os.environ.get('A2A_SPEEDTEST_SERVER') or None
+
+
+def last_result():
+    """Return the stored result as a dict (see run), or None if no test has been run"""
+    return cache.load(CACHE_NAME, CACHE_KEY)
+
+
+def run(server=None):
+    """Run a download and upload test, store the result and return it
+
+    The result is a dict with download and upload in Mbps, ping in
+    milliseconds, the server's description and the Unix time it was measured.
+    """
+    server = server or configured_server()
+    try:
+        import speedtest
+    except ImportError:
+        raise SpeedTestError("speedtest-cli is not installed")
+    try:
+        st = speedtest.Speedtest(timeout=TIMEOUT)
+        if server is None:
+            st.get_best_server()
+        elif server.isdigit():
+            st.get_servers([int(server)])
+            st.get_best_server()
+        else:
+            st.get_best_server(st.set_mini_server(server))
+        download = st.download() / 1_000_000
+        upload = st.upload() / 1_000_000
+    except Exception as e:
+        raise SpeedTestError(f"Unable to perform speed test: {e}")
+
+    best = st.results.server or {}
+    result = {
+        'download': download,
+        'upload': upload,
+        'ping': st.results.ping,
+        'server': ", ".join(str(best[field]) for field in ('sponsor', 'name') if best.get(field)) or server,
+        'measured': time.time(),
+    }
+    cache.store(CACHE_NAME, CACHE_KEY, result)
+    return result
@@ -0,0 +1,120 @@
+"""Enumerate PCI, USB and sound devices straight from sysfs and procfs.
+
+This avoids forking lspci, lsusb and aplay, and keeps working on minimal
+images that do not ship pciutils, usbutils or alsa-utils. Each function
+returns None when the kernel interface it needs is missing, so callers can
+fall back to the external tools.
+"""
+import os
+
+from src import paths
+
+PCI_DEVICES = '/sys/bus/pci/devices'
+USB_DEVICES = '/sys/bus/usb/devices'
+ASOUND_CARDS = '/proc/asound/cards'
+ASOUND_PCM = '/proc/asound/pcm'
+
+
+def _read(path, default=None):
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+
+def _hex_id(value, width=4):
+    """'0x8086' -> '8086'"""
+    if value is None:
+        return None
+    return value.lower().replace('0x', '').zfill(width)
+
+
+def pci_devices():
+    """List PCI functions as dicts of slot, vendor/device IDs and class code"""
+    try:
+        slots = sorted(os.listdir(paths.resolve(PCI_DEVICES)))
+    except OSError:
+        return None
+    
+    devices = []
+    for slot in slots:
+        base = os.path.join(paths.resolve(PCI_DEVICES), slot)
+        class_code = _hex_id(_read(os.path.join(base, 'class')), 6) or '000000'
+        devices.append({
+            'slot': slot,
+            'vendor_id': _hex_id(_read(os.path.join(base, 'vendor'))),
+            'device_id': _hex_id(_read(os.path.join(base, 'device'))),
+            'class_id': class_code[0:2],
+            'subclass_id': class_code[2:4],
+        })
+    return devices
+
+
+def usb_devices():
+    """List USB devices (not interfaces) with IDs and the string descriptors the kernel cached"""
+    try:
+        names = os.listdir(paths.resolve(USB_DEVICES))
+    except OSError:
+        return None
+    
+    devices = []
+    for name in names:
+        base = os.path.join(paths.resolve(USB_DEVICES), name)
+        vendor_id = _read(os.path.join(base, 'idVendor'))
+        if vendor_id is None:
+            # Interfaces (e.g. 1-1:1.0) have no descriptor of their own
+            continue
+        devices.append({
+            'bus': int(_read(os.path.join(base, 'busnum'), '0')),
+            'device': int(_read(os.path.join(base, 'devnum'), '0')),
+            'vendor_id': vendor_id.lower(),
+            'product_id': (_read(os.path.join(base, 'idProduct')) or '').lower(),
+            'manufacturer': _read(os.path.join(base, 'manufacturer')),
+            'product': _read(os.path.join(base, 'product')),
+        })
+    devices.sort(key=lambda device: (device['bus'], device['device']))
+    return devices
+
+
+def sound_devices():
+    """List playback PCM devices in ``aplay -l`` order as dicts of card and device details"""
+    cards = {}
+    try:
+        with open(paths.resolve(ASOUND_CARDS)) as f:
+            for line in f:
+                # " 0 [PCH            ]: HDA-Intel - HDA Intel PCH"
+                head, sep, rest = line.partition(']:')
+                if not sep or '[' not in head:
+                    continue
+                number, _, card_id = head.partition('[')
+                _, _, card_name = rest.partition(' - ')
+                cards[int(number)] = (card_id.strip(), card_name.strip())
+    except (OSError, ValueError):
+        return None
+    
+    devices = []
+    try:
+        with open(paths.resolve(ASOUND_PCM)) as f:
+            for line in f:
+                # "00-00: ALC892 Analog : ALC892 Analog : playback 1 : capture 1"
+                fields = [field.strip() for field in line.split(':')]
+                if len(fields) < 3 or not any(field.startswith('playback') for field in fields[3:]):
+                    continue
+                card, _, device = fields[0].partition('-')
+                card_id, card_name = cards.get(int(card), ('', ''))
+                devices.append({
+                    'card': int(card),
+                    'device': int(device),
+                    'card_id': card_id,
+                    'card_name': card_name,
+                    'name': fields[1],
+                })
+    except OSError:
+        # No PCM list (no devices or very old kernel): report the cards alone
+        for number, (card_id, card_name) in sorted(cards.items()):
+            devices.append({'card': number, 'device': None, 'card_id': card_id,
+                            'card_name': card_name, 'name': card_name})
+    except ValueError:
+        return None
+    return devices
@@ -1,31 +1,240 @@
 import os
 import platform
 import sys
+import getpass
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich import print as rprint
 import psutil
-from datetime import datetime
+from datetime import datetime, timedelta
 import subprocess
-from src import hardware_info
-from src import network_info
 from src import utils
 from rich.live import Live
 from rich.align import Align
 from rich import box
 import time
 from rich.text import Text
-from src import task_manager
-from src import user_manager
-from src import network_manager
-import re
+from src import export
+from src import paths
+from src import renderers
+from src import sections
+from src.collector import collect_sections
+from src.prefetch import Prefetcher
+from src.progress import SectionProgress
+from src.models import PROPERTY_COLUMNS, Section, Property, ProcessEntry, PackageManager
 
 console = Console()
 
+def collect_basic_system_info():
+    section = Section("Basic System Information", PROPERTY_COLUMNS, [], [])
+    records = section.records
+    
+    # Basic OS Information
+    if paths.is_live():
+        system = platform.system()
+        records.append(Property("OS", system))
+        records.append(Property("OS Version", platform.version()))
+        records.append(Property("OS Release", platform.release()))
+        records.append(Property("Machine", platform.machine()))
+        records.append(Property("Processor", platform.processor()))
+        records.append(Property("Hostname", platform.node()))
+    else:
+        # The same uname fields, as the snapshot's kernel reported them
+        system = paths.read('/proc/sys/kernel/ostype', "Linux")
+        records.append(Property("OS", system))
+        records.append(Property("OS Version", paths.read('/proc/sys/kernel/version', "Unknown")))
+        records.append(Property("OS Release", paths.read('/proc/sys/kernel/osrelease', "Unknown")))
+        records.append(Property("Machine", paths.read('/proc/sys/kernel/arch', "Unknown")))
+        records.append(Property("Hostname", paths.read('/proc/sys/kernel/hostname', "Unknown")))
+    
+    # Get Linux Distribution info if on Linux
+    if system == "Linux":
+        try:
+            # Try different distribution info files
+            if os.path.exists(paths.resolve("/etc/os-release")):
+                with open(paths.resolve("/etc/os-release")) as f:
+                    for line in f:
+                        if line.startswith("PRETTY_NAME="):
+                            distro = line.split("=")[1].strip().strip('"')
+                            records.append(Property("Distribution", distro))
+                            break
+            elif os.path.exists(paths.resolve("/etc/lsb-release")):
+                with open(paths.resolve("/etc/lsb-release")) as f:
+                    for line in f:
+                        if line.startswith("DISTRIB_DESCRIPTION="):
+                            distro = line.split("=")[1].strip().strip('"')
+                            records.append(Property("Distribution", distro))
+                            break
+        except:
+            records.append(Property("Distribution", "Unknown"))
+    
+    return section
+
+def collect_detailed_system_info():
+    section = Section("Detailed System Information", PROPERTY_COLUMNS, [], [])
+    records = section.records
+    
+    # System uptime
+    if paths.is_live():
+        uptime = datetime.now() - datetime.fromtimestamp(psutil.boot_time())
+    else:
+        # Uptime when the snapshot was taken, not boot time to now
+        uptime = timedelta(seconds=float((paths.read('/proc/uptime') or '0').split()[0]))
+    records.append(Property("System Uptime", str(uptime).split('.')[0]))
+    records.append(Property("Boot Time", datetime.fromtimestamp(psutil.boot_time()).strftime("%Y-%m-%d %H:%M:%S")))
+    
+    # Python and user details describe the process running a2a, not a snapshot
+    if paths.is_live():
+        # Python Version
+        records.append(Property("Python Version", sys.version.split()[0]))
+        
+        # User Information
+        try:
+            current_user = os.getlogin()
+        except OSError:
+            # No controlling terminal (cron, ssh -T, systemd)
+            current_user = getpass.getuser()
+        records.append(Property("Current User", current_user))
+        records.append(Property("Home Directory", os.path.expanduser("~")))
+    
+    # Process Information
+    records.append(Property("Total Processes", str(len(psutil.pids()))))
+    if paths.is_live():
+        records.append(Property("CPU Count", str(psutil.cpu_count())))
+    else:
+        from src.hardware_info import read_proc_cpuinfo
+        records.append(Property("CPU Count", str(read_proc_cpuinfo()['logical_cores'])))
+    
+    return section
+
+PROCESS_COLUMNS = (
+    ("PID", "cyan"),
+    ("Name", "green"),
+    ("CPU %", "yellow"),
+    ("Memory %", "red"),
+    ("Status", "blue"),
+    ("Created", "magenta"),
+)
+
+def collect_process_info():
+    section = Section("Top Processes (by CPU Usage)", PROCESS_COLUMNS, [], [])
+    
+    # A one-off report has no earlier sample, so CPU % is each process's lifetime average
+    from src.processes import create_sampler
+    for proc in create_sampler(prime=False).refresh(sort_by='cpu', limit=10):
+        if None in (proc['cpu_percent'], proc['memory_percent'], proc['create_time']):
+            continue
+        section.records.append(ProcessEntry(
+            pid=proc['pid'],
+            name=proc['name'],
+            cpu_percent=proc['cpu_percent'],
+            memory_percent=proc['memory_percent'],
+            status=proc['status'],
+            create_time=proc['create_time'],
+        ))
+    
+    return section
+
+PACKAGE_COLUMNS = (
+    ("Package Manager", "cyan"),
+    ("Status", "green"),
+    ("Updates Available", "yellow"),
+)
+
+def collect_installed_packages():
+    section = Section("Installed Package Managers and Updates", PACKAGE_COLUMNS, [], [])
+    
+    # Check for different package managers
+    package_managers = {
+        "apt": "apt list --upgradable 2>/dev/null | wc -l",
+        "dnf": "dnf check-update --quiet | wc -l",
+        "pacman": "pacman -Qu | wc -l",
+        "zypper": "zypper list-updates | wc -l",
+        "yum": "yum check-update --quiet | wc -l"
+    }
+    
+    for pm, cmd in package_managers.items():
+        try:
+            if platform.system() == "Linux":
+                # Check if package manager exists
+                if subprocess.call(["which", pm], stdout=subprocess.DEVNULL) == 0:
+                    updates = subprocess.check_output(cmd, shell=True).decode().strip()
+                    section.records.append(PackageManager(pm, "Installed", updates))
+                else:
+                    section.records.append(PackageManager(pm, "Not Installed", None))
+        except:
+            continue
+    
+    # Check for Windows Update (if on Windows)
+    if platform.system() == "Windows":
+        try:
+            import wmi
+            c = wmi.WMI()
+            updates = c.Win32_QuickFixEngineering()
+            section.records.append(PackageManager("Windows Update", "Installed", str(len(updates))))
+        except:
+            section.records.append(PackageManager("Windows Update", "Unable to check", None))
+    
+    return section
+
+def collect_security_info():
+    section = Section("Security Information", PROPERTY_COLUMNS, [], [])
+    records = section.records
+    
+    if platform.system() == "Linux":
+        try:
+            # Check SELinux status
+            if os.path.exists(paths.resolve("/etc/selinux/config")):
+                with open(paths.resolve("/etc/selinux/config")) as f:
+                    for line in f:
+                        if line.startswith("SELINUX="):
+                            records.append(Property("SELinux Status", line.split("=")[1].strip()))
+            
+            # Check firewall status (only the running system can be asked)
+            if not paths.is_live():
+                return section
+            firewall_cmds = [
+                ("ufw", "ufw status"),
+                ("firewalld", "firewall-cmd --state"),
+                ("iptables", "iptables -L")
+            ]
+            
+            for fw, cmd in firewall_cmds:
+                try:
+                    if subprocess.call(["which", fw], stdout=subprocess.DEVNULL) == 0:
+                        status = subprocess.check_output(cmd.split()).decode().strip()
+                        records.append(Property(f"{fw} Status", status))
+                except:
+                    continue
+        except:
+            section.errors.append(("Security Info", "Unable to fetch"))
+    
+    elif platform.system() == "Windows":
+        try:
+            import wmi
+            c = wmi.WMI()
+            
+            # Check Windows Defender status
+            defender = c.Win32_Service(Name="WinDefend")[0]
+            records.append(Property("Windows Defender", defender.State))
+            
+            # Check Windows Firewall status
+            firewall = c.Win32_Service(Name="MpsSvc")[0]
+            records.append(Property("Windows Firewall", firewall.State))
+        except:
+            section.errors.append(("Security Info", "Unable to fetch"))
+    
+    return section
+
 class SystemInfoViewer:
+    BANNER_FRAME_INTERVAL = 0.3
+    BANNER_MIN_SECONDS = 1.5
+    BANNER_SECONDS = 6.0
+    
     def __init__(self):
         self.console = Console()
+        self.prefetcher = None
         
     def display_menu(self):
         console.print(Panel.fit(
@@ -37,198 +246,29 @@ class SystemInfoViewer:
             "5. Task Manager\n"
             "6. User Manager\n"
             "7. Network Manager\n"
-            "8. Export Information\n"
-            "9. Exit",
+            "8. Network Speed Test\n"
+            "9. Export Information\n"
+            "10. Exit",
             title="Menu"
         ))
         
     def get_basic_system_info(self):
-        table = Table(title="Basic System Information")
-        table.add_column("Property", style="cyan")
-        table.add_column("Value", style="green")
-        
-        # Basic OS Information
-        table.add_row("OS", platform.system())
-        table.add_row("OS Version", platform.version())
-        table.add_row("OS Release", platform.release())
-        table.add_row("Machine", platform.machine())
-        table.add_row("Processor", platform.processor())
-        table.add_row("Hostname", platform.node())
-        
-        # Get Linux Distribution info if on Linux
-        if platform.system() == "Linux":
-            try:
-                # Try different distribution info files
-                if os.path.exists("/etc/os-release"):
-                    with open("/etc/os-release") as f:
-                        for line in f:
-                            if line.startswith("PRETTY_NAME="):
-                                distro = line.split("=")[1].strip().strip('"')
-                                table.add_row("Distribution", distro)
-                                break
-                elif os.path.exists("/etc/lsb-release"):
-                    with open("/etc/lsb-release") as f:
-                        for line in f:
-                            if line.startswith("DISTRIB_DESCRIPTION="):
-                                distro = line.split("=")[1].strip().strip('"')
-                                table.add_row("Distribution", distro)
-                                break
-            except:
-                table.add_row("Distribution", "Unknown")
-        
-        return table
+        return renderers.to_rich(collect_basic_system_info())
 
     def get_detailed_system_info(self):
-        table = Table(title="Detailed System Information")
-        table.add_column("Property", style="cyan")
-        table.add_column("Value", style="green")
-        
-        # System uptime
-        uptime = datetime.now() - datetime.fromtimestamp(psutil.boot_time())
-        table.add_row("System Uptime", str(uptime).split('.')[0])
-        table.add_row("Boot Time", datetime.fromtimestamp(psutil.boot_time()).strftime("%Y-%m-%d %H:%M:%S"))
-        
-        # Python Version
-        table.add_row("Python Version", sys.version.split()[0])
-        
-        # User Information
-        table.add_row("Current User", os.getlogin())
-        table.add_row("Home Directory", os.path.expanduser("~"))
-        
-        # Process Information
-        table.add_row("Total Processes", str(len(psutil.pids())))
-        table.add_row("CPU Count", str(psutil.cpu_count()))
-        
-        return table
+        return renderers.to_rich(collect_detailed_system_info())
 
     def get_process_info(self):
-        table = Table(title="Top Processes (by CPU Usage)")
-        table.add_column("PID", style="cyan")
-        table.add_column("Name", style="green")
-        table.add_column("CPU %", style="yellow")
-        table.add_column("Memory %", style="red")
-        table.add_column("Status", style="blue")
-        table.add_column("Created", style="magenta")
-        
-        processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status', 'create_time']):
-            try:
-                pinfo = proc.info
-                processes.append(pinfo)
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-        
-        # Sort by CPU usage and get top 10
-        processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
-        for proc in processes[:10]:
-            try:
-                create_time = datetime.fromtimestamp(proc['create_time']).strftime("%Y-%m-%d %H:%M:%S")
-                table.add_row(
-                    str(proc['pid']),
-                    proc['name'],
-                    f"{proc['cpu_percent']:.1f}",
-                    f"{proc['memory_percent']:.1f}",
-                    proc['status'],
-                    create_time
-                )
-            except:
-                continue
-        
-        return table
+        return renderers.to_rich(collect_process_info())
 
     def get_installed_packages(self):
-        table = Table(title="Installed Package Managers and Updates")
-        table.add_column("Package Manager", style="cyan")
-        table.add_column("Status", style="green")
-        table.add_column("Updates Available", style="yellow")
-        
-        # Check for different package managers
-        package_managers = {
-            "apt": "apt list --upgradable 2>/dev/null | wc -l",
-            "dnf": "dnf check-update --quiet | wc -l",
-            "pacman": "pacman -Qu | wc -l",
-            "zypper": "zypper list-updates | wc -l",
-            "yum": "yum check-update --quiet | wc -l"
-        }
-        
-        for pm, cmd in package_managers.items():
-            try:
-                if platform.system() == "Linux":
-                    # Check if package manager exists
-                    if subprocess.call(["which", pm], stdout=subprocess.DEVNULL) == 0:
-                        updates = subprocess.check_output(cmd, shell=True).decode().strip()
-                        table.add_row(pm, "Installed", updates)
-                    else:
-                        table.add_row(pm, "Not Installed", "N/A")
-            except:
-                continue
-        
-        # Check for Windows Update (if on Windows)
-        if platform.system() == "Windows":
-            try:
-                import wmi
-                c = wmi.WMI()
-                updates = c.Win32_QuickFixEngineering()
-                table.add_row("Windows Update", "Installed", str(len(updates)))
-            except:
-                table.add_row("Windows Update", "Unable to check", "N/A")
-        
-        return table
+        return renderers.to_rich(collect_installed_packages())
 
     def get_security_info(self):
-        table = Table(title="Security Information")
-        table.add_column("Property", style="cyan")
-        table.add_column("Value", style="green")
-        
-        if platform.system() == "Linux":
-            try:
-                # Check SELinux status
-                if os.path.exists("/etc/selinux/config"):
-                    with open("/etc/selinux/config") as f:
-                        for line in f:
-                            if line.startswith("SELINUX="):
-                                table.add_row("SELinux Status", line.split("=")[1].strip())
-                
-                # Check firewall status
-                firewall_cmds = [
-                    ("ufw", "ufw status"),
-                    ("firewalld", "firewall-cmd --state"),
-                    ("iptables", "iptables -L")
-                ]
-                
-                for fw, cmd in firewall_cmds:
-                    try:
-                        if subprocess.call(["which", fw], stdout=subprocess.DEVNULL) == 0:
-                            status = subprocess.check_output(cmd.split()).decode().strip()
-                            table.add_row(f"{fw} Status", status)
-                    except:
-                        continue
-            except:
-                table.add_row("Security Info", "Unable to fetch")
-        
-        elif platform.system() == "Windows":
-            try:
-                import wmi
-                c = wmi.WMI()
-                
-                # Check Windows Defender status
-                defender = c.Win32_Service(Name="WinDefend")[0]
-                table.add_row("Windows Defender", defender.State)
-                
-                # Check Windows Firewall status
-                firewall = c.Win32_Service(Name="MpsSvc")[0]
-                table.add_row("Windows Firewall", firewall.State)
-            except:
-                table.add_row("Security Info", "Unable to fetch")
-        
-        return table
+        return renderers.to_rich(collect_security_info())
 
-    def show_startup_banner(self):
-        console = Console()
-        
-        # Clear the screen
-        console.clear()
-        
+    def _banner_frames(self, count):
+        """Build every banner frame up front so playing them is only a screen update"""
         # Create the banner text with capital letters
         banner = """
               _     ___   _    
@@ -248,61 +288,127 @@ class SystemInfoViewer:
         """
         
         # Animation frames for loading
-        frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
+        spinner = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
         
         # Colors for animation
         colors = ["red", "yellow", "green", "blue", "magenta", "cyan","white",]
         company_colors = ["bright_red", "bright_yellow", "bright_magenta"]
         
-        with Live(refresh_per_second=7) as live:
-            for i in range(60):  # Show animation for 6 seconds
-                color = colors[i % len(colors)]
-                company_color = company_colors[i % len(company_colors)]
-                frame = frames[i % len(frames)]
-                
-                # Create styled text with gradient effect for company name
-                styled_banner = Text(banner, style=f"bold {color}")
-                styled_company = Text()
-                
-                # Add gradient effect to company name
-                lines = company.split('\n')
-                for line in lines:
-                    styled_company.append(line + '\n', style=f"bold {company_color}")
-                
-                # Create loading text
-                loading_text = Text(f"\n{frame} LOADING SYSTEM INFORMATION...", style=f"bold {color}")
-                
-                # Combine all elements
-                all_text = Text.assemble(
-                    styled_banner, "\n",
-                    styled_company, "\n",
-                    loading_text
-                )
-                
-                # Center everything with a glowing effect
-                panel = Panel(
-                    Align.center(all_text),
-                    box=box.DOUBLE,
-                    border_style=color,
-                    padding=(1, 2),
-                    title=" _A2A ",
-                    title_align="center",
-                    subtitle="[ PearlK Tech ]",
-                    subtitle_align="center"
-                )
-                
-                live.update(panel)
-                time.sleep(0.3)
+        frames = []
+        for i in range(count):
+            color = colors[i % len(colors)]
+            company_color = company_colors[i % len(company_colors)]
+            
+            # Create styled text with gradient effect for company name
+            styled_banner = Text(banner, style=f"bold {color}")
+            styled_company = Text()
+            
+            # Add gradient effect to company name
+            for line in company.split('\n'):
+                styled_company.append(line + '\n', style=f"bold {company_color}")
+            
+            # Create loading text
+            loading_text = Text(f"\n{spinner[i % len(spinner)]} LOADING SYSTEM INFORMATION...", style=f"bold {color}")
+            skip_text = Text("\nPress any key to skip", style="dim")
+            
+            # Combine all elements
+            all_text = Text.assemble(
+                styled_banner, "\n",
+                styled_company, "\n",
+                loading_text, skip_text
+            )
+            
+            # Center everything with a glowing effect
+            frames.append(Panel(
+                Align.center(all_text),
+                box=box.DOUBLE,
+                border_style=color,
+                padding=(1, 2),
+                title=" _A2A ",
+                title_align="center",
+                subtitle="[ PearlK Tech ]",
+                subtitle_align="center"
+            ))
+        return frames
+
+    def show_startup_banner(self, until=None):
+        """Play the banner until a key is pressed, ``until`` is set, or BANNER_SECONDS pass"""
+        try:
+            import termios
+            import tty
+            import select
+        except ImportError:
+            termios = None
+        
+        frames = self._banner_frames(int(self.BANNER_SECONDS / self.BANNER_FRAME_INTERVAL))
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd) if termios else None
+        started = time.monotonic()
+        
+        # Clear the screen
+        console.clear()
+        try:
+            if termios:
+                tty.setcbreak(fd)
+            with Live(console=console, auto_refresh=False) as live:
+                for frame in frames:
+                    live.update(frame, refresh=True)
+                    
+                    # Stop early once the data is ready, but not before the banner has been seen
+                    if until is not None and until.is_set() and time.monotonic() - started >= self.BANNER_MIN_SECONDS:
+                        break
+                    if termios:
+                        ready, _, _ = select.select([fd], [], [], self.BANNER_FRAME_INTERVAL)
+                        if ready:
+                            # Swallow the key so it does not end up in the menu prompt
+                            os.read(fd, 64)
+                            break
+                    else:
+                        time.sleep(self.BANNER_FRAME_INTERVAL)
+        finally:
+            if termios:
+                termios.tcsetattr(fd, termios.TCSADRAIN, saved)
         
         # Clear screen after animation
         console.clear()
 
-    def run(self):
-        self.show_startup_banner()
+    def banner_enabled(self):
+        # Scripts, pipes and CI logs get no animation
+        return sys.stdin.isatty() and sys.stdout.isatty() and not os.environ.get('A2A_NO_BANNER')
+
+    def collect(self, specs, progress=None):
+        """Yield a SectionResult per spec in order, taking prefetched results where there are any
+
+        With a SectionProgress, every section's start and finish is reported to it.
+        """
+        on_start = progress.started if progress else None
+        on_done = progress.finished if progress else None
+        prefetched = self.prefetcher.pending(spec.key for spec in specs) if self.prefetcher else set()
+        # Starts running now, alongside the prefetched sections still being collected
+        fresh = collect_sections([spec for spec in specs if spec.key not in prefetched],
+                                 on_start=on_start, on_done=on_done)
+        for spec in specs:
+            if spec.key not in prefetched:
+                yield next(fresh)
+                continue
+            result = self.prefetcher.take(spec.key)
+            if result is None:
+                # Prefetched too long ago; collect it again
+                result = next(collect_sections([spec], on_start=on_start, on_done=on_done))
+            elif progress:
+                progress.started(spec)
+                progress.finished(result, prefetched=True)
+            yield result
+
+    def run(self, banner=True):
+        # Collect the default sections while the banner plays and the menu waits
+        self.prefetcher = Prefetcher(sections.get_sections()).start()
+        if banner and self.banner_enabled():
+            self.show_startup_banner(until=self.prefetcher.finished)
         
         while True:
             self.display_menu()
-            choice = input("Enter your choice (1-9): ")
+            choice = input("Enter your choice (1-10): ")
             
             if choice == "1":
                 self.show_all_info()
@@ -312,9 +418,14 @@ class SystemInfoViewer:
                 self.show_network_info()
             elif choice == "4":
                 self.show_system_info()
+            elif choice in ("5", "6", "7", "8") and not paths.is_live():
+                # These act on the machine running a2a, not on the snapshot being viewed
+                console.print("[yellow]Not available while viewing a snapshot (--root)[/yellow]")
             elif choice == "5":
+                from src import task_manager
                 task_manager.run_task_manager()
             elif choice == "6":
+                from src import user_manager
                 if os.geteuid() == 0:
                     user_manager.run_user_manager()
                 else:
@@ -324,6 +435,7 @@ class SystemInfoViewer:
                     else:
                         console.print("[red]User management requires root privileges![/red]")
             elif choice == "7":
+                from src import network_manager
                 if os.geteuid() == 0:
                     network_manager.run_network_manager()
                 else:
@@ -333,8 +445,10 @@ class SystemInfoViewer:
                     else:
                         console.print("[red]Network management requires root privileges![/red]")
             elif choice == "8":
-                self.export_info()
+                self.run_speed_test()
             elif choice == "9":
+                self.export_info()
+            elif choice == "10":
                 console.print("[yellow]Thank you for using _a2a![/yellow]")
                 break
             else:
@@ -343,170 +457,66 @@ class SystemInfoViewer:
             input("\nPress Enter to continue...")
 
     def show_all_info(self):
-        console.print("\n[bold blue]System Information[/bold blue]")
-        console.print(self.get_basic_system_info())
-        console.print(self.get_detailed_system_info())
-        console.print(self.get_process_info())
-        console.print(self.get_installed_packages())
-        console.print(self.get_security_info())
-        
-        console.print("\n[bold blue]Hardware Information[/bold blue]")
-        self.show_hardware_info()
-        
-        console.print("\n[bold blue]Network Information[/bold blue]")
-        self.show_network_info()
+        current_category = None
+        specs = sections.get_sections()
+        with SectionProgress(console, specs) as progress:
+            for result in self.collect(specs, progress):
+                if result.spec.category != current_category:
+                    current_category = result.spec.category
+                    console.print(f"\n[bold blue]{dict(sections.CATEGORIES)[current_category]}[/bold blue]")
+                self.print_section_result(result)
+
+    def print_section_result(self, result):
+        if result.status == 'ok':
+            console.print(renderers.to_rich(result.value))
+        elif result.status == 'timeout':
+            console.print(f"[yellow]{result.spec.title}: {result.error}[/yellow]")
+        else:
+            console.print(f"[red]{result.spec.title}: {result.error}[/red]")
 
-    def show_loading_message(self, message):
-        with console.status(f"[bold blue]{message}...", spinner="dots"):
-            time.sleep(0.5)  # Give user time to see the message
+    def show_category(self, category):
+        specs = sections.get_sections(categories=[category])
+        with SectionProgress(console, specs) as progress:
+            for result in self.collect(specs, progress):
+                self.print_section_result(result)
 
     def show_hardware_info(self):
-        self.show_loading_message("Fetching CPU information")
-        console.print(hardware_info.get_cpu_info())
-        
-        self.show_loading_message("Fetching memory information")
-        console.print(hardware_info.get_memory_info())
-        
-        self.show_loading_message("Fetching GPU information")
-        console.print(hardware_info.get_gpu_info())
-        
-        self.show_loading_message("Analyzing disk drives")
-        console.print(hardware_info.get_disk_info())
-        
-        self.show_loading_message("Fetching motherboard information")
-        console.print(hardware_info.get_motherboard_info())
-        
-        self.show_loading_message("Scanning USB devices")
-        console.print(hardware_info.get_usb_devices())
-        
-        self.show_loading_message("Scanning PCI devices")
-        console.print(hardware_info.get_pci_devices())
-        
-        self.show_loading_message("Detecting sound devices")
-        console.print(hardware_info.get_sound_devices())
+        self.show_category('hardware')
 
     def show_network_info(self):
-        self.show_loading_message("Analyzing network interfaces")
-        console.print(network_info.get_network_interfaces())
-        
-        self.show_loading_message("Testing network speed")
-        console.print(network_info.get_network_speed())
-        
-        self.show_loading_message("Fetching public IP information")
-        console.print(network_info.get_public_ip())
-        
-        self.show_loading_message("Scanning WiFi networks")
-        console.print(network_info.get_wifi_info())
-        
-        self.show_loading_message("Collecting network statistics")
-        console.print(network_info.get_network_statistics())
-        
-        self.show_loading_message("Fetching DNS information")
-        console.print(network_info.get_dns_info())
-        
-        self.show_loading_message("Reading routing table")
-        console.print(network_info.get_route_table())
-        
-        self.show_loading_message("Analyzing active connections")
-        console.print(network_info.get_active_connections())
+        self.show_category('network')
 
-    def show_system_info(self):
-        self.show_loading_message("Fetching basic system information")
-        console.print(self.get_basic_system_info())
-        
-        self.show_loading_message("Collecting detailed system information")
-        console.print(self.get_detailed_system_info())
-        
-        self.show_loading_message("Analyzing running processes")
-        console.print(self.get_process_info())
+    def run_speed_test(self):
+        from src import network_info
         
-        self.show_loading_message("Checking installed packages")
-        console.print(self.get_installed_packages())
-        
-        self.show_loading_message("Verifying security settings")
-        console.print(self.get_security_info())
+        console.print("[yellow]A speed test saturates the network link for 15-20 seconds.[/yellow]")
+        if input("Run it now? (y/N): ").strip().lower() != 'y':
+            return
+        console.print(network_info.get_network_speed_test())
 
-    def _format_info_to_html_table(self, title, info):
-        """Convert any information into a proper HTML table"""
-        html = f'<h3 class="subsection-header">{title}</h3>\n'
-        html += '<div class="table-responsive">\n<table class="info-table">\n'
-        
-        # If it's a Rich Table object
-        if hasattr(info, 'row_count'):
-            # Create a temporary console to capture the table output
-            temp_console = Console(record=True, force_terminal=False)
-            with temp_console.capture() as capture:
-                temp_console.print(info)
-            table_str = capture.get()
-            return self._convert_text_table_to_html(table_str)
-        
-        # If it's a string with key-value pairs
-        elif isinstance(info, str) and ':' in info:
-            html += '<thead>\n<tr>\n<th>Property</th>\n<th>Value</th>\n</tr>\n</thead>\n<tbody>\n'
-            for line in info.split('\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    html += f'<tr>\n<td>{key.strip()}</td>\n<td>{value.strip()}</td>\n</tr>\n'
-            html += '</tbody>\n'
-        
-        # If it's a dictionary
-        elif isinstance(info, dict):
-            html += '<thead>\n<tr>\n<th>Property</th>\n<th>Value</th>\n</tr>\n</thead>\n<tbody>\n'
-            for key, value in info.items():
-                html += f'<tr>\n<td>{key}</td>\n<td>{value}</td>\n</tr>\n'
-            html += '</tbody>\n'
-        
-        # If it's a list
-        elif isinstance(info, list):
-            html += '<thead>\n<tr>\n<th>Item</th>\n</tr>\n</thead>\n<tbody>\n'
-            for item in info:
-                html += f'<tr>\n<td>{item}</td>\n</tr>\n'
-            html += '</tbody>\n'
-        
-        # For any other type
-        else:
-            html += '<tbody>\n<tr>\n<td>' + str(info).replace('\n', '<br>') + '</td>\n</tr>\n</tbody>\n'
-        
-        html += '</table>\n</div>\n'
-        return html
+    def show_system_info(self):
+        self.show_category('system')
 
     def export_info(self):
         try:
             # Ask for export format
-            format_choice = input("Export format (txt/html): ").lower()
-            if format_choice not in ['txt', 'html']:
+            format_choice = input("Export format (txt/html/json): ").lower()
+            if format_choice not in export.WRITERS:
                 console.print("[red]Invalid format. Using txt as default.[/red]")
                 format_choice = 'txt'
             
+            compression = input("Compression (none/gzip/zstd, default: none): ").lower() or 'none'
+            if compression not in export.COMPRESSIONS:
+                console.print("[red]Invalid compression. Writing an uncompressed file.[/red]")
+                compression = 'none'
+            elif compression == 'zstd' and not export.zstd_available():
+                console.print("[yellow]zstandard is not installed. Using gzip instead.[/yellow]")
+                compression = 'gzip'
+            
             # Collect all available categories
             categories = {
-                '1': ('System Information', [
-                    ("Basic System Information", self.get_basic_system_info),
-                    ("Detailed System Information", self.get_detailed_system_info),
-                    ("Running Processes", self.get_process_info),
-                    ("Installed Packages", self.get_installed_packages),
-                    ("Security Settings", self.get_security_info)
-                ]),
-                '2': ('Hardware Information', [
-                    ("CPU Information", hardware_info.get_cpu_info),
-                    ("Memory Information", hardware_info.get_memory_info),
-                    ("GPU Information", hardware_info.get_gpu_info),
-                    ("Disk Information", hardware_info.get_disk_info),
-                    ("Motherboard Information", hardware_info.get_motherboard_info),
-                    ("USB Devices", hardware_info.get_usb_devices),
-                    ("PCI Devices", hardware_info.get_pci_devices),
-                    ("Sound Devices", hardware_info.get_sound_devices)
-                ]),
-                '3': ('Network Information', [
-                    ("Network Interfaces", network_info.get_network_interfaces),
-                    ("Network Speed", network_info.get_network_speed),
-                    ("Public IP Information", network_info.get_public_ip),
-                    ("WiFi Information", network_info.get_wifi_info),
-                    ("Network Statistics", network_info.get_network_statistics),
-                    ("DNS Information", network_info.get_dns_info),
-                    ("Routing Table", network_info.get_route_table),
-                    ("Active Connections", network_info.get_active_connections)
-                ])
+                str(i): (name, sections.get_sections(categories=[key]))
+                for i, (key, name) in enumerate(sections.CATEGORIES, 1)
             }
             
             # Ask user which categories to export
@@ -532,164 +542,60 @@ class SystemInfoViewer:
                 console.print("[red]No valid categories selected. Exporting all categories.[/red]")
                 selected_categories = list(categories.values())
             
-            # Get metadata
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            username = os.getlogin()
-            hostname = platform.node()
+            filepath = utils.prompt_export_path(format_choice, export.COMPRESSIONS[compression])
             
-            if format_choice == 'txt':
-                # Text format
-                content = "System Information Report\n"
-                content += f"Generated on: {timestamp}\n"
-                content += f"Generated by: {username}\n"
-                content += f"Hostname: {hostname}\n"
-                content += "="*50 + "\n\n"
-                
-                # Add selected categories
-                for category_name, items in selected_categories:
-                    content += f"\n{category_name}\n"
-                    content += "="*len(category_name) + "\n\n"
-                    
-                    for title, func in items:
-                        self.show_loading_message(f"Formatting {title}")
-                        info = func()
-                        if info:
-                            content += f"{title}\n"
-                            content += "-"*len(title) + "\n"
-                            content += str(info) + "\n\n"
-                
-                content += "\nGenerated by _a2a (Linux System Info Tool) | © PearlK Tech"
-                
-            else:
-                # HTML format
-                # ... (previous HTML header code) ...
-                
-                # Add selected categories
-                content = ""
+            # Collect the selected sections concurrently; results arrive in report order
+            selected_specs = [spec for _, specs in selected_categories for spec in specs]
+            
+            try:
+                user = os.getlogin()
+            except OSError:
+                # No controlling terminal (cron, ssh -T, systemd)
+                user = getpass.getuser()
+            
+            metadata = {
+                'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'user': user,
+                'hostname': platform.node(),
+            }
+            if not paths.is_live():
+                # The report describes the snapshot's host; user and machine are the ones reading it
+                from src import snapshot
+                manifest = snapshot.manifest() or {}
+                metadata['hostname'] = (manifest.get('hostname') or paths.read('/proc/sys/kernel/hostname')
+                                        or paths.read('/etc/hostname') or "Unknown")
+                metadata['read_on'] = platform.node()
+                if manifest.get('captured'):
+                    metadata['captured'] = datetime.fromtimestamp(manifest['captured']).strftime('%Y-%m-%d %H:%M:%S')
+            
+            # Each section goes to the file as soon as it is collected, straight from its records
+            with export.open_report(filepath, compression) as out, \
+                    SectionProgress(console, selected_specs) as progress:
+                results = self.collect(selected_specs, progress)
+                writer = export.WRITERS[format_choice](out)
+                writer.begin(metadata)
                 for category_name, items in selected_categories:
-                    section_id = category_name.lower().replace(' ', '-')
-                    content += f'<div class="section" id="{section_id}">\n'
-                    content += f'<h2 class="section-header">{category_name}</h2>\n'
-                    content += '<div class="section-content">\n'
-                    
-                    for title, func in items:
-                        self.show_loading_message(f"Formatting {title}")
-                        info = func()
-                        if info:
-                            content += self._format_info_to_html_table(title, info)
-                    
-                    content += '</div>\n</div>\n'
+                    writer.begin_category(category_name)
+                    for spec in items:
+                        result = next(results)
+                        if result.status == 'ok':
+                            writer.write_section(spec.key, spec.title, result.value)
+                        else:
+                            writer.write_section(spec.key, spec.title, None, error=result.error)
+                    writer.end_category()
+                writer.end()
             
-            # Export the data
-            utils.export_to_file(content, format_choice)
+            console.print(f"[green]Information exported to {filepath}[/green]")
+            utils.offer_to_open(filepath)
             
         except Exception as e:
             console.print(f"[red]Error during export: {str(e)}[/red]")
             import traceback
             console.print(traceback.format_exc())
 
-    def _convert_text_table_to_html(self, text_table):
-        """Convert text-based table to HTML table with proper formatting"""
-        if not text_table:
-            return ""
-        
-        def clean_cell(cell):
-            """Clean cell content and handle special characters"""
-            cell = cell.strip()
-            cell = cell.replace('│', '').replace('┃', '')
-            cell = cell.replace('└', '').replace('┘', '')
-            cell = cell.replace('┌', '').replace('┐', '')
-            cell = cell.replace('├', '').replace('┤', '')
-            cell = cell.replace('┬', '').replace('┴', '')
-            cell = cell.replace('─', '').replace('━', '')
-            return cell.strip()
-        
-        def split_header(header_text):
-            """Split header text into columns based on multiple spaces"""
-            # Split by 2 or more spaces
-            headers = [h.strip() for h in re.split(r'\s{2,}', header_text) if h.strip()]
-            return headers
-        
-        # If it's a table format (contains box-drawing characters)
-        if '│' in text_table or '┃' in text_table or '\t' in text_table:
-            lines = [line for line in text_table.split('\n') if line.strip()]
-            
-            # Get table title from the first line if it exists
-            title = lines[0] if lines else ""
-            if title and not ('│' in title or '┃' in title or '\t' in title):
-                lines = lines[1:]  # Remove title from lines as we'll handle it separately
-            else:
-                title = None
-            
-            html = '<div class="table-responsive">\n'
-            html += '<table class="info-table">\n'
-            
-            # Add title row if exists
-            if title:
-                html += '<thead>\n'
-                html += f'<tr>\n<th colspan="100%" class="table-title">{title.strip()}</th>\n</tr>\n'
-            
-            # Handle header and data
-            if lines:
-                # Find the header line
-                header_line = None
-                data_lines = []
-                for line in lines:
-                    if '━' in line or '─' in line:
-                        continue
-                    if header_line is None:
-                        header_line = line
-                    else:
-                        data_lines.append(line)
-                
-                # Extract and add headers
-                if header_line:
-                    # Split header into columns
-                    if '│' in header_line:
-                        headers = [clean_cell(h) for h in header_line.split('│') if clean_cell(h)]
-                        # For each header, split by multiple spaces if it contains them
-                        final_headers = []
-                        for header in headers:
-                            if re.search(r'\s{2,}', header):
-                                final_headers.extend(split_header(header))
-                            else:
-                                final_headers.append(header)
-                        headers = final_headers
-                    else:
-                        headers = split_header(clean_cell(header_line))
-                    
-                    if not title:
-                        html += '<thead>\n'
-                    html += '<tr>\n'
-                    for header in headers:
-                        html += f'<th>{header}</th>\n'
-                    html += '</tr>\n</thead>\n'
-                
-                # Add data rows
-                html += '<tbody>\n'
-                for line in data_lines:
-                    if not any(c in line for c in '│┃'):
-                        continue
-                    cells = [clean_cell(c) for c in line.split('│') if clean_cell(c)]
-                    if cells:
-                        html += '<tr>\n'
-                        # Split each cell if it contains multiple spaces
-                        for cell in cells:
-                            if re.search(r'\s{2,}', cell):
-                                subcells = split_header(cell)
-                                for subcell in subcells:
-                                    html += f'<td>{subcell}</td>\n'
-                            else:
-                                html += f'<td>{cell}</td>\n'
-                        html += '</tr>\n'
-                html += '</tbody>\n'
-            
-            html += '</table>\n</div>\n'
-            return html
-
-def main():
+def main(banner=True):
     viewer = SystemInfoViewer()
-    viewer.run()
+    viewer.run(banner=banner)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,10 +4,14 @@ from rich.console import Console
 from datetime import datetime
 import os
 import signal
+import sys
 from rich import box
+from rich.console import Group
 from rich.panel import Panel
-from rich.layout import Layout
+from rich.text import Text
 import time
+from src import history
+from src.processes import create_sampler
 
 console = Console()
 
@@ -15,8 +19,10 @@ class TaskManager:
     def __init__(self):
         self.console = Console()
         self.refresh_rate = 2  # seconds
+        self.sampler = create_sampler()
+        self.snapshot = None
         
-    def get_process_list(self, sort_by='cpu', show_all=False):
+    def get_process_list(self, sort_by='cpu', show_all=False, refresh=True):
         table = Table(
             title="Task Manager",
             box=box.DOUBLE,
@@ -32,27 +38,16 @@ class TaskManager:
         table.add_column("Threads", style="green", no_wrap=True)
         table.add_column("User", style="cyan", no_wrap=True)
         
-        processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 
-                                       'status', 'username', 'nice', 'num_threads']):
-            try:
-                pinfo = proc.info
-                processes.append(pinfo)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+        # Re-sorting or toggling Show All reuses the current snapshot
+        if refresh or self.snapshot is None:
+            self.snapshot = self.sampler.snapshot()
         
-        # Sort processes based on criteria
-        if sort_by == 'cpu':
-            processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
-        elif sort_by == 'memory':
-            processes.sort(key=lambda x: x['memory_percent'], reverse=True)
-        elif sort_by == 'pid':
-            processes.sort(key=lambda x: x['pid'])
-        elif sort_by == 'name':
-            processes.sort(key=lambda x: x['name'].lower())
+        if self.snapshot.cpu_averaged:
+            table.columns[2].header = "Avg CPU %"
         
         # Show all processes or just top 20
-        display_processes = processes if show_all else processes[:20]
+        display_processes = self.snapshot.select(sort_by, None if show_all else 20)
+        self.sampler.complete_rows(display_processes)
         
         for proc in display_processes:
             try:
@@ -64,7 +59,7 @@ class TaskManager:
                     proc['status'],
                     str(proc['nice']),
                     str(proc['num_threads']),
-                    proc.get('username', 'N/A')
+                    proc.get('username') or 'N/A'
                 )
             except:
                 continue
@@ -74,7 +69,7 @@ class TaskManager:
         return table
 
     def add_system_summary(self):
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = self.sampler.system_cpu_percent()
         memory = psutil.virtual_memory()
         swap = psutil.swap_memory()
         
@@ -85,10 +80,13 @@ class TaskManager:
         summary.add_row("CPU Usage", f"{cpu_percent}%")
         summary.add_row("Memory Usage", f"{memory.percent}%")
         summary.add_row("Swap Usage", f"{swap.percent}%")
+        for trend in history.trends([('cpu_percent', "CPU", '%'), ('memory_percent', "Memory", '%')]):
+            summary.add_row(*trend.rows()[0])
         
         console.print(Panel(summary, title="System Summary", border_style="green"))
 
-    def kill_process(self, pid, force=False):
+    def terminate_process(self, pid, force=False):
+        """Terminate or kill a process, returning (success, message)"""
         try:
             process = psutil.Process(pid)
             process_name = process.name()
@@ -100,22 +98,30 @@ class TaskManager:
                 process.terminate()  # Graceful termination
                 msg = "terminated"
             
-            console.print(f"[green]Successfully {msg} process {process_name} (PID: {pid})[/green]")
+            return True, f"Successfully {msg} process {process_name} (PID: {pid})"
         except psutil.NoSuchProcess:
-            console.print(f"[red]Process with PID {pid} not found[/red]")
+            return False, f"Process with PID {pid} not found"
         except psutil.AccessDenied:
-            console.print(f"[red]Access denied to terminate process with PID {pid}[/red]")
-            console.print("[yellow]Try running with administrative privileges[/yellow]")
+            return False, f"Access denied to terminate process with PID {pid}. Try running with administrative privileges"
         except Exception as e:
-            console.print(f"[red]Error terminating process: {str(e)}[/red]")
+            return False, f"Error terminating process: {str(e)}"
 
-    def change_priority(self, pid, priority):
+    def kill_process(self, pid, force=False):
+        success, message = self.terminate_process(pid, force)
+        console.print(f"[green]{message}[/green]" if success else f"[red]{message}[/red]")
+
+    def set_priority(self, pid, priority):
+        """Change a process's nice value, returning (success, message)"""
         try:
             process = psutil.Process(pid)
             process.nice(priority)
-            console.print(f"[green]Successfully changed priority of PID {pid} to {priority}[/green]")
+            return True, f"Successfully changed priority of PID {pid} to {priority}"
         except Exception as e:
-            console.print(f"[red]Error changing priority: {str(e)}[/red]")
+            return False, f"Error changing priority: {str(e)}"
+
+    def change_priority(self, pid, priority):
+        success, message = self.set_priority(pid, priority)
+        console.print(f"[green]{message}[/green]" if success else f"[red]{message}[/red]")
 
     def show_process_details(self, pid):
         try:
@@ -169,15 +175,235 @@ class TaskManager:
         except Exception as e:
             console.print(f"[red]Error getting process details: {str(e)}[/red]")
 
+class TaskManagerView:
+    """Full-screen task manager drawn with rich.live and driven by single key presses
+
+    Rows are formatted once per process and reused until its values change,
+    only as many rows as fit the terminal are built, and the screen is redrawn
+    only when what it shows has changed.
+    """
+    SORT_KEYS = {'c': 'cpu', 'm': 'memory', 'p': 'pid', 'n': 'name'}
+    HELP = "[c/m/p/n] sort  [/] filter  [k] kill  [K] force kill  [r] renice  [q] quit"
+    CHROME_LINES = 9  # title, borders, header, summary and footer lines around the rows
+
+    def __init__(self, task_manager):
+        self.task_manager = task_manager
+        self.sort_by = 'cpu'
+        self.filter_text = ''
+        self.prompt = None  # (label, action) while a line of input is being typed
+        self.buffer = ''
+        self.pending_pid = None
+        self.message = ''
+        self.running = True
+        self.snapshot = None
+        self.summary = ''
+        self._rows = {}  # pid -> (values, formatted cells)
+        self._frame_state = None
+
+    def sample(self):
+        self.snapshot = self.task_manager.sampler.snapshot()
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        self.summary = (f"CPU {self.task_manager.sampler.system_cpu_percent():.1f}%  "
+                        f"Memory {memory.percent}%  Swap {swap.percent}%  "
+                        f"Tasks {self.snapshot.total}")
+
+    def visible_processes(self, limit):
+        sampler = self.task_manager.sampler
+        snapshot = self.snapshot
+        if self.filter_text:
+            needle = self.filter_text.lower()
+            sampler.complete_rows(snapshot.processes)
+            snapshot = snapshot.filter(lambda proc: needle in (proc['name'] or '').lower()
+                                       or needle in (proc['username'] or '').lower()
+                                       or needle == str(proc['pid']))
+        visible = snapshot.top(self.sort_by, limit)
+        sampler.complete_rows(visible)
+        return visible, len(snapshot)
+
+    def format_row(self, proc):
+        values = (proc['name'], round(proc['cpu_percent'], 1), round(proc['memory_percent'] or 0, 1),
+                  proc['status'], proc['nice'], proc['num_threads'], proc['username'])
+        cached = self._rows.get(proc['pid'])
+        if cached and cached[0] == values:
+            return cached[1]
+        name, cpu, memory, status, nice, threads, username = values
+        cells = (str(proc['pid']), (name or '')[:30], f"{cpu:.1f}", f"{memory:.1f}",
+                 str(status), str(nice), str(threads), username or 'N/A')
+        self._rows[proc['pid']] = (values, cells)
+        return cells
+
+    def footer(self):
+        if self.prompt:
+            return f"{self.prompt[0]}{self.buffer}"
+        return self.message or self.HELP
+
+    def render(self, size):
+        """Return the frame to draw, or None when it would match the one on screen"""
+        limit = max(1, size.height - self.CHROME_LINES)
+        processes, matched = self.visible_processes(limit)
+        rows = tuple(self.format_row(proc) for proc in processes)
+        live_pids = {proc['pid'] for proc in self.snapshot}
+        for pid in [pid for pid in self._rows if pid not in live_pids]:
+            del self._rows[pid]
+        
+        title = f"Task Manager - sorted by {self.sort_by}"
+        if self.filter_text:
+            title += f" - filter '{self.filter_text}' ({matched} matches)"
+        state = (size, title, self.summary, self.footer(), self.snapshot.cpu_averaged, rows)
+        if state == self._frame_state:
+            return None
+        self._frame_state = state
+        
+        table = Table(
+            title=title,
+            box=box.DOUBLE,
+            header_style="bold cyan",
+            border_style="blue",
+            expand=True
+        )
+        table.add_column("PID", justify="right", style="cyan", no_wrap=True)
+        table.add_column("Name", style="green", no_wrap=True)
+        # Until a full sampling window has passed, CPU % is each process's lifetime average
+        cpu_header = "Avg CPU %" if self.snapshot.cpu_averaged else "CPU %"
+        table.add_column(cpu_header, justify="right", style="yellow", no_wrap=True)
+        table.add_column("Memory %", justify="right", style="red", no_wrap=True)
+        table.add_column("Status", style="magenta", no_wrap=True)
+        table.add_column("Priority", style="blue", no_wrap=True)
+        table.add_column("Threads", style="green", no_wrap=True)
+        table.add_column("User", style="cyan", no_wrap=True)
+        for row in rows:
+            table.add_row(*row)
+        
+        footer_style = "yellow" if self.prompt else "bold cyan"
+        return Group(Text(self.summary, style="green"), table, Text(self.footer(), style=footer_style))
+
+    def handle_keys(self, keys):
+        i = 0
+        while i < len(keys):
+            key = keys[i]
+            if key == '\x1b' and keys[i + 1:i + 2] == '[':
+                # Arrow and function keys are not bound; skip the whole sequence
+                i += 2
+                while i < len(keys) and not keys[i].isalpha() and keys[i] != '~':
+                    i += 1
+            elif self.prompt:
+                self.handle_prompt_key(key)
+            else:
+                self.handle_command_key(key)
+            i += 1
+
+    def handle_command_key(self, key):
+        self.message = ''
+        if key in ('q', '\x1b'):
+            self.running = False
+        elif key in self.SORT_KEYS:
+            self.sort_by = self.SORT_KEYS[key]
+        elif key == '/':
+            self.start_prompt("Filter (name, user or PID): ", self.apply_filter, self.filter_text)
+        elif key == 'k':
+            self.start_prompt("PID to terminate: ", lambda text: self.kill(text, force=False))
+        elif key == 'K':
+            self.start_prompt("PID to force kill: ", lambda text: self.kill(text, force=True))
+        elif key == 'r':
+            self.start_prompt("PID to renice: ", self.ask_priority)
+
+    def handle_prompt_key(self, key):
+        if key in ('\r', '\n'):
+            _, action = self.prompt
+            self.prompt = None
+            action(self.buffer.strip())
+        elif key == '\x1b':
+            self.prompt = None
+        elif key in ('\x7f', '\x08'):
+            self.buffer = self.buffer[:-1]
+        elif key.isprintable():
+            self.buffer += key
+
+    def start_prompt(self, label, action, initial=''):
+        self.prompt = (label, action)
+        self.buffer = initial
+
+    def apply_filter(self, text):
+        self.filter_text = text
+
+    def parse_pid(self, text):
+        try:
+            return int(text)
+        except ValueError:
+            self.message = "Invalid PID format"
+            return None
+
+    def kill(self, text, force):
+        pid = self.parse_pid(text)
+        if pid is not None:
+            _, self.message = self.task_manager.terminate_process(pid, force=force)
+
+    def ask_priority(self, text):
+        self.pending_pid = self.parse_pid(text)
+        if self.pending_pid is not None:
+            self.start_prompt("Priority (-20 to 19, lower = higher priority): ", self.renice)
+
+    def renice(self, text):
+        try:
+            priority = int(text)
+        except ValueError:
+            self.message = "Invalid priority"
+            return
+        _, self.message = self.task_manager.set_priority(self.pending_pid, priority)
+
+    def run(self):
+        import select
+        import termios
+        import tty
+        from rich.live import Live
+        
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        next_sample = 0.0
+        try:
+            tty.setcbreak(fd)
+            with Live(console=console, screen=True, auto_refresh=False) as live:
+                while self.running:
+                    now = time.monotonic()
+                    if now >= next_sample:
+                        self.sample()
+                        next_sample = now + self.task_manager.refresh_rate
+                    frame = self.render(console.size)
+                    if frame is not None:
+                        live.update(frame, refresh=True)
+                    
+                    # Wake for the next sample, a key press, or at most twice a second to catch resizes
+                    timeout = min(max(0.0, next_sample - time.monotonic()), 0.5)
+                    ready, _, _ = select.select([fd], [], [], timeout)
+                    if ready:
+                        self.handle_keys(os.read(fd, 64).decode(errors='ignore'))
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
 def run_task_manager():
     task_manager = TaskManager()
+    if sys.stdin.isatty() and sys.stdout.isatty():
+        try:
+            import termios  # noqa: F401 - the live view needs a POSIX terminal
+        except ImportError:
+            pass
+        else:
+            TaskManagerView(task_manager).run()
+            return
+    run_task_menu(task_manager)
+
+def run_task_menu(task_manager=None):
+    task_manager = task_manager or TaskManager()
     show_all = False
     sort_by = 'cpu'
     auto_refresh = False
+    refresh = True
     
     while True:
         console.clear()
-        console.print(task_manager.get_process_list(sort_by=sort_by, show_all=show_all))
+        console.print(task_manager.get_process_list(sort_by=sort_by, show_all=show_all, refresh=refresh))
+        refresh = True
         
         console.print("\n[bold cyan]Task Manager Commands:[/bold cyan]")
         console.print("[1] Refresh Process List")
@@ -194,8 +420,11 @@ def run_task_manager():
         console.print("[12] Exit")
         
         if auto_refresh:
-            console.print("\n[yellow]Auto-refreshing every 2 seconds. Press any key to stop.[/yellow]")
-            time.sleep(2)
+            console.print("\n[yellow]Auto-refreshing every 2 seconds. Press Ctrl+C to stop.[/yellow]")
+            try:
+                time.sleep(task_manager.refresh_rate)
+            except KeyboardInterrupt:
+                auto_refresh = False
             continue
         
         choice = input("\nEnter your choice (1-12): ")
@@ -214,6 +443,10 @@ def run_task_manager():
             sort_by = 'name'
         elif choice == "7":
             show_all = not show_all
+        
+        # Changing the order or the row count re-sorts the rows already collected
+        if choice in ("3", "4", "5", "6", "7"):
+            refresh = False
         elif choice == "8":
             pid = input("Enter PID to terminate: ")
             try:
@@ -1,18 +1,41 @@
 import pwd
 import grp
 import subprocess
-import crypt
 import os
 from rich.table import Table
 from rich.console import Console
 from rich.panel import Panel
 from rich import box
 from datetime import datetime
-import spwd
+from src import accounts
+from src import lastlog
 from src.utils import get_sudo_password
 
 console = Console()
 
+NOLOGIN_SHELLS = ['/sbin/nologin', '/usr/sbin/nologin', '/bin/false', 'false', '/bin/sync']
+
+def group_index():
+    """Map usernames to their supplementary groups and GIDs to group names in one pass"""
+    groups_by_user = {}
+    group_names = {}
+    for group in accounts.groups():
+        group_names.setdefault(group.gr_gid, group.gr_name)
+        for member in group.gr_mem:
+            groups_by_user.setdefault(member, []).append(group.gr_name)
+    return groups_by_user, group_names
+
+def show_user_pages(user_manager, show_all):
+    """Print the user listing one screen at a time"""
+    page_size = max(5, console.size.height - 10)
+    pages = user_manager.iter_user_pages(show_all, page_size)
+    table = next(pages, None)
+    while table is not None:
+        console.print(table)
+        table = next(pages, None)
+        if table is not None and input("Press Enter for the next page or 'q' to stop: ").strip().lower() == 'q':
+            break
+
 class UserManager:
     def __init__(self):
         self.console = Console()
@@ -43,9 +66,9 @@ class UserManager:
         stdout, stderr = process.communicate(input_text.encode())
         return process.returncode == 0, stdout, stderr
 
-    def list_users(self, show_all=True):
+    def _user_table(self, title="User Management"):
         table = Table(
-            title="User Management",
+            title=title,
             box=box.DOUBLE,
             header_style="bold cyan",
             border_style="blue"
@@ -57,41 +80,60 @@ class UserManager:
         table.add_column("Shell", style="magenta")
         table.add_column("Groups", style="red")
         table.add_column("Last Login", style="cyan")
-        
-        try:
-            nologin_shells = ['/sbin/nologin', '/usr/sbin/nologin', '/bin/false', 'false', '/bin/sync']
+        return table
+
+    def _select_users(self, show_all):
+        users = accounts.users()
+        if show_all:
+            return users
+        return [user for user in users
+                if user.pw_shell not in NOLOGIN_SHELLS and user.pw_uid >= 1000]
+
+    def _user_rows(self, users, groups_by_user, group_names, last_logins):
+        last_logins.prefetch(users)
+        for user in users:
+            groups = list(groups_by_user.get(user.pw_name, ()))
+            primary = group_names.get(user.pw_gid, str(user.pw_gid))
+            if primary not in groups:
+                groups.append(primary)
             
-            for user in pwd.getpwall():
-                # Skip system users if show_all is False
-                if not show_all and (user.pw_shell in nologin_shells or user.pw_uid < 1000):
-                    continue
-                
-                # Get groups for user
-                groups = [g.gr_name for g in grp.getgrall() if user.pw_name in g.gr_mem]
-                if grp.getgrgid(user.pw_gid).gr_name not in groups:
-                    groups.append(grp.getgrgid(user.pw_gid).gr_name)
-                
-                # Get last login
-                try:
-                    last_login = subprocess.check_output(['lastlog', '-u', user.pw_name]).decode()
-                    last_login = last_login.split('\n')[1].split()[-4:]
-                    last_login = ' '.join(last_login) if len(last_login) > 0 else "Never"
-                except:
-                    last_login = "Unknown"
-                
-                table.add_row(
-                    user.pw_name,
-                    str(user.pw_uid),
-                    str(user.pw_gid),
-                    user.pw_dir,
-                    user.pw_shell,
-                    ', '.join(groups),
-                    last_login
-                )
+            yield (
+                user.pw_name,
+                str(user.pw_uid),
+                str(user.pw_gid),
+                user.pw_dir,
+                user.pw_shell,
+                ', '.join(groups),
+                last_logins.get(user)
+            )
+
+    def iter_user_pages(self, show_all=True, page_size=None):
+        """Yield the user listing as tables of at most page_size rows each"""
+        try:
+            users = self._select_users(show_all)
+            groups_by_user, group_names = group_index()
         except Exception as e:
             console.print(f"[red]Error listing users: {str(e)}[/red]")
+            return
         
-        return table
+        last_logins = lastlog.LastLogins()
+        page_size = page_size or len(users) or 1
+        pages = (len(users) + page_size - 1) // page_size
+        for page, offset in enumerate(range(0, len(users), page_size), 1):
+            title = "User Management"
+            if pages > 1:
+                title += f" (page {page} of {pages}, {len(users)} users)"
+            table = self._user_table(title)
+            try:
+                for row in self._user_rows(users[offset:offset + page_size], groups_by_user,
+                                           group_names, last_logins):
+                    table.add_row(*row)
+            except Exception as e:
+                console.print(f"[red]Error listing users: {str(e)}[/red]")
+            yield table
+
+    def list_users(self, show_all=True):
+        return next(self.iter_user_pages(show_all), None) or self._user_table()
 
     def list_groups(self):
         table = Table(
@@ -105,7 +147,7 @@ class UserManager:
         table.add_column("Members", style="yellow")
         
         try:
-            for group in grp.getgrall():
+            for group in accounts.groups():
                 table.add_row(
                     group.gr_name,
                     str(group.gr_gid),
@@ -198,11 +240,10 @@ class UserManager:
     def get_real_users(self):
         """Get list of real users (non-system users with real shells)"""
         real_users = []
-        nologin_shells = ['/sbin/nologin', '/usr/sbin/nologin', '/bin/false', 'false', '/bin/sync']
         
         try:
-            for user in pwd.getpwall():
-                if user.pw_shell not in nologin_shells and user.pw_uid >= 1000:
+            for user in accounts.users():
+                if user.pw_shell not in NOLOGIN_SHELLS and user.pw_uid >= 1000:
                     real_users.append(user.pw_name)
         except Exception as e:
             console.print(f"[red]Error getting real users: {str(e)}[/red]")
@@ -507,9 +548,9 @@ def run_user_manager():
         choice = input("\nEnter your choice (1-13): ")
         
         if choice == "1":
-            console.print(user_manager.list_users(show_all=True))
+            show_user_pages(user_manager, show_all=True)
         elif choice == "2":
-            console.print(user_manager.list_users(show_all=False))
+            show_user_pages(user_manager, show_all=False)
         elif choice == "3":
             console.print(user_manager.list_groups())
         elif choice == "4":